@@ -1,185 +1,277 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import functools
 import logging
-from datetime import datetime, date
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
 
-try:
-    from tenacity import RetryError
-except Exception:  # pragma: no cover
-    RetryError = Exception
-
-from src.browser import fetch_page_content
-from src.llm import classify, generate_digest
+from src.browser import BrowserSession
+from src.capture import CaptureServer
+from src.ingest import (
+    _advance_parked_mark,
+    _canonical_target,
+    _list_pending,
+    _log_ingest_counts,
+    _open_parked_mark,
+    _schedule,
+    run_ingest,
+)
+from src.llm import PROMPT_VERSION
 from src.notion import NotionManager
-from src.preprocess import preprocess_batch
-from src.utils import configure_logging, get_env, get_timezone, normalize_tweet_url
-from urllib.parse import urlparse
-import os
+from src.notion_rate import log_notion_rate
+from src.quarantine import Quarantine
+from src.ratelimit import TokenBucket
+from src.runners import accept_capture, run_preprocess, run_process, run_reprocess, run_watch, run_webhook
+from src.runtime import Runtime, open_journal, stop_on_signals
+from src.scheduler import Deadline
+from src.utils import configure_logging, get_bool, get_env, get_int, get_timezone
+from src.webhook import WebhookServer
 
 
-def is_attachment_unprocessed(url: str) -> bool:
-    lowered = url.lower()
-    return lowered.endswith((".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp"))
+def main(
+    preprocess_only: bool = False,
+    workers: int = 1,
+    use_async: bool = False,
+    pipeline: bool = False,
+    fused: bool = False,
+    lease: bool = False,
+    budget_seconds: Optional[float] = None,
+    refresh: bool = False,
+    reroute: bool = False,
+) -> None:
+    configure_logging()
+    # Start the clock before any Notion query so the whole run fits the slot
+    deadline = Deadline(budget_seconds, get_int("INGEST_BUDGET_RESERVE_SECONDS", 30)) if budget_seconds else None
+    if lease and not preprocess_only:
+        # One claim covers routing, fetch, summarize and write, so leases need the fused pass
+        fused, pipeline = True, False
+    logging.info(
+        "Starting orchestrator (workers=%d, async=%s, pipeline=%s, fused=%s, lease=%s, budget=%s)",
+        workers,
+        use_async,
+        pipeline,
+        fused,
+        lease,
+        budget_seconds,
+    )
+    scope = get_env("PREPROCESS_SCOPE", "pending")
+    run_started = datetime.now(timezone.utc)
 
+    with Runtime(lease=lease) as runtime, closing(_open_parked_mark()) as parked_mark:
+        notion, journal, retries, quarantine = runtime.notion, runtime.journal, runtime.retries, runtime.quarantine
+        list_pending = functools.partial(_list_pending, notion, parked_mark, refresh, retries, quarantine)
+        if use_async or pipeline or fused:
 
-def _domain_from_url(url: Optional[str]) -> Optional[str]:
-    if not url:
-        return None
-    try:
-        parsed = urlparse(url)
-        return parsed.hostname
-    except Exception:
-        return None
+            async def _process() -> None:
+                async with runtime.notion_pool() as notion_io:
+                    await run_process(
+                        notion,
+                        runtime.cdp_url,
+                        scope,
+                        preprocess_only,
+                        workers,
+                        pipeline,
+                        fused,
+                        journal,
+                        runtime.lease,
+                        deadline,
+                        list_pending,
+                        reroute,
+                        retries,
+                        quarantine,
+                        notion_io,
+                    )
 
+            asyncio.run(_process())
+        else:
+            # 预处理必跑：先做字段补齐/校验，再进入抓取与摘要阶段
+            run_preprocess(notion, runtime.cdp_url, scope, list_pending, reroute)
+            if not preprocess_only:
+                pending = _schedule(list_pending(), journal)
+                counts = run_ingest(
+                    pending,
+                    notion,
+                    runtime.cdp_url,
+                    workers=workers,
+                    journal=journal,
+                    deadline=deadline,
+                    retries=retries,
+                    quarantine=quarantine,
+                )
+                _log_ingest_counts(counts)
+        # Every unprocessed page edited before this run was seen by it, so later
+        # runs only need newer edits (unless the deadline left some untouched)
+        if deadline is None or not deadline.exhausted():
+            _advance_parked_mark(parked_mark, run_started)
+        _log_quarantine(quarantine)
+        log_notion_rate()
 
-def _is_meaningful_name(name: str, url: Optional[str]) -> bool:
-    cleaned = (name or "").strip()
-    if not cleaned:
-        return False
-    lowered = cleaned.lower()
-    if lowered in {"untitled", "new page", "bookmark", "default"}:
-        return False
-    domain = _domain_from_url(url)
-    if domain and (cleaned == domain or cleaned.startswith("http")):
-        return False
-    return True
 
+def _log_quarantine(quarantine: Quarantine) -> None:
+    entries = quarantine.entries()
+    logging.info("METRIC quarantine_urls count=%d", len(entries))
+    if entries:
+        logging.warning("%d URL(s) in quarantine; see `python main.py quarantine`", len(entries))
 
-def process_item(page: dict, notion: NotionManager, cdp_url: str) -> str:
-    page_id = page.get("id", "")
-    url = page.get("url")
-    source = page.get("source") or "manual"
-    attachments = page.get("attachments", [])
-    if not url:
-        if attachments:
-            notion.mark_unprocessed(page_id, "Attachment stored; no URL; OCR out of scope; excluded from digests")
-            return "unprocessed"
-        else:
-            notion.mark_as_error(page_id, "missing url")
-            return "error"
 
-    from src.dedupe import canonical_url
+def show_quarantine(release: Optional[str] = None, release_all: bool = False) -> None:
+    """Print quarantined URLs, or release one (by URL) or all of them."""
+    configure_logging()
+    quarantine = Quarantine()
+    try:
+        if release_all:
+            print(f"Released {quarantine.release()} URL(s)")
+            return
+        if release:
+            released = quarantine.release(_canonical_target(release))
+            print(f"Released {release}" if released else f"Not quarantined: {release}")
+            return
+        entries = quarantine.entries()
+        if not entries:
+            print("No quarantined URLs")
+            return
+        for entry in entries:
+            when = datetime.fromtimestamp(entry.quarantined_at, get_timezone()).strftime("%Y-%m-%d %H:%M")
+            print(f"{when}  failures={entry.failures}  page={entry.page_id}  {entry.canonical_url}")
+            print(f"    last error: {entry.last_error}")
+    finally:
+        quarantine.close()
+
 
-    tweet_norm = normalize_tweet_url(url)
-    if tweet_norm is None and ("twitter.com" in url.lower() or "x.com" in url.lower()):
-        notion.mark_as_error(page_id, "invalid tweet url")
-        return "error"
-    target_url = tweet_norm or url
-    canonical = canonical_url(target_url)
-    existing = notion.find_by_canonical(canonical)
-    if existing and existing.get("id") != page_id:
-        if existing.get("status") in (notion.status.ready, notion.status.pending):
-            notion.set_duplicate_of(page_id, existing["id"], f"Duplicate of ready/pending {existing['id']}")
-            return "duplicate"
-        notion.set_duplicate_of(page_id, existing["id"], f"Duplicate of {existing['id']}")
-        return "duplicate"
+def watch(workers: int = 1, interval: float = 15.0, lease: bool = False) -> None:
+    """Long-running mode: browser, Notion and LLM clients stay warm between polls."""
+    configure_logging()
+    logging.info("Starting watch mode (workers=%d, interval=%.0fs, lease=%s)", workers, interval, lease)
 
-    # Attachment without OCR support
-    if is_attachment_unprocessed(url):
-        notion.mark_unprocessed(page_id, "Attachment stored; OCR out of scope; excluded from digests")
-        return "unprocessed"
+    async def _watch(runtime: Runtime) -> None:
+        stop = stop_on_signals()
+        async with BrowserSession(runtime.cdp_url) as session, runtime.notion_pool() as notion_io:
+            await run_watch(
+                runtime.notion,
+                runtime.cdp_url,
+                workers,
+                interval,
+                session=session,
+                journal=runtime.journal,
+                stop=stop,
+                lease=runtime.lease,
+                retries=runtime.retries,
+                quarantine=runtime.quarantine,
+                notion_io=notion_io,
+            )
 
     try:
-        text = asyncio.run(fetch_page_content(target_url, cdp_url))
-    except RetryError as exc:
-        last_exc = getattr(exc, "last_attempt", None)
-        if last_exc and last_exc.exception():
-            reason = str(last_exc.exception())
-        else:
-            reason = str(exc)
-        notion.mark_as_error(page_id, f"fetch failed: {reason}")
-        return "error"
-    except Exception as exc:  # catch RuntimeError, etc.
-        notion.mark_as_error(page_id, f"fetch failed: {exc}")
-        return "error"
-
-    if not text:
-        notion.mark_as_error(page_id, "no content")
-        return "error"
+        with Runtime(lease=lease) as runtime:
+            asyncio.run(_watch(runtime))
+    finally:
+        logging.info("Watch mode stopped")
 
-    # Classification
-    classification = classify(text)
-    tags = classification.get("tags", [])
-    sensitivity = classification.get("sensitivity", "public")
-    confidence = float(classification.get("confidence", 0.0))
-    rule_version = classification.get("rule_version", "rule-v0")
-    prompt_version = classification.get("prompt_version", "prompt-v0")
 
-    notion.set_classification(
-        page_id=page_id,
-        tags=tags,
-        sensitivity=sensitivity,
-        confidence=confidence,
-        rule_version=rule_version,
-        prompt_version=prompt_version,
-        raw_content=text,
-        canonical_url=canonical,
-        source=source,
+def reprocess(
+    prompt_version: str = PROMPT_VERSION,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    fetch_missing: bool = False,
+    items_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> Optional[Dict[str, int]]:
+    """Backfill summaries after a prompt change, throttled (REPROCESS_ITEMS_PER_MIN / REPROCESS_TOKENS_PER_MIN)."""
+    configure_logging()
+    if prompt_version != PROMPT_VERSION:
+        # New results are stamped with the code's PROMPT_VERSION; any other target would never converge
+        logging.error("--prompt-version %s does not match the current prompt (%s)", prompt_version, PROMPT_VERSION)
+        return None
+    items_rate = items_per_minute if items_per_minute is not None else get_int("REPROCESS_ITEMS_PER_MIN", 20)
+    tokens_rate = tokens_per_minute if tokens_per_minute is not None else get_int("REPROCESS_TOKENS_PER_MIN", 40000)
+    logging.info(
+        "Reprocessing ready items older than %s (limit=%s, items/min=%s, tokens/min=%s, dry_run=%s)",
+        prompt_version,
+        limit,
+        items_rate,
+        tokens_rate,
+        dry_run,
     )
+    with Runtime(index=False, retries=False, quarantine=False) as runtime:
+        return run_reprocess(
+            runtime.notion,
+            prompt_version,
+            runtime.journal,
+            TokenBucket(items_rate),
+            TokenBucket(tokens_rate),
+            limit=limit,
+            dry_run=dry_run,
+            cdp_url=runtime.cdp_url if fetch_missing else None,
+        )
 
-    summary = generate_digest(text)
-    threshold = float(get_env("CONFIDENCE_THRESHOLD", "0.5"))
-    summary_text = summary.get("tldr", "")
-    insights = summary.get("insights")
-    if insights:
-        summary_text = (summary_text + "\n" + insights).strip()
-    if confidence < threshold:
-        notion.mark_as_done(page_id, summary_text, status=notion.status.pending)
-        # If title仍不够清晰，用摘要首行回填标题，便于辨识
-        title_existing = page.get("title", "")
-        if not _is_meaningful_name(title_existing, url):
-            fallback_title = summary_text.splitlines()[0][:140] if summary_text else ""
-            if fallback_title:
-                notion.set_title(page_id, fallback_title, note="Backfilled Name from summary (low confidence)")
-        return "success"
 
-    note_status = None
-    if source == "plugin":
-        note_status = notion.status.ready
-    notion.mark_as_done(page_id, summary_text, status=note_status)
-    # Ready case也回填标题（若原有标题无意义）
-    title_existing = page.get("title", "")
-    if not _is_meaningful_name(title_existing, url):
-        fallback_title = summary_text.splitlines()[0][:140] if summary_text else ""
-        if fallback_title:
-            notion.set_title(page_id, fallback_title, note="Backfilled Name from summary")
-    return "success"
+def webhook(workers: int = 1, lease: bool = False, host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """Event-driven mode: Notion webhooks name the pages to process, no polling."""
+    configure_logging()
 
+    async def _serve(runtime: Runtime) -> None:
+        stop = stop_on_signals()
+        loop = asyncio.get_running_loop()
+        page_ids: asyncio.Queue = asyncio.Queue()
+        notion = runtime.notion
+        server = WebhookServer(
+            lambda page_id: loop.call_soon_threadsafe(page_ids.put_nowait, page_id),
+            [notion.database_id, notion.data_source_id],
+            host,
+            port,
+        )
+        server.start()
+        logging.info("Webhook receiver listening on http://%s:%d%s", *server.address, server.path)
+        try:
+            pending = None
+            if get_bool("WEBHOOK_INITIAL_SYNC", True):
+                # Catch up on pages edited while the receiver was down
+                pending = await asyncio.to_thread(
+                    _list_pending, notion, retries=runtime.retries, quarantine=runtime.quarantine
+                )
+            async with BrowserSession(runtime.cdp_url) as session, runtime.notion_pool() as notion_io:
+                await run_webhook(
+                    notion,
+                    runtime.cdp_url,
+                    page_ids,
+                    workers,
+                    session=session,
+                    journal=runtime.journal,
+                    stop=stop,
+                    lease=runtime.lease,
+                    retries=runtime.retries,
+                    quarantine=runtime.quarantine,
+                    initial=pending,
+                    notion_io=notion_io,
+                )
+        finally:
+            server.shutdown()
 
-def run_preprocess(notion: NotionManager, cdp_url: str, scope: str) -> None:
-    items = notion.get_pending_tasks()
-    stats = preprocess_batch(items, notion, cdp_url)
-    logging.info("Preprocess scope=%s results: %s", scope, stats)
+    try:
+        with Runtime(lease=lease) as runtime:
+            asyncio.run(_serve(runtime))
+    finally:
+        logging.info("Webhook mode stopped")
 
 
-def main(preprocess_only: bool = False) -> None:
+def serve(host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """Run the local ``POST /capture`` endpoint until interrupted."""
     configure_logging()
-    logging.info("Starting orchestrator")
-    cdp_url = get_env("CHROME_REMOTE_URL", "http://localhost:9222")
-    notion = NotionManager()
-    scope = get_env("PREPROCESS_SCOPE", "pending")
-
-    # 预处理必跑：先做字段补齐/校验，再进入抓取与摘要阶段
-    run_preprocess(notion, cdp_url, scope)
-    if preprocess_only:
-        return
-
-    pending = notion.get_pending_tasks()
-    counts = {"success": 0, "error": 0, "duplicate": 0, "unprocessed": 0}
-    for item in pending:
-        result = process_item(item, notion, cdp_url)
-        if result in counts:
-            counts[result] += 1
-    logging.info("Ingest results: %s", counts)
-    logging.info(
-        "METRIC ingest_counts success=%d error=%d duplicate=%d unprocessed=%d",
-        counts["success"],
-        counts["error"],
-        counts["duplicate"],
-        counts["unprocessed"],
-    )
+    with Runtime(retries=False, quarantine=False) as runtime:
+        pool = ThreadPoolExecutor(max_workers=max(1, get_int("CAPTURE_WORKERS", 2)), thread_name_prefix="capture")
+        accept = functools.partial(accept_capture, notion=runtime.notion, submit=pool.submit, journal=runtime.journal)
+        server = CaptureServer(accept, host, port)
+        logging.info("Capture endpoint listening on http://%s:%d/capture", *server.address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            pool.shutdown(wait=True)
+            logging.info("Capture endpoint stopped")
 
 
 def generate_report(report_type: str, target_date: Optional[date] = None, force: bool = False) -> Optional[str]:
@@ -202,20 +294,26 @@ def generate_report(report_type: str, target_date: Optional[date] = None, force:
     
     inbox_manager = NotionManager()
     reporting_manager = ReportingDBManager()
+    journal = open_journal()
     
-    service = DigestService(inbox_manager, reporting_manager)
+    service = DigestService(inbox_manager, reporting_manager, journal=journal)
     
     target = target_date or date.today()
     
-    if report_type.lower() == "daily":
-        return service.generate_daily(target, force=force)
-    elif report_type.lower() == "weekly":
-        return service.generate_weekly(target, force=force)
-    elif report_type.lower() == "monthly":
-        return service.generate_monthly(target, force=force)
-    else:
-        logging.error(f"Unknown report type: {report_type}")
-        return None
+    try:
+        if report_type.lower() == "daily":
+            return service.generate_daily(target, force=force)
+        elif report_type.lower() == "weekly":
+            return service.generate_weekly(target, force=force)
+        elif report_type.lower() == "monthly":
+            return service.generate_monthly(target, force=force)
+        else:
+            logging.error(f"Unknown report type: {report_type}")
+            return None
+    finally:
+        if journal is not None:
+            journal.close()
+
 
 
 if __name__ == "__main__":
@@ -225,10 +323,26 @@ if __name__ == "__main__":
         epilog="""
 Commands:
   process    Process new items from Inbox (preprocess + fetch + summarize)
+  watch      Keep polling the Inbox and process new items as they arrive
+  quarantine List or release URLs quarantined after repeated fetch failures
+  serve      Local HTTP endpoint (POST /capture) for pushed plugin captures
+  webhook    Process Inbox pages named by Notion webhook events (no polling)
+  reprocess  Re-summarize ready items written with an older prompt version
   report     Generate hierarchical reports (daily/weekly/monthly)
 
 Examples:
   python main.py process              # Process all pending items
+  python main.py process --workers 4  # Process up to 4 items in parallel
+  python main.py process --async --workers 4  # Same, on one shared event loop
+  python main.py process --pipeline   # Staged fetch/extract/summarize/write
+  python main.py process --fused      # Preprocess + ingest in a single pass
+  python main.py process --lease      # Safe to run on several machines at once
+  python main.py process --budget-seconds 600  # Fit the run into a 10-minute slot
+  python main.py watch --interval 10  # Poll for new items every 10 seconds
+  python main.py quarantine           # List URLs quarantined after repeated failures
+  python main.py serve --port 8765    # Accept plugin captures on localhost
+  python main.py webhook --workers 2  # Event-driven processing from Notion webhooks
+  python main.py reprocess --dry-run  # Count ready items with an outdated prompt version
   python main.py report --type daily  # Generate today's daily report
   python main.py report --type weekly # Generate this week's report
         """
@@ -240,6 +354,184 @@ Examples:
         "process",
         help="Process new items from Inbox (preprocess + fetch + summarize)"
     )
+    process_parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_int("INGEST_WORKERS", 1),
+        help="Maximum number of items processed concurrently (default: $INGEST_WORKERS or 1)",
+    )
+    process_parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        default=get_bool("INGEST_ASYNC", False),
+        help="Run the whole process on one event loop with a shared browser connection",
+    )
+    engine_group = process_parser.add_mutually_exclusive_group()
+    engine_group.add_argument(
+        "--pipeline",
+        action="store_true",
+        default=get_bool("INGEST_PIPELINE", False),
+        help="Staged fetch/extract/summarize/write ingest with bounded queues (implies --async)",
+    )
+    engine_group.add_argument(
+        "--fused",
+        action="store_true",
+        default=get_bool("INGEST_FUSED", False),
+        help="Preprocess and ingest in one pass, one navigation per URL (implies --async)",
+    )
+    process_parser.add_argument(
+        "--lease",
+        action="store_true",
+        default=get_bool("INGEST_LEASE", False),
+        help="Claim each item with a lease before processing so several instances can share the Inbox (implies --fused)",
+    )
+    process_parser.add_argument(
+        "--budget-seconds",
+        "--deadline",
+        dest="budget_seconds",
+        type=float,
+        default=get_int("INGEST_BUDGET_SECONDS", 0) or None,
+        help="Stop dispatching new items when the run's time budget is nearly used up "
+        "(default: $INGEST_BUDGET_SECONDS, unlimited)",
+    )
+    process_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-run low-confidence pending items even if their URL and rule/prompt versions are unchanged",
+    )
+    process_parser.add_argument(
+        "--reroute",
+        action="store_true",
+        help="Preprocess every item again, even those whose ItemType/ContentType are already set",
+    )
+    
+    # Watch subcommand - long-running incremental processing
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Keep polling the Inbox and process new items as they arrive"
+    )
+    watch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_int("INGEST_WORKERS", 1),
+        help="Maximum number of items processed concurrently (default: $INGEST_WORKERS or 1)",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=float(get_int("WATCH_INTERVAL", 15)),
+        help="Seconds between Inbox polls (default: $WATCH_INTERVAL or 15)",
+    )
+    watch_parser.add_argument(
+        "--lease",
+        action="store_true",
+        default=get_bool("INGEST_LEASE", False),
+        help="Claim each item with a lease so several watchers can share the Inbox",
+    )
+    
+    # Quarantine subcommand - inspect/release poison URLs
+    quarantine_parser = subparsers.add_parser(
+        "quarantine",
+        help="List or release URLs quarantined after repeated fetch failures"
+    )
+    release_group = quarantine_parser.add_mutually_exclusive_group()
+    release_group.add_argument(
+        "--release",
+        metavar="URL",
+        default=None,
+        help="Take this URL out of quarantine so the next run retries it",
+    )
+    release_group.add_argument(
+        "--release-all",
+        action="store_true",
+        help="Clear the quarantine and all failure counters",
+    )
+    
+    # Serve subcommand - push-ingest endpoint for plugin captures
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Local HTTP endpoint (POST /capture) for pushed plugin captures"
+    )
+    serve_parser.add_argument(
+        "--host",
+        default=None,
+        help="Bind address (default: $CAPTURE_HOST or 127.0.0.1)",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Bind port (default: $CAPTURE_PORT or 8765)",
+    )
+    
+    # Webhook subcommand - event-driven processing
+    webhook_parser = subparsers.add_parser(
+        "webhook",
+        help="Process Inbox pages named by Notion webhook events (no polling)"
+    )
+    webhook_parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_int("INGEST_WORKERS", 1),
+        help="Maximum number of items processed concurrently (default: $INGEST_WORKERS or 1)",
+    )
+    webhook_parser.add_argument(
+        "--lease",
+        action="store_true",
+        default=get_bool("INGEST_LEASE", False),
+        help="Claim each item with a lease so several receivers/runs can share the Inbox",
+    )
+    webhook_parser.add_argument(
+        "--host",
+        default=None,
+        help="Bind address (default: $WEBHOOK_HOST or 127.0.0.1)",
+    )
+    webhook_parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Bind port (default: $WEBHOOK_PORT or 8766)",
+    )
+    
+    # Reprocess subcommand - throttled backfill after a prompt change
+    reprocess_parser = subparsers.add_parser(
+        "reprocess",
+        help="Re-summarize ready items written with an older prompt version"
+    )
+    reprocess_parser.add_argument(
+        "--prompt-version",
+        default=PROMPT_VERSION,
+        help=f"Target prompt version; must match the current prompt (default: {PROMPT_VERSION})",
+    )
+    reprocess_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop after this many items",
+    )
+    reprocess_parser.add_argument(
+        "--items-per-minute",
+        type=float,
+        default=None,
+        help="Maximum LLM-summarized items per minute (default: $REPROCESS_ITEMS_PER_MIN or 20; 0 = unlimited)",
+    )
+    reprocess_parser.add_argument(
+        "--tokens-per-minute",
+        type=float,
+        default=None,
+        help="Maximum estimated LLM tokens per minute (default: $REPROCESS_TOKENS_PER_MIN or 40000; 0 = unlimited)",
+    )
+    reprocess_parser.add_argument(
+        "--fetch-missing",
+        action="store_true",
+        help="Re-fetch pages that have no stored text instead of skipping them",
+    )
+    reprocess_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the items that would be reprocessed",
+    )
     
     # Report subcommand - for hierarchical reporting system
     report_parser = subparsers.add_parser(
@@ -269,7 +561,37 @@ Examples:
     args = parser.parse_args()
     
     if args.command == "process":
-        main(preprocess_only=False)
+        main(
+            preprocess_only=False,
+            workers=max(1, args.workers),
+            use_async=args.use_async,
+            pipeline=args.pipeline,
+            fused=args.fused,
+            lease=args.lease,
+            budget_seconds=args.budget_seconds,
+            refresh=args.refresh,
+            reroute=args.reroute,
+        )
+    elif args.command == "watch":
+        watch(workers=max(1, args.workers), interval=max(1.0, args.interval), lease=args.lease)
+    elif args.command == "quarantine":
+        show_quarantine(release=args.release, release_all=args.release_all)
+    elif args.command == "serve":
+        serve(host=args.host, port=args.port)
+    elif args.command == "webhook":
+        webhook(workers=max(1, args.workers), lease=args.lease, host=args.host, port=args.port)
+    elif args.command == "reprocess":
+        counts = reprocess(
+            prompt_version=args.prompt_version,
+            limit=args.limit,
+            dry_run=args.dry_run,
+            fetch_missing=args.fetch_missing,
+            items_per_minute=args.items_per_minute,
+            tokens_per_minute=args.tokens_per_minute,
+        )
+        if counts is None:
+            exit(2)
+        print(f"Reprocess results: {counts}")
     elif args.command == "report":
         page_id = generate_report(args.report_type, args.target_date, args.force)
         if page_id:
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Post a synthetic Notion webhook event to a local `main.py webhook` receiver.
+
+Usage:
+  python scripts/send_webhook_event.py <page_id> [--type page.properties_updated] [--url http://127.0.0.1:8766/notion/webhook]
+Uses env:
+  NOTION_ITEM_DB_ID (parent id placed in the event)
+  WEBHOOK_VERIFICATION_TOKEN (optional; signs the body like Notion does)
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.request
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.webhook import PAGE_EVENTS, sign, synthetic_event  # noqa: E402
+
+load_dotenv()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("page_id")
+    # Other event types are dropped by the receiver, so the smoke test would do nothing
+    parser.add_argument("--type", dest="event_type", default="page.created", choices=sorted(PAGE_EVENTS))
+    parser.add_argument("--url", default="http://127.0.0.1:8766/notion/webhook")
+    parser.add_argument("--parent", default=os.getenv("NOTION_ITEM_DB_ID", ""))
+    args = parser.parse_args()
+
+    body = json.dumps(synthetic_event(args.page_id, args.parent, args.event_type)).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    token = os.getenv("WEBHOOK_VERIFICATION_TOKEN", "")
+    if token:
+        headers["X-Notion-Signature"] = sign(body, token)
+    request = urllib.request.Request(args.url, data=body, headers=headers, method="POST")
+    with urllib.request.urlopen(request, timeout=10) as resp:
+        print(f"{resp.status} {args.event_type} {args.page_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
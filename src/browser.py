@@ -1,10 +1,12 @@
 import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from enum import Enum
-from typing import Callable, Dict, Optional, Tuple, TypeVar
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple, TypeVar
 from urllib.parse import urlparse
 
 try:
-    from tenacity import retry, stop_after_attempt, wait_exponential
+    from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 except ImportError:
     # Fallback no-op decorators if tenacity is not installed (e.g., in lightweight test env)
     T = TypeVar("T")
@@ -24,6 +26,9 @@ except ImportError:
     def wait_exponential(*args, **kwargs):  # type: ignore
         return None
 
+    def retry_if_not_exception_type(*args, **kwargs):  # type: ignore
+        return None
+
 
 from src.utils import get_antibot_settings, get_int
 
@@ -55,6 +60,21 @@ class TwitterServerError(TwitterFetchError):
     pass
 
 
+class TransientFetchError(RuntimeError):
+    """Fetch failure that is likely to clear up on a later attempt."""
+    pass
+
+
+class PageTimeoutError(TransientFetchError):
+    """Navigation or content wait timed out."""
+    pass
+
+
+class PageServerError(TransientFetchError):
+    """Main navigation answered with an HTTP 5xx."""
+    pass
+
+
 # Twitter element selectors
 TWITTER_CONTENT_SELECTOR = 'div[data-testid="tweetText"], article[data-testid="tweet"]'
 TWITTER_LOGIN_SELECTOR = '[data-testid="login"]'
@@ -341,48 +361,167 @@ BLOCK_MARKERS = [
 
 
 def _retry_kwargs(kind: str) -> Dict:
-    """Unified retry config from env with sensible defaults."""
+    """
+    Unified retry config from env with sensible defaults.
+
+    Transient failures (timeouts, 5xx, Twitter server errors) are not retried
+    in the call: they surface at once so the caller can park the item in the
+    RetryQueue instead of holding a worker on a slow host.
+    """
     attempts = get_int("PAGE_FETCH_RETRIES", 1)
     if kind == "title":
         attempts = get_int("PAGE_TITLE_RETRIES", attempts)
     return {
         "stop": stop_after_attempt(max(1, attempts)),
         "wait": wait_exponential(multiplier=0.5, min=1, max=4),
+        "retry": retry_if_not_exception_type((TransientFetchError, TwitterServerError)),
     }
 
 
-async def fetch_page_content(
+class BrowserSession:
+    """
+    Long-lived Playwright driver and CDP connection shared by many fetches.
+
+    Create it once per event loop (``async with BrowserSession(cdp_url) as s``)
+    and pass it to fetch_page_content/fetch_page_title to avoid starting a new
+    driver process and CDP handshake for every URL.
+    """
+
+    def __init__(self, cdp_url: str = "http://localhost:9222") -> None:
+        self.cdp_url = cdp_url
+        self._playwright = None
+        self._browser = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "BrowserSession":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError as exc:
+            raise RuntimeError("playwright is required to fetch page content") from exc
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._lock = asyncio.Lock()
+
+    async def get_browser(self):
+        """Return the connected browser, reconnecting if Chrome dropped the CDP link."""
+        if self._playwright is None:
+            await self.start()
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_url)
+        return self._browser
+
+    async def close(self) -> None:
+        if self._playwright is not None:
+            # Stopping the driver drops the CDP connection without closing the user's Chrome
+            await self._playwright.stop()
+        self._playwright = None
+        self._browser = None
+
+
+@asynccontextmanager
+async def _connected_browser(cdp_url: str, session: Optional[BrowserSession]) -> AsyncIterator:
+    """Yield a CDP-connected browser, reusing the session's connection when given."""
+    if session is not None:
+        yield await session.get_browser()
+        return
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        yield await p.chromium.connect_over_cdp(cdp_url)
+
+
+async def _pick_title(page) -> Optional[str]:
+    """Pick the most specific title from og/twitter meta tags and document.title."""
+    candidates = await page.evaluate(
+        """() => {
+            const vals = [];
+            const push = (v) => { if (v && typeof v === 'string' && v.trim()) vals.push(v.trim()); };
+            const pickMeta = (key) => {
+                const el = document.querySelector(`meta[property="${key}"]`) || document.querySelector(`meta[name="${key}"]`);
+                return el ? (el.content || el.getAttribute('content') || '') : '';
+            };
+            push(pickMeta('og:title'));
+            push(pickMeta('twitter:title'));
+            push(pickMeta('title'));
+            push(document.title || '');
+            return vals;
+        }"""
+    )
+    generic = {"something went wrong", "x.com", "javascript is disabled"}
+    chosen = None
+    for t in candidates:
+        low = t.lower()
+        if any(g in low for g in generic):
+            continue
+        chosen = t
+        break
+    return chosen or (await page.title())
+
+
+@dataclass
+class RenderedPage:
+    """Result of navigating to a URL, before generic text extraction."""
+    url: str
+    html: str
+    text: Optional[str] = None  # Already-extracted text (cache hit or host-specific extractor)
+    title: Optional[str] = None  # Only filled when requested via want_title
+    content_type: Optional[str] = None  # Content-Type header of the main navigation response
+
+
+def _require_trafilatura():
+    try:
+        import trafilatura
+    except ImportError as exc:
+        raise RuntimeError("trafilatura is required to extract text") from exc
+    return trafilatura
+
+
+async def fetch_rendered_page(
     url: str,
     cdp_url: str = "http://localhost:9222",
     timeout_ms: int = 15000,
     anti_bot: Optional[bool] = None,
     page_options: Optional[Dict] = None,
-) -> Optional[str]:
+    session: Optional[BrowserSession] = None,
+    want_title: bool = False,
+) -> Optional[RenderedPage]:
+    """
+    Navigate to ``url`` and return its rendered HTML without running trafilatura.
+
+    Host-specific extractors that need the live DOM (e.g., Twitter) run here and
+    fill ``RenderedPage.text``; generic extraction is left to extract_text so it
+    can be scheduled separately from browser work. With ``want_title`` the page
+    title is read from the same navigation, so callers need no second visit.
+    Timeouts and HTTP 5xx raise TransientFetchError subclasses so callers can
+    tell them apart from permanent failures.
+    """
     # Serve from cache if available
     cached_text = _cache_get(url, "text")
-    if cached_text:
-        return cached_text
+    if cached_text and (not want_title or _cache_get(url, "title")):
+        return RenderedPage(url=url, html="", text=cached_text, title=_cache_get(url, "title"))
 
     # Lazy import to avoid hard dependency at module import time (helps tests without playwright installed)
     try:
-        from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
     except ImportError as exc:
         raise RuntimeError("playwright is required to fetch page content") from exc
 
-    try:
-        import trafilatura
-    except ImportError as exc:
-        raise RuntimeError("trafilatura is required to extract text") from exc
-
     opts = _page_options(page_options)
     anti_bot_enabled = opts.get("enable") if anti_bot is None else anti_bot
 
     retry_kwargs = _retry_kwargs("content")
 
     @retry(**retry_kwargs)
-    async def _run() -> Optional[str]:
-        async with async_playwright() as p:
-            browser = await p.chromium.connect_over_cdp(cdp_url)
+    async def _run() -> Optional[RenderedPage]:
+        async with _connected_browser(cdp_url, session) as browser:
             contexts = browser.contexts
             created_context = False
             if contexts:
@@ -402,11 +541,15 @@ async def fetch_page_content(
             if anti_bot_enabled and opts.get("init_script"):
                 await context.add_init_script(opts["init_script"])
             try:
-                await page.goto(url, wait_until="load", timeout=timeout_ms)
+                response = await page.goto(url, wait_until="load", timeout=timeout_ms)
+                if response is not None and response.status >= 500:
+                    raise PageServerError(f"HTTP {response.status} from {_host(url)}")
+                content_type = response.headers.get("content-type") if response else None
                 
                 # Host-specific extractor (e.g., Twitter) with hybrid strategy
                 host = _host(url).lower()
                 is_twitter = "x.com" in host or "twitter.com" in host
+                host_text = None
                 
                 if is_twitter:
                     # Smart wait for Twitter content with fast failure detection
@@ -427,11 +570,11 @@ async def fetch_page_content(
                     if hybrid.get("title"):
                         _cache_set(url, "title", hybrid["title"])
                     if hybrid.get("text"):
-                        return hybrid["text"]
+                        return RenderedPage(url=url, html=html, text=hybrid["text"], title=hybrid.get("title"), content_type=content_type)
                     
                     # If smart wait timed out and no meta content, report error
                     if wait_result == TwitterWaitResult.TIMEOUT:
-                        raise RuntimeError(f"Twitter content not found: {wait_message}")
+                        raise PageTimeoutError(f"Twitter content not found: {wait_message}")
                     
                     # Only check block markers if Meta extraction failed
                     if any(marker in html.lower() for marker in BLOCK_MARKERS):
@@ -447,14 +590,14 @@ async def fetch_page_content(
                     host_text = await _extract_text_by_host(page, html, url)
                     if host_text:
                         _cache_set(url, "text", host_text)
-                        return host_text
 
-                text = trafilatura.extract(html)
-                if text:
-                    _cache_set(url, "text", text)
-                return text
-            except PlaywrightTimeoutError:
-                return None
+                title = None
+                if want_title:
+                    title = await _pick_title(page)
+                    _cache_set(url, "title", title)
+                return RenderedPage(url=url, html=html, text=host_text, title=title, content_type=content_type)
+            except PlaywrightTimeoutError as exc:
+                raise PageTimeoutError(f"timed out after {timeout_ms}ms") from exc
             finally:
                 await page.close()
                 if created_context:
@@ -463,12 +606,43 @@ async def fetch_page_content(
     return await _run()
 
 
+def extract_text(rendered: RenderedPage) -> Optional[str]:
+    """Run generic (trafilatura) extraction on a rendered page; CPU-bound, safe to run in a thread."""
+    if rendered.text:
+        return rendered.text
+    trafilatura = _require_trafilatura()
+    text = trafilatura.extract(rendered.html)
+    if text:
+        _cache_set(rendered.url, "text", text)
+    return text
+
+
+async def fetch_page_content(
+    url: str,
+    cdp_url: str = "http://localhost:9222",
+    timeout_ms: int = 15000,
+    anti_bot: Optional[bool] = None,
+    page_options: Optional[Dict] = None,
+    session: Optional[BrowserSession] = None,
+) -> Optional[str]:
+    cached_text = _cache_get(url, "text")
+    if cached_text:
+        return cached_text
+    _require_trafilatura()
+
+    rendered = await fetch_rendered_page(url, cdp_url, timeout_ms, anti_bot, page_options, session)
+    if rendered is None:
+        return None
+    return extract_text(rendered)
+
+
 async def fetch_page_title(
     url: str,
     cdp_url: str = "http://localhost:9222",
     timeout_ms: int = 15000,
     anti_bot: Optional[bool] = None,
     page_options: Optional[Dict] = None,
+    session: Optional[BrowserSession] = None,
 ) -> Optional[str]:
     """Fetch page <title> via CDP, honoring anti-bot settings."""
     cached_title = _cache_get(url, "title")
@@ -479,15 +653,14 @@ async def fetch_page_title(
 
     async def _run() -> Optional[str]:
         try:
-            from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
         except ImportError as exc:
             raise RuntimeError("playwright is required to fetch page title") from exc
 
         opts = _page_options(page_options)
         anti_bot_enabled = opts.get("enable") if anti_bot is None else anti_bot
 
-        async with async_playwright() as p:
-            browser = await p.chromium.connect_over_cdp(cdp_url)
+        async with _connected_browser(cdp_url, session) as browser:
             contexts = browser.contexts
             created_context = False
             if contexts:
@@ -510,30 +683,7 @@ async def fetch_page_title(
                 await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
                 # Allow dynamic head/meta to settle (slow pages like X may need longer)
                 await page.wait_for_timeout(_wait_delay_ms(url))
-                candidates = await page.evaluate(
-                    """() => {
-                        const vals = [];
-                        const push = (v) => { if (v && typeof v === 'string' && v.trim()) vals.push(v.trim()); };
-                        const pickMeta = (key) => {
-                            const el = document.querySelector(`meta[property="${key}"]`) || document.querySelector(`meta[name="${key}"]`);
-                            return el ? (el.content || el.getAttribute('content') || '') : '';
-                        };
-                        push(pickMeta('og:title'));
-                        push(pickMeta('twitter:title'));
-                        push(pickMeta('title'));
-                        push(document.title || '');
-                        return vals;
-                    }"""
-                )
-                generic = {"something went wrong", "x.com", "javascript is disabled"}
-                chosen = None
-                for t in candidates:
-                    low = t.lower()
-                    if any(g in low for g in generic):
-                        continue
-                    chosen = t
-                    break
-                title = chosen or (await page.title())
+                title = await _pick_title(page)
 
                 # Best-effort: also extract text and cache it, to avoid re-open in content fetch
                 html = await page.content()
@@ -0,0 +1,187 @@
+"""
+Local HTTP push-ingest endpoint (``POST /capture``).
+
+The browser extension already holds the rendered page, so it can push url,
+title and extracted text directly instead of leaving a bare URL in the Inbox
+for the poller to open in Chrome again. The server only parses and validates
+requests; what happens to a capture is decided by the ``accept`` callback
+(see ``src.runners.accept_capture``).
+
+Contract (specs/002-content-digest/contracts/http.md)::
+
+    POST /capture  {"url", "title", "text" | "raw_text", "source" | "source_channel"}
+      -> 202 {"id", "status"}   accepted (status: processing / pending / duplicate)
+      -> 400 {"error"}          invalid payload
+      -> 401 {"error"}          CAPTURE_TOKEN set and bearer token missing/wrong
+    GET /health -> 200 {"ok": true}
+"""
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.utils import get_env, get_int
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Capture:
+    url: str
+    title: str = ""
+    text: str = ""
+    source: str = "plugin"
+
+
+def parse_capture(payload: Any) -> Capture:
+    """
+    Validate a decoded JSON body.
+
+    Raises:
+        ValueError: If the payload is not an object or has no http(s) url
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("body must be a JSON object")
+    url = str(payload.get("url") or "").strip()
+    if not url.startswith(("http://", "https://")):
+        raise ValueError("url must be an http(s) URL")
+    text = payload.get("text") or payload.get("raw_text") or ""
+    source = payload.get("source") or payload.get("source_channel") or "plugin"
+    return Capture(
+        url=url,
+        title=str(payload.get("title") or "").strip(),
+        text=str(text).strip(),
+        source=str(source).strip(),
+    )
+
+
+class KeyedLock:
+    """
+    One lock per key, created on demand and dropped when no thread holds or
+    waits for it. Request threads use it so two pushes of the same canonical
+    URL cannot both pass the duplicate check before either page exists.
+    """
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, List[Any]] = {}  # key -> [lock, holders + waiters]
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+
+class CaptureServer:
+    """
+    Threaded stdlib HTTP server around an ``accept(capture) -> dict`` callback.
+
+    Args:
+        accept: Called once per valid capture; its dict is returned as JSON
+        host: Bind address (CAPTURE_HOST, default 127.0.0.1)
+        port: Bind port (CAPTURE_PORT, default 8765; 0 picks a free port)
+        token: Optional bearer token required on POST (CAPTURE_TOKEN)
+    """
+
+    def __init__(
+        self,
+        accept: Callable[[Capture], Dict[str, Any]],
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        token: Optional[str] = None,
+    ) -> None:
+        self.accept = accept
+        self.token = token if token is not None else get_env("CAPTURE_TOKEN", "")
+        bind = (
+            host if host is not None else get_env("CAPTURE_HOST", "127.0.0.1"),
+            port if port is not None else get_int("CAPTURE_PORT", 8765),
+        )
+        self._httpd = ThreadingHTTPServer(bind, self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt: str, *args: Any) -> None:
+                logger.debug("capture: " + fmt, *args)
+
+            def _reply(self, code: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                if self.path == "/health":
+                    self._reply(200, {"ok": True})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self) -> None:
+                if self.path != "/capture":
+                    self._reply(404, {"error": "not found"})
+                    return
+                if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+                    self._reply(401, {"error": "unauthorized"})
+                    return
+                header = self.headers.get("Content-Length")
+                if header is None:
+                    self._reply(411, {"error": "Content-Length required"})
+                    return
+                try:
+                    length = int(header)
+                except ValueError:
+                    self._reply(400, {"error": "invalid Content-Length"})
+                    return
+                if length <= 0 or length > MAX_BODY_BYTES:
+                    self._reply(400, {"error": "missing or oversized body"})
+                    return
+                try:
+                    capture = parse_capture(json.loads(self.rfile.read(length).decode("utf-8")))
+                except (ValueError, UnicodeDecodeError) as exc:
+                    self._reply(400, {"error": str(exc)})
+                    return
+                try:
+                    result = server.accept(capture)
+                except Exception as exc:
+                    logger.exception("Capture failed for %s", capture.url)
+                    self._reply(500, {"error": str(exc)})
+                    return
+                self._reply(202, result)
+
+        return Handler
+
+    def start(self) -> None:
+        """Serve on a background thread (tests, embedding)."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="capture", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
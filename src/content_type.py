@@ -7,7 +7,7 @@ Detection uses HTTP HEAD requests (fast, no body download) with extension fallba
 import asyncio
 import logging
 from enum import Enum
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
@@ -229,11 +229,26 @@ def _fallback_inference(url: str, reason_prefix: str) -> Tuple[ContentType, str]
     return (ContentType.UNKNOWN, reason_prefix)
 
 
+def infer_content_type(url: str, content_type_header: Optional[str] = None) -> Tuple[ContentType, str]:
+    """
+    Classify without a network request: known header first, then extension/domain.
+
+    Used when the Content-Type header is already available from a browser
+    navigation, so no separate HEAD request is needed.
+    """
+    if content_type_header:
+        ctype = parse_mime_type(content_type_header)
+        if ctype != ContentType.UNKNOWN:
+            return (ctype, f"Content-Type: {content_type_header}")
+    return _fallback_inference(url, "no Content-Type header")
+
+
 async def detect_content_type(
     url: str,
     timeout: float = 5.0,
     follow_redirects: bool = True,
     max_redirects: int = 5,
+    client: Optional[Any] = None,
 ) -> Tuple[ContentType, str]:
     """
     Detect ContentType via URL extension first, then HTTP HEAD request.
@@ -249,6 +264,7 @@ async def detect_content_type(
         timeout: Request timeout in seconds
         follow_redirects: Whether to follow redirects
         max_redirects: Maximum redirect hops
+        client: Optional shared httpx.AsyncClient (reuses connections across URLs)
         
     Returns:
         Tuple of (ContentType, reason_string)
@@ -266,34 +282,37 @@ async def detect_content_type(
         return _fallback_inference(url, "httpx not installed")
     
     try:
-        async with httpx.AsyncClient(
-            timeout=timeout,
-            follow_redirects=follow_redirects,
-            max_redirects=max_redirects,
-        ) as client:
-            resp = await client.head(url)
-            content_type_header = resp.headers.get("content-type")
-            
-            if content_type_header:
-                ctype = parse_mime_type(content_type_header)
-                if ctype != ContentType.UNKNOWN:
-                    return (ctype, f"Content-Type: {content_type_header}")
-            
-            # Fallback to extension
-            ext_type = infer_from_extension(url)
-            if ext_type != ContentType.UNKNOWN:
-                return (ext_type, f"Inferred from extension (no Content-Type header)")
-            
-            # Fallback to domain
-            domain_type = infer_from_domain(url)
-            if domain_type != ContentType.UNKNOWN:
-                return (domain_type, f"Inferred from domain (no Content-Type header)")
-            
-            # If response was successful but no type detected, assume HTML
-            if resp.status_code < 400:
-                return (ContentType.HTML, "Assumed HTML (successful response, no Content-Type)")
-            
-            return (ContentType.UNKNOWN, f"HTTP {resp.status_code}, no Content-Type")
+        if client is not None:
+            resp = await client.head(url, timeout=timeout, follow_redirects=follow_redirects)
+        else:
+            async with httpx.AsyncClient(
+                timeout=timeout,
+                follow_redirects=follow_redirects,
+                max_redirects=max_redirects,
+            ) as owned_client:
+                resp = await owned_client.head(url)
+        content_type_header = resp.headers.get("content-type")
+        
+        if content_type_header:
+            ctype = parse_mime_type(content_type_header)
+            if ctype != ContentType.UNKNOWN:
+                return (ctype, f"Content-Type: {content_type_header}")
+        
+        # Fallback to extension
+        ext_type = infer_from_extension(url)
+        if ext_type != ContentType.UNKNOWN:
+            return (ext_type, f"Inferred from extension (no Content-Type header)")
+        
+        # Fallback to domain
+        domain_type = infer_from_domain(url)
+        if domain_type != ContentType.UNKNOWN:
+            return (domain_type, f"Inferred from domain (no Content-Type header)")
+        
+        # If response was successful but no type detected, assume HTML
+        if resp.status_code < 400:
+            return (ContentType.HTML, "Assumed HTML (successful response, no Content-Type)")
+        
+        return (ContentType.UNKNOWN, f"HTTP {resp.status_code}, no Content-Type")
             
     except httpx.TimeoutException:
         return _fallback_inference(url, "HEAD timeout")
@@ -0,0 +1,998 @@
+"""
+Inbox ingest engine: triage, fetch, summarize and write back one item, and
+the batch runners that drive many items (thread pool, shared event loop,
+staged pipeline and the fused preprocess + ingest pass), plus the pending
+listing they all start from. The ``main.py`` modes in src.runners call these.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from tenacity import RetryError
+except Exception:  # pragma: no cover
+    RetryError = Exception
+
+from src.browser import BrowserSession, extract_text, fetch_page_content, fetch_rendered_page
+from src.llm import PROMPT_VERSION, RULE_VERSION, classify, generate_digest
+from src.journal import RunJournal
+from src.lease import Lease, LeaseManager
+from src.notion import SETTLED_NOTE, NotionManager
+from src.notion_async import AsyncNotion
+from src.pipeline import Outcome, Stage, run_pipeline
+from src.content_type import ContentType, infer_content_type, infer_from_extension
+from src.preprocess import (
+    assign_note_sequences,
+    preprocess_item,
+    route_fetched_url_resource,
+)
+from src.quarantine import Quarantine
+from src.retry import RetryQueue, is_transient
+from src.routing import ItemType, classify_item
+from src.scheduler import Deadline, HostShards, PriorityPolicy, page_host, prioritize
+from src.utils import get_bool, get_env, get_int, normalize_tweet_url
+from src.watch import HighWaterMark
+from urllib.parse import urlparse
+
+
+def is_attachment_unprocessed(url: str) -> bool:
+    lowered = url.lower()
+    return lowered.endswith((".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp"))
+
+
+# Bump whenever park_reason() changes (e.g. OCR support) so every parked item is re-evaluated
+PARK_RULES_VERSION = "1"
+
+
+def park_reason(page: dict) -> Optional[str]:
+    """
+    Why ingest parks this page as ``unprocessed`` (None if it would not).
+
+    Depends only on the page's URL and files, so a page that is already
+    ``unprocessed`` and still has a park reason would just be parked again.
+    """
+    url = page.get("url")
+    if not url:
+        if page.get("attachments"):
+            return "Attachment stored; no URL; OCR out of scope; excluded from digests"
+        return None
+    if is_attachment_unprocessed(url):
+        return "Attachment stored; OCR out of scope; excluded from digests"
+    return None
+
+
+def is_parked(page: dict, notion: NotionManager) -> bool:
+    """True for ``unprocessed`` pages whose URL/files would park them again unchanged."""
+    return page.get("status") == notion.status.unprocessed and park_reason(page) is not None
+
+
+def _canonical_target(url: str) -> str:
+    from src.dedupe import canonical_url
+
+    return canonical_url(normalize_tweet_url(url) or url)
+
+
+def is_settled(page: dict, notion: NotionManager) -> bool:
+    """
+    True for low-confidence items left ``pending`` by an earlier run whose
+    fingerprint (canonical URL + rule/prompt version, as written by
+    set_classification) still matches: summarizing them again would repeat
+    the same fetch and LLM call for the same answer.
+
+    Only pages carrying SETTLED_NOTE count: mark_as_done writes it with the
+    pending status, so a page whose summary write never happened (crash,
+    failed capture) is picked up again.
+    """
+    url = page.get("url")
+    if not url or page.get("status") != notion.status.pending or page.get("reason") != SETTLED_NOTE:
+        return False
+    if page.get("rule_version") != RULE_VERSION or page.get("prompt_version") != PROMPT_VERSION:
+        return False
+    return page.get("canonical_url") == _canonical_target(url)
+
+
+def _domain_from_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    try:
+        parsed = urlparse(url)
+        return parsed.hostname
+    except Exception:
+        return None
+
+
+def _is_meaningful_name(name: str, url: Optional[str]) -> bool:
+    cleaned = (name or "").strip()
+    if not cleaned:
+        return False
+    lowered = cleaned.lower()
+    if lowered in {"untitled", "new page", "bookmark", "default"}:
+        return False
+    domain = _domain_from_url(url)
+    if domain and (cleaned == domain or cleaned.startswith("http")):
+        return False
+    return True
+
+
+async def _fetch_text(url: str, cdp_url: str, session: Optional[BrowserSession]) -> Optional[str]:
+    if session is None:
+        return await fetch_page_content(url, cdp_url)
+    return await fetch_page_content(url, cdp_url, session=session)
+
+
+def _fetch_failure_reason(exc: BaseException) -> str:
+    if isinstance(exc, RetryError):
+        last_exc = getattr(exc, "last_attempt", None)
+        if last_exc and last_exc.exception():
+            return str(last_exc.exception())
+    return str(exc)
+
+
+# Runs a blocking call off the event loop: AsyncNotion.run or asyncio.to_thread
+Offload = Callable[..., Awaitable[Any]]
+
+
+def _offload(notion_io: Optional[AsyncNotion]) -> Offload:
+    """Where an item's Notion (and journal/retry state) calls run: the bounded Notion pool if there is one."""
+    return notion_io.run if notion_io is not None else asyncio.to_thread
+
+
+async def _fetch_failed(
+    page: dict,
+    notion: NotionManager,
+    canonical: str,
+    exc: BaseException,
+    retries: Optional[RetryQueue],
+    quarantine: Optional[Quarantine] = None,
+    offload: Offload = asyncio.to_thread,
+) -> str:
+    """
+    Record a fetch failure. Transient ones (timeout, 5xx, Twitter server error)
+    leave the item pending in the retry queue while it has attempts left;
+    everything else marks it error right away. Only failures that end in error
+    (permanent ones and exhausted retries) count towards quarantine, so a URL
+    that fails too often in a row is quarantined without further retries.
+    """
+    page_id = page.get("id", "")
+    reason = _fetch_failure_reason(exc)
+    if retries is not None and is_transient(exc):
+        delay = await offload(retries.defer, page_id, reason)
+        if delay is not None:
+            logging.warning("Transient fetch failure for %s (%s); retrying in %.0fs", page_id, reason, delay)
+            return "retry"
+        reason = f"{reason} (gave up after {retries.max_attempts} retries)"
+    if quarantine is not None and await offload(quarantine.record_failure, canonical, page_id, reason):
+        logging.warning("Quarantined %s after %d consecutive failures", canonical, quarantine.threshold)
+        if retries is not None:
+            await offload(retries.clear, page_id)
+        reason = f"{reason} (quarantined after {quarantine.threshold} consecutive failures)"
+    await offload(notion.mark_as_error, page_id, f"fetch failed: {reason}")
+    return "error"
+
+
+def _fetch_succeeded(
+    retries: Optional[RetryQueue], quarantine: Optional[Quarantine], page: dict, canonical: str
+) -> None:
+    if retries is not None:
+        retries.clear(page.get("id", ""))
+    if quarantine is not None:
+        quarantine.record_success(canonical)
+
+
+def _triage_item(page: dict, notion: NotionManager) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Pre-fetch checks (missing URL, invalid tweet, duplicate, attachment).
+
+    Returns:
+        (outcome, target_url, canonical); a non-None outcome means the item is
+        already settled and must not be fetched.
+    """
+    page_id = page.get("id", "")
+    url = page.get("url")
+    attachments = page.get("attachments", [])
+    if not url:
+        if attachments:
+            notion.mark_unprocessed(page_id, park_reason(page))
+            return "unprocessed", None, None
+        else:
+            notion.mark_as_error(page_id, "missing url")
+            return "error", None, None
+
+    tweet_norm = normalize_tweet_url(url)
+    if tweet_norm is None and ("twitter.com" in url.lower() or "x.com" in url.lower()):
+        notion.mark_as_error(page_id, "invalid tweet url")
+        return "error", None, None
+    target_url = tweet_norm or url
+    canonical = _canonical_target(url)
+    existing = notion.find_by_canonical(canonical)
+    if existing and existing.get("id") != page_id:
+        if existing.get("status") in (notion.status.ready, notion.status.pending):
+            notion.set_duplicate_of(page_id, existing["id"], f"Duplicate of ready/pending {existing['id']}")
+            return "duplicate", None, None
+        notion.set_duplicate_of(page_id, existing["id"], f"Duplicate of {existing['id']}")
+        return "duplicate", None, None
+
+    # Attachment without OCR support
+    if is_attachment_unprocessed(url):
+        notion.mark_unprocessed(page_id, park_reason(page))
+        return "unprocessed", None, None
+
+    return None, target_url, canonical
+
+
+def _resume_progress(journal: Optional[RunJournal], page: dict) -> Dict:
+    """Journaled stages for this page, ignored if the page's URL changed since."""
+    if journal is None:
+        return {}
+    progress = journal.progress(page.get("id", ""))
+    fetched = progress.get("fetched")
+    if not fetched or fetched.get("url") != page.get("url"):
+        return {}
+    return progress
+
+
+def _journal_fetched(journal: Optional[RunJournal], page: dict, canonical: str, text: str) -> None:
+    if journal is not None:
+        journal.record(page.get("id", ""), "fetched", {"url": page.get("url"), "canonical": canonical, "text": text})
+
+
+def _journal_summarized(journal: Optional[RunJournal], page: dict, classification: Dict, summary: Dict) -> None:
+    if journal is not None:
+        journal.record(page.get("id", ""), "summarized", {"classification": classification, "summary": summary})
+
+
+def _summary_text(summary: Dict) -> str:
+    text = summary.get("tldr", "")
+    insights = summary.get("insights")
+    if insights:
+        text = (text + "\n" + insights).strip()
+    return text
+
+
+def _summarize(text: str) -> Tuple[Dict, Dict]:
+    """Run the LLM classification and digest for extracted text."""
+    return classify(text), generate_digest(text)
+
+
+def _write_results(
+    page: dict,
+    notion: NotionManager,
+    canonical: str,
+    text: str,
+    classification: Dict,
+    summary: Dict,
+    journal: Optional[RunJournal] = None,
+) -> str:
+    """
+    Write classification, summary/status and backfilled title for a summarized item.
+
+    With a journal, an already-recorded classification write is not repeated
+    and the item's attempt is closed once the status has been written. Inside
+    a unit of work both journal entries wait until the coalesced update has
+    actually been sent (see NotionManager.after_write), so a crash while it is
+    still buffered leaves the item to be written again on resume.
+    """
+    page_id = page.get("id", "")
+    url = page.get("url")
+    source = page.get("source") or "manual"
+
+    tags = classification.get("tags", [])
+    sensitivity = classification.get("sensitivity", "public")
+    confidence = float(classification.get("confidence", 0.0))
+    rule_version = classification.get("rule_version", "rule-v0")
+    prompt_version = classification.get("prompt_version", "prompt-v0")
+
+    if journal is None or "classified" not in journal.progress(page_id):
+        notion.set_classification(
+            page_id=page_id,
+            tags=tags,
+            sensitivity=sensitivity,
+            confidence=confidence,
+            rule_version=rule_version,
+            prompt_version=prompt_version,
+            raw_content=text,
+            canonical_url=canonical,
+            source=source,
+        )
+        if journal is not None:
+            notion.after_write(page_id, functools.partial(journal.record, page_id, "classified"))
+
+    threshold = float(get_env("CONFIDENCE_THRESHOLD", "0.5"))
+    summary_text = _summary_text(summary)
+    if confidence < threshold:
+        # If title仍不够清晰，用摘要首行回填标题，便于辨识
+        # (before mark_as_done, whose settled Reason must be the last one written)
+        title_existing = page.get("title", "")
+        if not _is_meaningful_name(title_existing, url):
+            fallback_title = summary_text.splitlines()[0][:140] if summary_text else ""
+            if fallback_title:
+                notion.set_title(page_id, fallback_title, note="Backfilled Name from summary (low confidence)")
+        notion.mark_as_done(page_id, summary_text, status=notion.status.pending)
+        if journal is not None:
+            notion.after_write(page_id, functools.partial(journal.complete, page_id))
+        return "success"
+
+    note_status = None
+    if source == "plugin":
+        note_status = notion.status.ready
+    notion.mark_as_done(page_id, summary_text, status=note_status)
+    if journal is not None:
+        notion.after_write(page_id, functools.partial(journal.complete, page_id))
+    # Ready case也回填标题（若原有标题无意义）
+    title_existing = page.get("title", "")
+    if not _is_meaningful_name(title_existing, url):
+        fallback_title = summary_text.splitlines()[0][:140] if summary_text else ""
+        if fallback_title:
+            notion.set_title(page_id, fallback_title, note="Backfilled Name from summary")
+    return "success"
+
+
+async def _summarize_and_write(
+    page: dict,
+    notion: NotionManager,
+    progress: Dict,
+    journal: Optional[RunJournal],
+    offload: Offload = asyncio.to_thread,
+) -> str:
+    """Summarize fetched text (unless journaled already) and write the results."""
+    canonical, text = progress["fetched"]["canonical"], progress["fetched"]["text"]
+    if "summarized" in progress:
+        classification, summary = progress["summarized"]["classification"], progress["summarized"]["summary"]
+    else:
+        classification, summary = await asyncio.to_thread(_summarize, text)
+        await offload(_journal_summarized, journal, page, classification, summary)
+    return await offload(_write_results, page, notion, canonical, text, classification, summary, journal)
+
+
+async def process_item_async(
+    page: dict,
+    notion: NotionManager,
+    cdp_url: str,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> str:
+    """
+    Fetch, classify, summarize and write back one Inbox page.
+
+    Browser work is awaited on the caller's loop (optionally through a shared
+    BrowserSession); blocking Notion and LLM calls run in worker threads so
+    other items keep making progress. With ``notion_io``, every Notion call
+    and the journal/retry bookkeeping queue on its bounded pool; the LLM call
+    stays on the default executor. With a journal, an item interrupted by a
+    crash resumes after its last completed stage. With a retry queue,
+    transient fetch failures return ``retry`` and leave the page pending.
+    """
+    page_id = page.get("id", "")
+    offload = _offload(notion_io)
+    progress = await offload(_resume_progress, journal, page)
+    if "fetched" in progress:
+        logging.info("Resuming %s from journal (stages: %s)", page_id, ", ".join(progress))
+        return await _summarize_and_write(page, notion, progress, journal, offload)
+
+    outcome, target_url, canonical = await offload(_triage_item, page, notion)
+    if outcome:
+        return outcome
+
+    try:
+        text = await _fetch_text(target_url, cdp_url, session)
+    except Exception as exc:  # RetryError, RuntimeError, etc.
+        return await _fetch_failed(page, notion, canonical, exc, retries, quarantine, offload)
+    await offload(_fetch_succeeded, retries, quarantine, page, canonical)
+
+    if not text:
+        await offload(notion.mark_as_error, page_id, "no content")
+        return "error"
+
+    await offload(_journal_fetched, journal, page, canonical, text)
+    fetched = {"fetched": {"canonical": canonical, "text": text}}
+    return await _summarize_and_write(page, notion, fetched, journal, offload)
+
+
+def process_item(
+    page: dict,
+    notion: NotionManager,
+    cdp_url: str,
+    journal: Optional[RunJournal] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+) -> str:
+    """Synchronous wrapper that runs process_item_async on a private event loop."""
+    return asyncio.run(
+        process_item_async(page, notion, cdp_url, journal=journal, retries=retries, quarantine=quarantine)
+    )
+
+
+def _tally(results: List[str]) -> Dict[str, int]:
+    """
+    Outcome counters for a batch; items not dispatched before the deadline
+    count as deferred, items waiting in the retry queue as retry.
+    """
+    counts = {"success": 0, "error": 0, "duplicate": 0, "unprocessed": 0, "deferred": 0, "retry": 0}
+    for result in results:
+        if result in counts:
+            counts[result] += 1
+    return counts
+
+
+def _process_item_safely(
+    page: dict,
+    notion: NotionManager,
+    cdp_url: str,
+    journal: Optional[RunJournal] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+) -> str:
+    """
+    Run process_item, turning unexpected exceptions into a per-item error.
+    The item's property writes are coalesced into one update (see NotionManager.unit_of_work).
+    """
+    page_id = page.get("id", "")
+    try:
+        with notion.unit_of_work(page_id):
+            return process_item(page, notion, cdp_url, journal, retries, quarantine)
+    except Exception as exc:
+        logging.exception("Ingest failed for %s", page_id)
+        try:
+            notion.mark_as_error(page_id, f"ingest failed: {exc}")
+        except Exception:
+            logging.warning("Unable to record ingest failure for %s", page_id)
+        return "error"
+
+
+def run_ingest(
+    pending: List[dict],
+    notion: NotionManager,
+    cdp_url: str,
+    workers: int = 1,
+    journal: Optional[RunJournal] = None,
+    deadline: Optional[Deadline] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+) -> Dict[str, int]:
+    """
+    Process pending items, optionally in parallel.
+
+    Each item runs in isolation: a failure in one item is recorded as an
+    error for that item and never aborts the rest of the batch.
+
+    Args:
+        pending: Simplified pages from NotionManager.get_pending_tasks
+        notion: NotionManager instance (shared by all workers)
+        cdp_url: Chrome DevTools Protocol URL
+        workers: Maximum number of items processed concurrently
+        journal: Optional RunJournal for resuming items interrupted by a crash
+        deadline: Optional time budget; items not started before it is
+            exhausted are left pending and counted as deferred
+        retries: Optional RetryQueue; transient fetch failures stay pending
+            and are counted as retry
+        quarantine: Optional Quarantine; URLs failing too often in a row
+            are marked error and left out of later listings
+
+    Returns:
+        Outcome counters keyed by success/error/duplicate/unprocessed/deferred/retry
+    """
+
+    def _run(item: dict) -> str:
+        if deadline is not None and deadline.exhausted():
+            return "deferred"
+        return _process_item_safely(item, notion, cdp_url, journal, retries, quarantine)
+
+    if workers <= 1:
+        results = [_run(item) for item in pending]
+    else:
+        # Each worker thread gets its own event loop via asyncio.run inside process_item
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+            results = list(pool.map(_run, pending))
+    return _tally(results)
+
+
+async def _guard_item(
+    page: dict, notion: NotionManager, work: Awaitable[str], offload: Offload = asyncio.to_thread
+) -> str:
+    """
+    Await one item's work, turning unexpected exceptions into a per-item error.
+    The item's property writes are coalesced into one update sent when the work ends.
+    """
+    page_id = page.get("id", "")
+    try:
+        async with notion.unit_of_work_async(page_id, offload):
+            return await work
+    except Exception as exc:
+        logging.exception("Ingest failed for %s", page_id)
+        try:
+            await offload(notion.mark_as_error, page_id, f"ingest failed: {exc}")
+        except Exception:
+            logging.warning("Unable to record ingest failure for %s", page_id)
+        return "error"
+
+
+async def _gather_within(work: List[Awaitable[str]], deadline: Optional[Deadline]) -> List[str]:
+    """
+    Await per-item coroutines; at the hard end of the budget cancel what is
+    still running and report it as deferred (journaled stages survive, so the
+    next run resumes those items).
+    """
+    if deadline is None or deadline.budget_seconds is None:
+        return list(await asyncio.gather(*work))
+    tasks = [asyncio.ensure_future(w) for w in work]
+    if not tasks:
+        return []
+    _, unfinished = await asyncio.wait(tasks, timeout=max(0.0, deadline.remaining()))
+    for task in unfinished:
+        task.cancel()
+    await asyncio.gather(*unfinished, return_exceptions=True)
+    if unfinished:
+        logging.warning("Deadline reached: cancelled %d in-flight item(s)", len(unfinished))
+    return [task.result() if task not in unfinished else "deferred" for task in tasks]
+
+
+async def _run_sharded(
+    items: List, workers: int, run_one: Callable[..., Awaitable[str]], deadline: Optional[Deadline], key: Callable
+) -> List[str]:
+    """
+    Run items on ``workers`` host-affine worker loops (see HostShards). Items
+    not started before the deadline, or cancelled at its hard end, are deferred.
+    """
+    shards = HostShards(items, key=key)
+    results: Dict[int, str] = {}
+
+    async def _worker(worker_id: int) -> None:
+        while (taken := shards.take(worker_id)) is not None:
+            index, item = taken
+            if deadline is not None and deadline.exhausted():
+                results[index] = "deferred"
+                continue
+            results[index] = await run_one(item)
+
+    tasks = [asyncio.ensure_future(_worker(worker_id)) for worker_id in range(workers)]
+    timeout = None if deadline is None or deadline.budget_seconds is None else max(0.0, deadline.remaining())
+    _, unfinished = await asyncio.wait(tasks, timeout=timeout)
+    for task in unfinished:
+        task.cancel()
+    await asyncio.gather(*unfinished, return_exceptions=True)
+    if unfinished:
+        logging.warning("Deadline reached: cancelled %d busy worker(s)", len(unfinished))
+    logging.info("Host affinity: %d shard(s), %d steal(s)", shards.shard_count, shards.steals)
+    return [results.get(index, "deferred") for index in range(len(items))]
+
+
+async def _dispatch(
+    items: List,
+    workers: int,
+    run_one: Callable[..., Awaitable[str]],
+    deadline: Optional[Deadline],
+    key: Callable = page_host,
+) -> List[str]:
+    """
+    Run ``run_one`` over items with at most ``workers`` in flight, results in
+    item order. Parallel runs shard items by host (INGEST_HOST_AFFINITY=false
+    keeps plain list order); a single worker always follows list order.
+    """
+    workers = max(1, workers)
+    if workers > 1 and items and get_bool("INGEST_HOST_AFFINITY", True):
+        return await _run_sharded(items, workers, run_one, deadline, key)
+    limit = asyncio.Semaphore(workers)
+
+    async def _bounded(item) -> str:
+        async with limit:
+            if deadline is not None and deadline.exhausted():
+                return "deferred"
+            return await run_one(item)
+
+    return await _gather_within([_bounded(item) for item in items], deadline)
+
+
+async def _process_item_safely_async(
+    page: dict,
+    notion: NotionManager,
+    cdp_url: str,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> str:
+    work = process_item_async(page, notion, cdp_url, session, journal, retries, quarantine, notion_io)
+    return await _guard_item(page, notion, work, _offload(notion_io))
+
+
+async def run_ingest_async(
+    pending: List[dict],
+    notion: NotionManager,
+    cdp_url: str,
+    workers: int = 1,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    deadline: Optional[Deadline] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> Dict[str, int]:
+    """
+    Async counterpart of run_ingest: up to ``workers`` items in flight on the
+    current loop, their Notion calls queued on ``notion_io`` if given.
+    """
+
+    async def _one(item: dict) -> str:
+        return await _process_item_safely_async(
+            item, notion, cdp_url, session, journal, retries, quarantine, notion_io
+        )
+
+    return _tally(await _dispatch(pending, workers, _one, deadline))
+
+
+async def process_item_fused(
+    page: dict,
+    notion: NotionManager,
+    cdp_url: str,
+    routed: Tuple[ItemType, str],
+    note_sequence: int = 1,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> str:
+    """
+    Preprocess and ingest one page in a single pass.
+
+    The page is routed by the caller, and URL resources are opened exactly
+    once: title, text and Content-Type all come from the same navigation, so
+    neither the HEAD request nor the separate title fetch of preprocess runs.
+    Notion and journal/retry calls go through ``notion_io`` as in
+    process_item_async.
+    """
+    offload = _offload(notion_io)
+    item_type, _ = routed
+    if item_type != ItemType.URL_RESOURCE:
+        # Notes and invalid items touch nothing but Notion
+        result = await offload(preprocess_item, page, notion, cdp_url, note_sequence, routed)
+        return "success" if result.get("action") == "ready" else "error"
+
+    page_id = page.get("id", "")
+    progress = await offload(_resume_progress, journal, page)
+    if "fetched" in progress:
+        # Routing and title backfill finished before the interruption
+        return await _summarize_and_write(page, notion, progress, journal, offload)
+
+    ext_type = infer_from_extension(page["url"])
+    if not ext_type.processable and ext_type != ContentType.UNKNOWN:
+        # Media/file URLs are recognised without navigation and parked as ready by preprocess
+        result = await offload(route_fetched_url_resource, page, notion, ext_type)
+        return "error" if result.get("action") == "error" else "success"
+
+    outcome, target_url, canonical = await offload(_triage_item, page, notion)
+    if outcome:
+        return outcome
+
+    try:
+        rendered = await fetch_rendered_page(target_url, cdp_url, session=session, want_title=True)
+    except Exception as exc:
+        return await _fetch_failed(page, notion, canonical, exc, retries, quarantine, offload)
+    await offload(_fetch_succeeded, retries, quarantine, page, canonical)
+    if rendered is None:
+        await offload(notion.mark_as_error, page_id, "no content")
+        return "error"
+
+    content_type, _ = infer_content_type(target_url, rendered.content_type)
+    text = None
+    if content_type.processable or content_type == ContentType.UNKNOWN:
+        text = await asyncio.to_thread(extract_text, rendered)
+
+    routing = await offload(route_fetched_url_resource, page, notion, content_type, rendered.title, text)
+    if routing.get("action") == "error":
+        return "error"
+    if not content_type.processable and content_type != ContentType.UNKNOWN:
+        return "success"
+    if not text:
+        await offload(notion.mark_as_error, page_id, "no content")
+        return "error"
+
+    routed_page = dict(page, title=routing.get("title") or page.get("title", ""))
+    await offload(_journal_fetched, journal, page, canonical, text)
+    fetched = {"fetched": {"canonical": canonical, "text": text}}
+    return await _summarize_and_write(routed_page, notion, fetched, journal, offload)
+
+
+async def run_fused(
+    pending: List[dict],
+    notion: NotionManager,
+    cdp_url: str,
+    workers: int = 1,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    note_counter: Optional[Iterator[int]] = None,
+    lease: Optional[LeaseManager] = None,
+    deadline: Optional[Deadline] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> Dict[str, int]:
+    """
+    Single pass over one pending query: route once, navigate once, summarize, write.
+
+    Items are routed up front and NOTE-YYYYMMDD-N numbers are pre-assigned
+    before dispatch by assign_note_sequences (oldest ``created_date`` first),
+    so host sharding and timing do not change them. Pass a shared
+    ``note_counter`` to keep numbering across several calls. With a ``lease``,
+    each item is claimed right before it runs and items held by another worker
+    are skipped (a skipped note leaves a gap in the numbering); an item parked
+    in the retry queue has its lease cut short to the retry's due time, so
+    any worker may pick it up then. Parallel runs give each worker
+    one host at a time (see _dispatch). With ``notion_io``, routing, the
+    lease claim requests and every item's Notion calls queue on its bounded
+    Notion pool instead of the default executor; the claim's settle wait
+    stays on the event loop.
+    """
+    limit = asyncio.Semaphore(max(1, workers))
+    offload = _offload(notion_io)
+
+    async def _route(page: dict) -> Tuple[ItemType, str]:
+        async with limit:
+            return await offload(classify_item, page, notion)
+
+    routes = await asyncio.gather(*(_route(page) for page in pending))
+    sequences = assign_note_sequences(pending, routes, counter=note_counter)
+
+    async def _one(item: Tuple[dict, Tuple[ItemType, str], int]) -> str:
+        page, routed, sequence = item
+        if lease is not None and not await lease.claim_async(page, offload):
+            return "skipped"
+        work = process_item_fused(
+            page, notion, cdp_url, routed, sequence, session, journal, retries, quarantine, notion_io
+        )
+        result = await _guard_item(page, notion, work, offload)
+        if lease is not None and result == "retry":
+            await offload(_release_for_retry, lease, retries, page)
+        return result
+
+    items = list(zip(pending, routes, sequences))
+    results = await _dispatch(items, workers, _one, deadline, key=lambda item: page_host(item[0]))
+    if lease is not None:
+        logging.info("Lease: skipped %d item(s) held by other workers", results.count("skipped"))
+    return _tally(results)
+
+
+def _release_for_retry(lease: LeaseManager, retries: Optional[RetryQueue], page: dict) -> None:
+    page_id = page.get("id", "")
+    due = retries.due_at(page_id) if retries is not None else None
+    try:
+        lease.release(page_id, datetime.fromtimestamp(due, timezone.utc) if due is not None else None)
+    except Exception as exc:
+        logging.warning("Lease: unable to release %s for retry: %s", page_id, exc)
+
+
+def _stage_workers(stage: str, default: int) -> int:
+    return max(1, get_int(f"PIPELINE_{stage.upper()}_WORKERS", default))
+
+
+async def run_ingest_pipeline(
+    pending: List[dict],
+    notion: NotionManager,
+    cdp_url: str,
+    workers: int = 1,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    deadline: Optional[Deadline] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> Dict[str, int]:
+    """
+    Staged ingest: fetch → extract → summarize → write over bounded queues.
+
+    The browser, trafilatura, the LLM and Notion each get their own worker
+    count (PIPELINE_<STAGE>_WORKERS), so a page can be fetched while another
+    is being summarized and a third is being written. PIPELINE_QUEUE_SIZE caps
+    how many payloads (and page texts) wait between two stages. With
+    ``notion_io``, the Notion and journal/retry calls of every stage queue on
+    its bounded pool; extraction and the LLM stay on the default executor.
+    """
+    offload = _offload(notion_io)
+
+    async def _fetch(job: dict):
+        if deadline is not None and deadline.exhausted():
+            return Outcome("deferred")
+        page = job["page"]
+        progress = await offload(_resume_progress, journal, page)
+        if "fetched" in progress:
+            job.update(progress["fetched"])
+            if "summarized" in progress:
+                job.update(progress["summarized"])
+            return job
+        outcome, target_url, canonical = await offload(_triage_item, page, notion)
+        if outcome:
+            return Outcome(outcome)
+        try:
+            rendered = await fetch_rendered_page(target_url, cdp_url, session=session)
+        except Exception as exc:
+            return Outcome(await _fetch_failed(page, notion, canonical, exc, retries, quarantine, offload))
+        await offload(_fetch_succeeded, retries, quarantine, page, canonical)
+        if rendered is None:
+            await offload(notion.mark_as_error, page.get("id", ""), "no content")
+            return Outcome("error")
+        job.update(canonical=canonical, rendered=rendered)
+        return job
+
+    async def _extract(job: dict):
+        if "text" in job:
+            return job
+        text = await asyncio.to_thread(extract_text, job.pop("rendered"))
+        if not text:
+            await offload(notion.mark_as_error, job["page"].get("id", ""), "no content")
+            return Outcome("error")
+        job["text"] = text
+        await offload(_journal_fetched, journal, job["page"], job["canonical"], text)
+        return job
+
+    async def _summarize_stage(job: dict):
+        if "summary" in job:
+            return job
+        job["classification"], job["summary"] = await asyncio.to_thread(_summarize, job["text"])
+        await offload(_journal_summarized, journal, job["page"], job["classification"], job["summary"])
+        return job
+
+    async def _write(job: dict):
+        # One coalesced update per item, as in the other ingest paths
+        async with notion.unit_of_work_async(job["page"].get("id", ""), offload):
+            outcome = await offload(
+                _write_results,
+                job["page"],
+                notion,
+                job["canonical"],
+                job["text"],
+                job["classification"],
+                job["summary"],
+                journal,
+            )
+        return Outcome(outcome)
+
+    async def _on_error(stage_name: str, job: dict, exc: BaseException) -> str:
+        page_id = job["page"].get("id", "")
+        try:
+            await offload(notion.mark_as_error, page_id, f"ingest failed at {stage_name}: {exc}")
+        except Exception:
+            logging.warning("Unable to record ingest failure for %s", page_id)
+        return "error"
+
+    stages = [
+        Stage("fetch", _fetch, _stage_workers("fetch", workers)),
+        Stage("extract", _extract, _stage_workers("extract", 1)),
+        Stage("summarize", _summarize_stage, _stage_workers("summarize", workers)),
+        Stage("write", _write, _stage_workers("write", 2)),
+    ]
+    result = await run_pipeline(
+        ({"page": item} for item in pending),
+        stages,
+        on_error=_on_error,
+        queue_size=get_int("PIPELINE_QUEUE_SIZE", 8),
+    )
+    return _tally(result.outcomes)
+
+
+def _list_pending(
+    notion: NotionManager,
+    parked_mark: Optional[HighWaterMark] = None,
+    refresh: bool = False,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    **query,
+) -> List[dict]:
+    """
+    Pending pages minus parked ones that would only be parked again,
+    settled low-confidence ones (``refresh=True`` keeps the latter), ones
+    whose URL is quarantined and ones still backing off in the retry queue.
+    ``processing`` pages are listed once their lease has expired, so an item
+    abandoned by a dead worker or capture endpoint is picked up again.
+
+    With ``parked_mark``, Notion returns ``unprocessed`` pages only if they were
+    edited after the previous run, so untouched parked items stop costing a
+    query row, a dedupe lookup and a status rewrite on every run.
+    """
+    since = parked_mark.get() if parked_mark is not None else None
+    pages = notion.get_pending_tasks(parked_since=since, include_processing=True, **query)
+    return _active_pages(pages, notion, refresh, retries, quarantine)
+
+
+def _lease_held(page: dict, notion: NotionManager, now: datetime) -> bool:
+    """True for ``processing`` pages whose lease has not expired yet."""
+    lease = Lease.parse(page.get("lease"))
+    if lease is None or lease.expired(now):
+        return False
+    return page.get("status") == notion.status.processing
+
+
+def _active_pages(
+    pages: List[dict],
+    notion: NotionManager,
+    refresh: bool = False,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+) -> List[dict]:
+    """The filters of _list_pending, for pages obtained some other way."""
+    now = datetime.now(timezone.utc)
+    unclaimed = [page for page in pages if not _lease_held(page, notion, now)]
+    if len(unclaimed) < len(pages):
+        logging.info("Skipping %d item(s) claimed by a live lease", len(pages) - len(unclaimed))
+    active = [page for page in unclaimed if not is_parked(page, notion)]
+    if len(active) < len(unclaimed):
+        logging.info("Skipping %d parked item(s) with unchanged URL/files", len(unclaimed) - len(active))
+    if not refresh:
+        settled = len(active)
+        active = [page for page in active if not is_settled(page, notion)]
+        if len(active) < settled:
+            logging.info("Skipping %d low-confidence item(s) with unchanged fingerprint", settled - len(active))
+    if quarantine is not None:
+        clean = len(active)
+        active = [
+            page
+            for page in active
+            if not page.get("url") or not quarantine.is_quarantined(_canonical_target(page["url"]))
+        ]
+        if len(active) < clean:
+            logging.info("Skipping %d item(s) with a quarantined URL", clean - len(active))
+    if retries is not None:
+        due = len(active)
+        active = [page for page in active if not retries.waiting(page.get("id", ""))]
+        if len(active) < due:
+            logging.info("Skipping %d item(s) waiting in the retry queue", due - len(active))
+    return _one_per_canonical(active)
+
+
+def _one_per_canonical(pages: List[dict]) -> List[dict]:
+    """
+    Keep only the first page of each canonical URL in a batch. Concurrent
+    workers would otherwise both pass the duplicate check before either page
+    carries the URL; the held-back pages stay pending and are found to be
+    duplicates on the next run.
+    """
+    seen = set()
+    kept = []
+    for page in pages:
+        url = page.get("url")
+        if url:
+            canonical = _canonical_target(url)
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+        kept.append(page)
+    if len(kept) < len(pages):
+        logging.info("Holding back %d item(s) sharing a URL with another item in this batch", len(pages) - len(kept))
+    return kept
+
+
+def _open_parked_mark() -> HighWaterMark:
+    """Per-rules-version cursor: a PARK_RULES_VERSION bump starts a full re-sweep."""
+    return HighWaterMark(f"parked:v{PARK_RULES_VERSION}")
+
+
+def _advance_parked_mark(parked_mark: HighWaterMark, run_started: datetime) -> None:
+    # Overlap covers Notion's minute-truncated last_edited_time
+    parked_mark.set((run_started - timedelta(minutes=2)).isoformat(timespec="seconds"))
+
+
+def _schedule(pending: List[dict], journal: Optional[RunJournal] = None) -> List[dict]:
+    """Order pending items by priority class, then age (INGEST_PRIORITY=false keeps query order)."""
+    if not get_bool("INGEST_PRIORITY", True):
+        return pending
+    is_cached = (lambda page: "fetched" in _resume_progress(journal, page)) if journal is not None else None
+    return prioritize(pending, PriorityPolicy(is_cached=is_cached))
+
+
+def _log_ingest_counts(counts: Dict[str, int]) -> None:
+    logging.info("Ingest results: %s", counts)
+    logging.info(
+        "METRIC ingest_counts success=%d error=%d duplicate=%d unprocessed=%d deferred=%d retry=%d",
+        counts["success"],
+        counts["error"],
+        counts["duplicate"],
+        counts["unprocessed"],
+        counts.get("deferred", 0),
+        counts.get("retry", 0),
+    )
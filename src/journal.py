@@ -0,0 +1,112 @@
+"""
+Append-only run journal for resumable processing.
+
+Every completed stage of an item (or report) is appended as a row keyed by
+the item's id. After a crash the next run reads the stages recorded since the
+key's last ``done`` row and continues from there instead of paying again for
+browser fetches and LLM calls.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.state import connect
+from src.utils import get_int
+
+DONE = "done"
+
+
+class RunJournal:
+    """
+    Stage journal backed by the local state database.
+
+    Stages used by the ingest path: ``fetched`` (url, canonical, text),
+    ``summarized`` (classification, summary), ``classified`` (Notion write
+    done) and ``done``. Reports use ``built`` (serialized ReportData),
+    ``written`` (page_id, blocks appended) and ``done``.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS journal (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    payload TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS journal_key ON journal (key, id)")
+
+    def record(self, key: str, stage: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Append a completed stage for ``key``."""
+        data = json.dumps(payload, ensure_ascii=False, default=str) if payload is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO journal (key, stage, payload, created_at) VALUES (?, ?, ?, ?)",
+                (key, stage, data, time.time()),
+            )
+
+    def complete(self, key: str) -> None:
+        """Close the current attempt for ``key``; later progress() calls start fresh."""
+        self.record(key, DONE)
+
+    def progress(self, key: str) -> Dict[str, Any]:
+        """
+        Stages recorded for the unfinished attempt of ``key``.
+
+        Returns:
+            Mapping of stage name to its latest payload ({} if nothing to resume)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT stage, payload FROM journal
+                WHERE key = ? AND id > COALESCE(
+                    (SELECT MAX(id) FROM journal WHERE key = ? AND stage = ?), 0)
+                ORDER BY id
+                """,
+                (key, key, DONE),
+            ).fetchall()
+        stages: Dict[str, Any] = {}
+        for stage, payload in rows:
+            stages[stage] = json.loads(payload) if payload else {}
+        return stages
+
+    def latest(self, key: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Most recent payload of ``stage`` for ``key``, finished attempts included."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM journal WHERE key = ? AND stage = ? ORDER BY id DESC LIMIT 1",
+                (key, stage),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]) if row[0] else {}
+
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        """Drop finished attempts older than the retention window; returns rows removed."""
+        days = retention_days if retention_days is not None else get_int("JOURNAL_RETENTION_DAYS", 14)
+        cutoff = time.time() - days * 86400
+        with self._lock:
+            cur = self._conn.execute(
+                """
+                DELETE FROM journal WHERE id <= (
+                    SELECT MAX(d.id) FROM journal d
+                    WHERE d.key = journal.key AND d.stage = ? AND d.created_at < ?
+                )
+                """,
+                (DONE, cutoff),
+            )
+            return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
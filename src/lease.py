@@ -0,0 +1,162 @@
+"""
+Lease-based item claiming so several orchestrators can drain one Inbox.
+
+Notion has no compare-and-swap, so a claim is a read → write → re-read
+protocol:
+
+1. Re-read the page. It is claimable when its status is still pending-like
+   (or ``processing`` with an expired lease / a lease we already hold) and its
+   ``last_edited_time`` matches the snapshot from the pending query; any other
+   edit means someone else touched it in between.
+2. Write status ``processing`` plus ``Lease = <owner>@<expiry>``.
+3. Wait ``settle_seconds`` and re-read. Concurrent claimers overwrite each
+   other's lease (last write wins); only the worker that still sees its own
+   owner proceeds.
+
+A worker that dies leaves the page in ``processing``; once the lease expires
+any worker may reclaim it. A worker that backs off from an item (retry queue)
+releases it early: the lease is re-stamped to expire when the retry is due.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.utils import get_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Lease:
+    owner: str
+    expires_at: datetime
+
+    def format(self) -> str:
+        return f"{self.owner}@{self.expires_at.astimezone(timezone.utc).isoformat(timespec='seconds')}"
+
+    @classmethod
+    def parse(cls, text: Optional[str]) -> Optional["Lease"]:
+        """Parse ``owner@expiry``; returns None for empty or malformed values."""
+        if not text or "@" not in text:
+            return None
+        owner, _, expiry = text.rpartition("@")
+        try:
+            expires_at = datetime.fromisoformat(expiry.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return cls(owner=owner, expires_at=expires_at)
+
+    def expired(self, now: Optional[datetime] = None) -> bool:
+        return (now or datetime.now(timezone.utc)) >= self.expires_at
+
+
+def default_owner() -> str:
+    """Unique per process: host, pid and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaseManager:
+    """
+    Claims Inbox pages for this worker.
+
+    Args:
+        notion: NotionManager (needs get_page / set_lease)
+        owner: Lease owner id (defaults to host:pid:random)
+        ttl_seconds: Lease lifetime; must exceed the slowest single item
+            (LEASE_TTL_SECONDS, default 900)
+        settle_seconds: Wait before verifying a claim (LEASE_SETTLE_SECONDS, default 2)
+    """
+
+    def __init__(
+        self,
+        notion: Any,
+        owner: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        settle_seconds: Optional[float] = None,
+    ) -> None:
+        self.notion = notion
+        self.owner = owner or default_owner()
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else get_int("LEASE_TTL_SECONDS", 900)
+        self.settle_seconds = settle_seconds if settle_seconds is not None else get_int("LEASE_SETTLE_SECONDS", 2)
+
+    def _claimable(self, snapshot: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        status = self.notion.status
+        seen = snapshot.get("last_edited_time")
+        if seen and current.get("last_edited_time") and current["last_edited_time"] != seen:
+            return False
+        state = current.get("status")
+        if state in (None, "", status.to_read, status.pending, status.unprocessed):
+            return True
+        if state == status.processing:
+            lease = Lease.parse(current.get("lease"))
+            return lease is None or lease.expired() or lease.owner == self.owner
+        return False
+
+    def _stake(self, page: Dict[str, Any]) -> bool:
+        """Steps 1-2: re-read and, if claimable, write our lease."""
+        page_id = page.get("id", "")
+        current = self.notion.get_page(page_id)
+        if not self._claimable(page, current):
+            logger.debug("Lease: %s not claimable (status=%s)", page_id, current.get("status"))
+            return False
+        lease = Lease(self.owner, datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds))
+        self.notion.set_lease(page_id, lease.format())
+        return True
+
+    def _won(self, page_id: str) -> bool:
+        """Step 3 (after the settle wait): re-read and check that our lease survived."""
+        after = self.notion.get_page(page_id)
+        held = Lease.parse(after.get("lease"))
+        won = after.get("status") == self.notion.status.processing and held is not None and held.owner == self.owner
+        if not won:
+            logger.info("Lease: %s claimed by another worker", page_id)
+        return won
+
+    def claim(self, page: Dict[str, Any]) -> bool:
+        """
+        Try to take the lease on ``page`` (a simplified page from the pending query).
+
+        Returns:
+            True if this worker now holds the lease and may process the page
+        """
+        page_id = page.get("id", "")
+        try:
+            if not self._stake(page):
+                return False
+            if self.settle_seconds > 0:
+                time.sleep(self.settle_seconds)
+            return self._won(page_id)
+        except Exception as exc:
+            logger.warning("Lease: claim failed for %s: %s", page_id, exc)
+            return False
+
+    async def claim_async(
+        self, page: Dict[str, Any], offload: Callable[..., Awaitable[Any]] = asyncio.to_thread
+    ) -> bool:
+        """
+        claim() for event loops: only the Notion requests go through ``offload``
+        (e.g. AsyncNotion.run); the settle wait is an asyncio.sleep, so it holds
+        no thread.
+        """
+        page_id = page.get("id", "")
+        try:
+            if not await offload(self._stake, page):
+                return False
+            if self.settle_seconds > 0:
+                await asyncio.sleep(self.settle_seconds)
+            return await offload(self._won, page_id)
+        except Exception as exc:
+            logger.warning("Lease: claim failed for %s: %s", page_id, exc)
+            return False
+
+    def release(self, page_id: str, at: Optional[datetime] = None) -> None:
+        """Let our lease on ``page_id`` lapse at ``at`` (now by default) so any worker may reclaim it then."""
+        self.notion.set_lease(page_id, Lease(self.owner, at or datetime.now(timezone.utc)).format())
@@ -11,8 +11,20 @@ except PermissionError:
     pass
 
 
+_CLIENTS: Dict[str, object] = {}
+
+# Bump when classification rules / prompts change; items summarized under an
+# older version are picked up again instead of being skipped as settled
+RULE_VERSION = "rule-v0"
+PROMPT_VERSION = "prompt-v0"
+
+
 def _get_openai_client():
-    """Get OpenAI client if available, None otherwise."""
+    """Get OpenAI client if available, None otherwise.
+
+    Clients are cached per API key so long-running modes (``main.py watch``)
+    keep one warm HTTP connection pool instead of reconnecting on every call.
+    """
     api_key = os.getenv("OPENAI_API_KEY")
     # Clean any proxy envs that might be injected by shell/tools
     for k in [
@@ -47,7 +59,9 @@ def _get_openai_client():
     if not api_key:
         return None
     
-    return OpenAI(api_key=api_key)
+    if api_key not in _CLIENTS:
+        _CLIENTS[api_key] = OpenAI(api_key=api_key)
+    return _CLIENTS[api_key]
 
 
 def generate_overview(items: List[Dict]) -> str:
@@ -291,6 +305,15 @@ def parse_highlights(insights: str) -> List[str]:
     return highlights[:5]  # Max 5 highlights
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Rough prompt + completion tokens of one generate_digest call, for
+    throttling. Counts two characters per token so Chinese text is not
+    underestimated.
+    """
+    return min(len(text or ""), 8000) // 2 + 300
+
+
 def generate_digest(text: str) -> Dict[str, str]:
     """
     Summarize text with OpenAI if available; otherwise fall back to truncate.
@@ -344,8 +367,8 @@ def classify(text: str) -> Dict[str, any]:
         "tags": ["general"],
         "sensitivity": "public",
         "confidence": 0.8,
-        "rule_version": "rule-v0",
-        "prompt_version": "prompt-v0",
+        "rule_version": RULE_VERSION,
+        "prompt_version": PROMPT_VERSION,
     }
 
 
@@ -1,10 +1,20 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
 
 from notion_client import Client
 from notion_client.errors import APIResponseError
 
-from src.utils import get_env
+from src.content_type import ContentType, infer_from_extension
+from src.notion_rate import notion_http_client
+from src.notion_schema import NotionSchema, SchemaCache, load_schema, schema_key
+from src.utils import get_bool, get_env
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -15,6 +25,7 @@ class StatusNames:
     error: str = "Error"
     unprocessed: str = "unprocessed"
     to_read: str = "To Read"
+    processing: str = "processing"
 
 
 @dataclass(frozen=True)
@@ -37,6 +48,22 @@ class PropertyNames:
     item_type: str = "ItemType"  # Select: url_resource, note_content, empty_invalid
     content_type: str = "ContentType"  # Select: html, pdf, image, video, audio, json, text, binary, unknown
     created_date: str = "CreatedTime"  # Created time (auto-set by Notion)
+    lease: str = "Lease"  # Rich text: "<owner>@<expiry ISO>" while an item is claimed
+
+
+# Reason written together with the pending status of a low-confidence result (see main.is_settled)
+SETTLED_NOTE = "Low confidence; kept pending until its URL or rule/prompt version changes"
+
+
+@dataclass
+class PendingWrites:
+    """Property changes buffered for one page by NotionManager.unit_of_work."""
+
+    props: Dict[str, Any] = field(default_factory=dict)
+    status: Optional[str] = None
+    depth: int = 1
+    # Run once the buffered writes have reached Notion (see NotionManager.after_write)
+    after: List[Callable[[], None]] = field(default_factory=list)
 
 
 class NotionManager:
@@ -44,7 +71,7 @@ class NotionManager:
         token = get_env("NOTION_TOKEN", required=True)
         self.database_id = get_env("NOTION_ITEM_DB_ID", required=True)
         self.data_source_id = get_env("NOTION_ITEM_DS_ID", required=False)
-        self.client = Client(auth=token)
+        self.client = Client(auth=token, client=notion_http_client())
 
         self.status = StatusNames(
             pending=get_env("NOTION_STATUS_PENDING", StatusNames.pending),
@@ -53,6 +80,7 @@ class NotionManager:
             error=get_env("NOTION_STATUS_ERROR", StatusNames.error),
             unprocessed=get_env("NOTION_STATUS_UNPROCESSED", StatusNames.unprocessed),
             to_read=get_env("NOTION_STATUS_TO_READ", StatusNames.to_read),
+            processing=get_env("NOTION_STATUS_PROCESSING", StatusNames.processing),
         )
 
         self.prop = PropertyNames(
@@ -73,7 +101,16 @@ class NotionManager:
             prompt_version=get_env("NOTION_PROP_PROMPT_VERSION", PropertyNames.prompt_version),
             item_type=get_env("NOTION_PROP_ITEM_TYPE", PropertyNames.item_type),
             content_type=get_env("NOTION_PROP_CONTENT_TYPE", PropertyNames.content_type),
+            lease=get_env("NOTION_PROP_LEASE", PropertyNames.lease),
         )
+        self._units: Dict[str, PendingWrites] = {}
+        self._units_lock = threading.Lock()
+        self._schema: Optional[NotionSchema] = None
+        self._schema_loaded = False
+        self._schema_lock = threading.Lock()
+        # Optional src.url_index.CanonicalIndex answering find_by_canonical locally
+        self.canonical_index: Optional[Any] = None
+        self._index_lock = threading.Lock()
 
     def has_page_blocks(self, page_id: str) -> bool:
         """
@@ -117,8 +154,44 @@ class NotionManager:
         except Exception:
             return False
 
+    def _get_schema(self) -> Optional[NotionSchema]:
+        """Status type and query endpoint, probed once per manager (cached on disk, see src.notion_schema)."""
+        with self._schema_lock:
+            if not self._schema_loaded:
+                cache = SchemaCache() if get_bool("NOTION_SCHEMA_CACHE", True) else None
+                try:
+                    self._schema = load_schema(
+                        self.client, self.database_id, self.data_source_id, self.prop.status, cache
+                    )
+                finally:
+                    if cache is not None:
+                        cache.close()
+                self._schema_loaded = True
+            return self._schema
+
+    def _drop_schema(self) -> None:
+        """The database no longer matches the probed schema: use per-request fallbacks for this run."""
+        with self._schema_lock:
+            if self._schema is None:
+                return
+            self._schema = None
+            if get_bool("NOTION_SCHEMA_CACHE", True):
+                cache = SchemaCache()
+                try:
+                    cache.invalidate(schema_key(self.database_id, self.data_source_id, self.prop.status))
+                finally:
+                    cache.close()
+
     def _query(self, body: Dict[str, Any]) -> Dict[str, Any]:
         """Compat query helper for databases without .query convenience."""
+        schema = self._get_schema()
+        if schema is not None:
+            try:
+                return self.client.request(path=schema.query_path, method="post", body=body)
+            except APIResponseError as exc:
+                if exc.code not in ("invalid_request_url", "object_not_found"):
+                    raise
+                self._drop_schema()
         # Prefer data_source query if available; fallback to database query on invalid URL
         if self.data_source_id:
             ds_path = f"data_sources/{self.data_source_id}/query"
@@ -133,6 +206,21 @@ class NotionManager:
         db_path = f"databases/{self.database_id}/query"
         return self.client.request(path=db_path, method="post", body=body)
 
+    def iter_query(self, body: Dict[str, Any], page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream simplified pages for ``body``, following ``next_cursor`` until ``has_more`` is false.
+
+        Only one result page (``page_size`` rows, at most Notion's 100) is held at a time.
+        """
+        request = dict(body, page_size=max(1, min(100, page_size)))
+        while True:
+            resp = self._query(request)
+            for page in resp.get("results", []):
+                yield self._simplify_page(page)
+            cursor = resp.get("next_cursor")
+            if not resp.get("has_more") or not cursor:
+                return
+            request = dict(request, start_cursor=cursor)
+
     def _status_filter(self, name: str) -> Dict[str, Any]:
         """Use select filter to stay compatible with DBs whose Status is select."""
         return {"property": self.prop.status, "select": {"equals": name}}
@@ -196,6 +284,8 @@ class NotionManager:
         status_name = None
         if "status" in status_prop and isinstance(status_prop["status"], dict):
             status_name = status_prop["status"].get("name")
+        elif isinstance(status_prop.get("select"), dict):
+            status_name = status_prop["select"].get("name")
         
         # Extract item_type
         item_type_prop = props.get(self.prop.item_type, {})
@@ -219,6 +309,35 @@ class NotionManager:
         if isinstance(created_date_prop, dict) and "created_time" in created_date_prop:
             created_date_value = created_date_prop.get("created_time")
         
+        # Fingerprint written by set_classification (see main.is_settled)
+        canonical_value = props.get(self.prop.canonical_url, {}).get("url")
+        rule_version_prop = props.get(self.prop.rule_version, {})
+        rule_version_value = ""
+        if isinstance(rule_version_prop, dict):
+            vitems = rule_version_prop.get("rich_text", [])
+            if vitems:
+                rule_version_value = vitems[0].get("plain_text", "") or vitems[0].get("text", {}).get("content", "")
+        prompt_version_prop = props.get(self.prop.prompt_version, {})
+        prompt_version_value = ""
+        if isinstance(prompt_version_prop, dict):
+            vitems = prompt_version_prop.get("rich_text", [])
+            if vitems:
+                prompt_version_value = vitems[0].get("plain_text", "") or vitems[0].get("text", {}).get("content", "")
+
+        reason_prop = props.get(self.prop.reason, {})
+        reason_value = ""
+        if isinstance(reason_prop, dict):
+            ritems = reason_prop.get("rich_text", [])
+            if ritems:
+                reason_value = ritems[0].get("plain_text", "") or ritems[0].get("text", {}).get("content", "")
+
+        lease_prop = props.get(self.prop.lease, {})
+        lease_value = ""
+        if isinstance(lease_prop, dict):
+            litems = lease_prop.get("rich_text", [])
+            if litems:
+                lease_value = litems[0].get("plain_text", "") or litems[0].get("text", {}).get("content", "")
+
         # Generate page link
         page_id = page.get("id", "")
         page_link = f"https://notion.so/{page_id.replace('-', '')}" if page_id else ""
@@ -236,27 +355,93 @@ class NotionManager:
             "item_type": item_type_value,
             "content_type": content_type_value,
             "created_date": created_date_value,
+            "last_edited_time": page.get("last_edited_time"),
+            "lease": lease_value,
+            "canonical_url": canonical_value,
+            "rule_version": rule_version_value,
+            "prompt_version": prompt_version_value,
+            "reason": reason_value,
             "page_link": page_link,
             "raw": page,
         }
 
-    def get_pending_tasks(self) -> List[Dict[str, Any]]:
-        """Fetch pages whose status is To Read/pending/unprocessed."""
-        resp = self._query(
-            {
-                "filter": {
-                    "or": [
-                        self._status_filter(self.status.to_read),
-                        self._status_filter(self.status.pending),
-                        self._status_filter(self.status.unprocessed),
-                        self._status_empty_filter(),
-                    ]
-                }
+    def get_pending_tasks(
+        self,
+        edited_since: Optional[str] = None,
+        include_processing: bool = False,
+        parked_since: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch pages whose status is To Read/pending/unprocessed.
+
+        Args:
+            edited_since: Optional ISO timestamp; only pages whose last_edited_time
+                is on or after it are returned, oldest edit first (used by watch mode)
+            include_processing: Also return claimed pages so expired leases can be
+                reclaimed (see src.lease)
+            parked_since: Optional ISO timestamp; ``unprocessed`` (parked) pages are
+                only returned if edited on or after it. Ignored with edited_since,
+                which already limits every status (Notion allows two filter levels).
+        """
+        unprocessed = self._status_filter(self.status.unprocessed)
+        if parked_since and not edited_since:
+            unprocessed = {
+                "and": [
+                    unprocessed,
+                    {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": parked_since}},
+                ]
             }
-        )
-        return [self._simplify_page(p) for p in resp.get("results", [])]
+        statuses = [
+            self._status_filter(self.status.to_read),
+            self._status_filter(self.status.pending),
+            unprocessed,
+            self._status_empty_filter(),
+        ]
+        if include_processing:
+            statuses.append(self._status_filter(self.status.processing))
+        status_filter: Dict[str, Any] = {"or": statuses}
+        # A list, not a stream: callers filter, dedupe, sort and shard the whole batch
+        if not edited_since:
+            return list(self.iter_query({"filter": status_filter}))
 
-    def find_by_canonical(self, canonical_url: str) -> Optional[Dict[str, Any]]:
+        body = {
+            "filter": {
+                "and": [
+                    status_filter,
+                    {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": edited_since}},
+                ]
+            },
+            "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+        }
+        return list(self.iter_query(body))
+
+    def get_stale_ready(self, prompt_version: str) -> List[Dict[str, Any]]:
+        """
+        Ready pages whose Prompt Version differs from ``prompt_version``, read in
+        full up front: rewriting one moves it out of the filter, which would
+        shift a cursor still being followed.
+        """
+        body = {
+            "filter": {
+                "and": [
+                    self._status_filter(self.status.ready),
+                    {"property": self.prop.prompt_version, "rich_text": {"does_not_equal": prompt_version}},
+                ]
+            },
+            "sorts": [{"timestamp": "created_time", "direction": "descending"}],
+        }
+        return list(self.iter_query(body))
+
+    def get_page(self, page_id: str) -> Dict[str, Any]:
+        """Re-read a single page (fresh status, lease and last_edited_time)."""
+        return self._simplify_page(self.client.pages.retrieve(page_id=page_id))
+
+    def set_lease(self, page_id: str, lease: str) -> None:
+        """Move a page to the processing status and stamp the lease holder/expiry."""
+        props = {self.prop.lease: {"rich_text": [{"text": {"content": lease[:1900]}}]}}
+        # Never buffered: the claim protocol re-reads the page right after this write
+        self._write_status(page_id, self.status.processing, props)
+
+    def _query_canonical(self, canonical_url: str) -> Optional[Dict[str, Any]]:
         resp = self._query(
             {
                 "filter": {
@@ -270,21 +455,184 @@ class NotionManager:
             return None
         return self._simplify_page(results[0])
 
+    def iter_canonical(self) -> Iterator[Dict[str, Any]]:
+        """Every page with a Canonical URL, oldest first (for CanonicalIndex.rebuild)."""
+        body = {
+            "filter": {"property": self.prop.canonical_url, "url": {"is_not_empty": True}},
+            "sorts": [{"timestamp": "created_time", "direction": "ascending"}],
+        }
+        return self.iter_query(body)
+
+    def _sync_canonical_index(self) -> None:
+        with self._index_lock:
+            if self.canonical_index.needs_rebuild():
+                count = self.canonical_index.rebuild(self.iter_canonical())
+                logger.info("Canonical index rebuilt from Notion: %d URL(s)", count)
+
+    def find_by_canonical(self, canonical_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Page already carrying ``canonical_url``, if any.
+
+        With a canonical_index a miss costs no request (unless the index does
+        not trust its misses, see src.url_index); a hit is re-read so pages
+        deleted or edited since the last scan are not reported.
+        """
+        index = self.canonical_index
+        if index is None:
+            return self._query_canonical(canonical_url)
+        self._sync_canonical_index()
+        hit = index.lookup(canonical_url)
+        if hit is None:
+            if index.trust_misses:
+                return None
+            page = self._query_canonical(canonical_url)
+            if page is not None:
+                index.record(canonical_url, page["id"], page.get("status"))
+            return page
+        try:
+            raw = self.client.pages.retrieve(page_id=hit["id"])
+        except APIResponseError as exc:
+            if exc.code != "object_not_found":
+                raise
+            raw = None
+        page = self._simplify_page(raw) if raw and not raw.get("archived") and not raw.get("in_trash") else None
+        if page is None or page.get("canonical_url") != canonical_url:
+            # Stale entry: another page may still carry the URL, so ask Notion once
+            index.forget(canonical_url)
+            page = self._query_canonical(canonical_url)
+            if page is None:
+                return None
+        index.record(canonical_url, page["id"], page.get("status"))
+        return page
+
+    def begin_unit(self, page_id: str) -> None:
+        """Start buffering property writes for ``page_id`` (nested calls share one buffer)."""
+        with self._units_lock:
+            unit = self._units.get(page_id)
+            if unit is None:
+                self._units[page_id] = PendingWrites()
+            else:
+                unit.depth += 1
+
+    def commit_unit(self, page_id: str) -> None:
+        """End a begin_unit; the outermost one sends everything buffered in one pages.update."""
+        with self._units_lock:
+            unit = self._units.get(page_id)
+            if unit is None:
+                return
+            unit.depth -= 1
+            if unit.depth > 0:
+                return
+            del self._units[page_id]
+        self._send(page_id, unit.props, unit.status)
+        for callback in unit.after:
+            callback()
+
+    def flush(self, page_id: str) -> None:
+        """Checkpoint: send what is buffered for ``page_id`` now and keep buffering."""
+        with self._units_lock:
+            unit = self._units.get(page_id)
+            if unit is None:
+                return
+            props, status, after = unit.props, unit.status, unit.after
+            unit.props, unit.status, unit.after = {}, None, []
+        self._send(page_id, props, status)
+        for callback in after:
+            callback()
+
+    def after_write(self, page_id: str, callback: Callable[[], None]) -> None:
+        """
+        Run ``callback`` once every write made so far for ``page_id`` has reached
+        Notion: right away without an open unit, else after the unit's update
+        (never, if that update fails). Used to journal writes as done only when
+        they are.
+        """
+        with self._units_lock:
+            unit = self._units.get(page_id)
+            if unit is not None:
+                unit.after.append(callback)
+                return
+        callback()
+
+    @contextmanager
+    def unit_of_work(self, page_id: str) -> Iterator[None]:
+        """
+        Coalesce every property and status write for ``page_id`` made inside the
+        block (from any thread) into one pages.update on exit. Later values win,
+        exactly as if the writes had been sent one by one. Buffered writes are
+        sent on exit even if the block raises.
+        """
+        self.begin_unit(page_id)
+        try:
+            yield
+        finally:
+            self.commit_unit(page_id)
+
+    @asynccontextmanager
+    async def unit_of_work_async(
+        self, page_id: str, offload: Optional[Callable[..., Awaitable[Any]]] = None
+    ) -> AsyncIterator[None]:
+        """
+        unit_of_work for async stages: the final pages.update runs through
+        ``offload`` (default asyncio.to_thread) instead of blocking the loop.
+        """
+        self.begin_unit(page_id)
+        try:
+            yield
+        finally:
+            await (offload or asyncio.to_thread)(self.commit_unit, page_id)
+
+    def _buffer(self, page_id: str, props: Dict[str, Any], status: Optional[str] = None) -> bool:
+        """Add to an open unit of work; False if ``page_id`` has none (write immediately)."""
+        with self._units_lock:
+            unit = self._units.get(page_id)
+            if unit is None:
+                return False
+            unit.props.update(props)
+            if status is not None:
+                unit.status = status
+            return True
+
+    def _send(self, page_id: str, props: Dict[str, Any], status: Optional[str]) -> None:
+        if status is not None:
+            self._write_status(page_id, status, props)
+        elif props:
+            self._update_with_reason_fallback(page_id, props)
+
+    def _write(self, page_id: str, props: Dict[str, Any]) -> None:
+        if not self._buffer(page_id, props):
+            self._update_with_reason_fallback(page_id, props)
+
     def _set_status(self, page_id: str, status: str, extra_props: Optional[Dict[str, Any]] = None) -> None:
-        """Update status property; try Status type first, then fall back to select for compatibility."""
+        if not self._buffer(page_id, extra_props or {}, status):
+            self._write_status(page_id, status, extra_props)
+
+    def _write_status(self, page_id: str, status: str, extra_props: Optional[Dict[str, Any]] = None) -> None:
+        """Update status property with the probed type; without one try Status type first, then select."""
         base_props: Dict[str, Any] = extra_props.copy() if extra_props else {}
+        schema = self._get_schema()
+        if schema is not None and schema.status_type:
+            props = base_props.copy()
+            props[self.prop.status] = {schema.status_type: {"name": status}}
+            try:
+                self._update_with_reason_fallback(page_id, props)
+                return
+            except APIResponseError as exc:
+                if exc.code != "validation_error":
+                    raise
+                self._drop_schema()
         # First attempt: Status type
         try:
             props = base_props.copy()
             props[self.prop.status] = {"status": {"name": status}}
-            self.client.pages.update(page_id=page_id, properties=props)
+            self._update_with_reason_fallback(page_id, props)
             return
         except Exception:
             pass
         # Fallback: Select type
         props = base_props.copy()
         props[self.prop.status] = {"select": {"name": status}}
-        self.client.pages.update(page_id=page_id, properties=props)
+        self._update_with_reason_fallback(page_id, props)
 
     def _update_status(self, page_id: str, status: str, extra_props: Optional[Dict[str, Any]] = None) -> None:
         self._set_status(page_id, status, extra_props)
@@ -383,6 +731,9 @@ class NotionManager:
             self.prop.summary: {"rich_text": [{"text": {"content": summary[:1900]}}]},
         }
         target_status = status or self.status.ready
+        if target_status == self.status.pending:
+            # Only a low-confidence result is left pending here; the marker lands with the status
+            props = self._with_reason(SETTLED_NOTE, props)
         self._update_status(page_id, target_status, props)
 
     def mark_as_error(self, page_id: str, error: str) -> None:
@@ -394,6 +745,61 @@ class NotionManager:
         )
         self._update_status(page_id, self.status.error, props)
 
+    def mark_pending(self, page_id: str, note: str) -> None:
+        """Hand a page back to the regular polling path."""
+        self._update_status(page_id, self.status.pending, self._with_reason(note))
+
+    def create_item(
+        self,
+        url: str,
+        title: str,
+        source: Optional[str] = None,
+        canonical_url: Optional[str] = None,
+        status: Optional[str] = None,
+        lease: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create an Inbox page for a pushed capture and return it simplified.
+
+        Status is written with the probed property type, or as a Status
+        property first and as a Select on failure, like _write_status.
+        ContentType is set only when the URL extension gives it away; otherwise
+        preprocess detects it like for any other page.
+        """
+        props: Dict[str, Any] = {
+            self.prop.title: {"title": [{"text": {"content": (title or url)[:1900]}}]},
+            self.prop.url: {"url": url},
+            self.prop.item_type: {"select": {"name": "url_resource"}},
+        }
+        content_type = infer_from_extension(url)
+        if content_type != ContentType.UNKNOWN:
+            props[self.prop.content_type] = {"select": {"name": content_type.value}}
+        if source:
+            props[self.prop.source] = {"rich_text": [{"text": {"content": source[:1900]}}]}
+        if canonical_url:
+            props[self.prop.canonical_url] = {"url": canonical_url}
+        if lease:
+            props[self.prop.lease] = {"rich_text": [{"text": {"content": lease[:1900]}}]}
+        target_status = status or self.status.pending
+        parent = {"database_id": self.database_id}
+        schema = self._get_schema()
+        if schema is not None and schema.status_type:
+            props[self.prop.status] = {schema.status_type: {"name": target_status}}
+            page = self.client.pages.create(parent=parent, properties=props)
+        else:
+            try:
+                page = self.client.pages.create(
+                    parent=parent, properties={**props, self.prop.status: {"status": {"name": target_status}}}
+                )
+            except Exception:
+                page = self.client.pages.create(
+                    parent=parent, properties={**props, self.prop.status: {"select": {"name": target_status}}}
+                )
+        created = self._simplify_page(page)
+        if canonical_url and self.canonical_index is not None:
+            self.canonical_index.record(canonical_url, created.get("id", ""), target_status)
+        return created
+
     def mark_unprocessed(self, page_id: str, note: str) -> None:
         props = self._with_reason(
             note,
@@ -447,14 +853,14 @@ class NotionManager:
                 "created_time": {"on_or_before": until}
             })
 
-        resp = self._query({"filter": {"and": filters}})
-        return [self._simplify_page(p) for p in resp.get("results", [])]
+        # A list: the daily builder walks the items several times (tags, links, overview)
+        return list(self.iter_query({"filter": {"and": filters}}))
 
     def fetch_items_for_date(
         self,
         target_date,
         status_filter: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
         Fetch items created on a specific date (using CreatedDate property).
         
@@ -463,7 +869,8 @@ class NotionManager:
             status_filter: Optional status to filter by (e.g., "ready")
             
         Returns:
-            List of simplified page dicts for items created on target_date
+            Simplified page dicts for items created on target_date, yielded
+            one query page at a time (wrap in list() to reuse them)
         """
         from datetime import datetime, timedelta
         
@@ -489,8 +896,7 @@ class NotionManager:
         if status_filter:
             filters.append(self._status_filter(status_filter))
         
-        resp = self._query({"filter": {"and": filters}})
-        return [self._simplify_page(p) for p in resp.get("results", [])]
+        return self.iter_query({"filter": {"and": filters}})
 
     def set_duplicate_of(self, page_id: str, canonical_id: str, note: str) -> None:
         props = {
@@ -524,14 +930,28 @@ class NotionManager:
             props[self.prop.canonical_url] = {"url": canonical_url}
         if source:
             props[self.prop.source] = {"rich_text": [{"text": {"content": source[:1900]}}]}
-        self.client.pages.update(page_id=page_id, properties=props)
+        # A new classification is not settled until mark_as_done writes SETTLED_NOTE again
+        props[self.prop.reason] = {"rich_text": []}
+        self._write(page_id, props)
+        if canonical_url and self.canonical_index is not None:
+            # Only once the URL is on the page, or a stale-hit re-read would drop the entry
+            index = self.canonical_index
+            self.after_write(page_id, functools.partial(index.record, canonical_url, page_id))
+
+    def set_summary(self, page_id: str, summary: str, prompt_version: str) -> None:
+        """Replace the Summary and its Prompt Version only (status and classification stay)."""
+        props: Dict[str, Any] = {
+            self.prop.summary: {"rich_text": [{"text": {"content": summary[:1900]}}]},
+            self.prop.prompt_version: {"rich_text": [{"text": {"content": prompt_version}}]},
+        }
+        self._write(page_id, props)
 
     def set_title(self, page_id: str, title: str, note: Optional[str] = None) -> None:
         props: Dict[str, Any] = {
             self.prop.title: {"title": [{"text": {"content": title[:1900]}}]},
         }
         props = self._with_reason(note, props)
-        self.client.pages.update(page_id=page_id, properties=props)
+        self._write(page_id, props)
 
     def set_item_type(self, page_id: str, item_type: str) -> None:
         """
@@ -544,7 +964,7 @@ class NotionManager:
         props = {
             self.prop.item_type: {"select": {"name": item_type}},
         }
-        self.client.pages.update(page_id=page_id, properties=props)
+        self._write(page_id, props)
 
     def set_content_type(self, page_id: str, content_type: str) -> None:
         """
@@ -557,7 +977,7 @@ class NotionManager:
         props = {
             self.prop.content_type: {"select": {"name": content_type}},
         }
-        self.client.pages.update(page_id=page_id, properties=props)
+        self._write(page_id, props)
 
     def add_file_to_item(
         self,
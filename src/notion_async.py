@@ -0,0 +1,112 @@
+"""
+Awaitable facade over the blocking Notion managers.
+
+``NotionManager`` and ``ReportingDBManager`` wrap the synchronous
+``notion_client.Client``, so an async stage that calls them directly stalls
+the event loop for a whole HTTP round trip. ``AsyncNotion`` runs those calls
+on its own bounded thread pool instead of the loop's default executor:
+
+    notion_io = AsyncNotion(NotionManager())
+    await notion_io.mark_as_done(page_id, summary)        # any manager method
+    await notion_io.run(classify_item, page, notion_io.manager)  # any helper
+
+The pool size (NOTION_MAX_WORKERS, default 3) matches Notion's average limit
+of three requests per second, so a burst of writes queues here rather than
+turning into 429s. Time spent waiting for a free thread is recorded and
+logged as ``METRIC notion_queue``. Non-callable attributes (``status``,
+``prop``, ...) are passed through unchanged.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.utils import get_int
+
+logger = logging.getLogger(__name__)
+
+
+class QueueStats:
+    """Call count and queue wait (submit → start) of offloaded Notion calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.calls if self.calls else 0.0
+
+
+class AsyncNotion:
+    """
+    Args:
+        manager: NotionManager, ReportingDBManager or any object with blocking methods
+        max_workers: Concurrent Notion calls (NOTION_MAX_WORKERS, default 3)
+        clock: Monotonic clock used for queue wait (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        manager: Any,
+        max_workers: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.manager = manager
+        self.max_workers = max(1, max_workers if max_workers is not None else get_int("NOTION_MAX_WORKERS", 3))
+        self.stats = QueueStats()
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notion")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Await ``fn(*args, **kwargs)`` on the Notion pool."""
+        submitted = self._clock()
+
+        def _call() -> Any:
+            self.stats.record(self._clock() - submitted)
+            return fn(*args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(self._pool, _call)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "manager":
+            raise AttributeError(name)
+        attr = getattr(self.manager, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _offloaded(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(attr, *args, **kwargs)
+
+        return _offloaded
+
+    def log_stats(self) -> None:
+        logger.info(
+            "METRIC notion_queue calls=%d workers=%d wait_avg_ms=%.0f wait_max_ms=%.0f",
+            self.stats.calls,
+            self.max_workers,
+            self.stats.wait_avg * 1000,
+            self.stats.wait_max * 1000,
+        )
+
+    def close(self) -> None:
+        """Wait for running calls and stop the pool."""
+        self._pool.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncNotion":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await asyncio.to_thread(self.close)
@@ -0,0 +1,148 @@
+"""
+Process-wide pacing for all Notion API traffic.
+
+Notion allows roughly three requests per second per integration. Every
+``notion_client.Client`` built by the managers gets an httpx client from
+``notion_http_client()`` whose transport takes a token from one shared bucket
+before each request, so threads, async offloads and both managers draw on the
+same budget:
+
+- NOTION_REQUESTS_PER_SECOND (default 3; 0 disables pacing)
+- NOTION_BURST (default: one second's worth)
+- NOTION_RATE_SHARED=true keeps the bucket in the state database so several
+  processes on this machine (watch + webhook + cron) share it as well
+
+A 429 response pauses the whole bucket for its ``Retry-After`` (1s when the
+header is missing) and the request is sent again, up to NOTION_MAX_RETRIES
+(default 3) times; only then does the 429 reach the caller as an
+``APIResponseError``. Totals are logged as ``METRIC notion_rate``.
+"""
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import httpx
+
+from src.ratelimit import SQLiteTokenBucket, TokenBucket
+from src.utils import get_bool, get_int
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def retry_after_seconds(value: Optional[str], now: Optional[datetime] = None) -> float:
+    """Parse a ``Retry-After`` header (seconds or HTTP date)."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class RateLimitStats:
+    """Requests sent, 429s seen and time spent waiting for the bucket."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.throttled = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def record_throttled(self) -> None:
+        with self._lock:
+            self.throttled += 1
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    httpx transport that paces requests through a bucket and retries 429s.
+
+    Args:
+        bucket: TokenBucket / SQLiteTokenBucket shared by every client
+        max_retries: 429 retries per request (NOTION_MAX_RETRIES, default 3)
+        inner: Transport doing the actual I/O (default httpx.HTTPTransport)
+        stats: Where to record requests and waits
+    """
+
+    def __init__(
+        self,
+        bucket: Any,
+        max_retries: Optional[int] = None,
+        inner: Optional[httpx.BaseTransport] = None,
+        stats: Optional[RateLimitStats] = None,
+    ) -> None:
+        self.bucket = bucket
+        self.max_retries = max(0, max_retries if max_retries is not None else get_int("NOTION_MAX_RETRIES", 3))
+        self.inner = inner or httpx.HTTPTransport()
+        self.stats = stats or RateLimitStats()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        retries = 0
+        while True:
+            self.stats.record(self.bucket.acquire())
+            response = self.inner.handle_request(request)
+            if response.status_code != 429 or retries >= self.max_retries:
+                return response
+            delay = retry_after_seconds(response.headers.get("Retry-After"))
+            response.close()
+            self.stats.record_throttled()
+            retries += 1
+            logger.warning("Notion rate limited; pausing %.1fs (retry %d/%d)", delay, retries, self.max_retries)
+            self.bucket.pause(delay)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+_lock = threading.Lock()
+_bucket: Optional[Any] = None
+_stats = RateLimitStats()
+
+
+def notion_bucket() -> Any:
+    """The bucket shared by every Notion client in this process (built from env on first use)."""
+    global _bucket
+    with _lock:
+        if _bucket is None:
+            per_second = max(0, get_int("NOTION_REQUESTS_PER_SECOND", 3))
+            burst = max(1, get_int("NOTION_BURST", per_second or 1))
+            if get_bool("NOTION_RATE_SHARED", False):
+                _bucket = SQLiteTokenBucket("notion", per_second * 60, capacity=burst)
+            else:
+                _bucket = TokenBucket(per_second * 60, capacity=burst)
+        return _bucket
+
+
+def notion_rate_stats() -> RateLimitStats:
+    return _stats
+
+
+def notion_http_client(bucket: Optional[Any] = None) -> httpx.Client:
+    """httpx client for ``notion_client.Client(client=...)`` that goes through the shared bucket."""
+    return httpx.Client(transport=RateLimitedTransport(bucket or notion_bucket(), stats=_stats))
+
+
+def log_notion_rate() -> None:
+    logger.info(
+        "METRIC notion_rate requests=%d throttled=%d wait_total_ms=%.0f wait_max_ms=%.0f",
+        _stats.requests,
+        _stats.throttled,
+        _stats.wait_total * 1000,
+        _stats.wait_max * 1000,
+    )
@@ -0,0 +1,140 @@
+"""
+One-time probe of what a Notion database supports.
+
+Without it every status write tries ``{"status": ...}`` and then
+``{"select": ...}``, and every query tries ``data_sources/<id>/query`` before
+``databases/<id>/query``. The probe retrieves the schema once, records the
+Status property type and the working query endpoint, and caches the result
+in the state database for NOTION_SCHEMA_TTL_SECONDS (default 86400), so
+later runs and other processes skip the probe too.
+
+A probe that fails (network, permissions) yields no schema and callers keep
+their try-and-fall-back behavior; so does a cached schema that stops
+matching the database (the caller invalidates it).
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from notion_client.errors import APIResponseError
+
+from src.state import connect
+from src.utils import get_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NotionSchema:
+    query_path: str
+    status_type: Optional[str] = None  # "status" / "select"; None if the property is missing
+
+
+def probe_schema(client: Any, database_id: str, data_source_id: Optional[str], status_property: str) -> NotionSchema:
+    """
+    Retrieve the data source (or database) once and read off the query path
+    and the Status property type.
+
+    Raises:
+        Whatever the client raises for anything but an unsupported data source URL
+    """
+    definition: Optional[Dict[str, Any]] = None
+    query_path = f"databases/{database_id}/query"
+    if data_source_id:
+        try:
+            definition = client.request(path=f"data_sources/{data_source_id}", method="get")
+            query_path = f"data_sources/{data_source_id}/query"
+        except APIResponseError as exc:
+            if exc.code != "invalid_request_url":
+                raise
+    if definition is None:
+        definition = client.request(path=f"databases/{database_id}", method="get")
+    prop = (definition.get("properties") or {}).get(status_property) or {}
+    status_type = prop.get("type") if prop.get("type") in ("status", "select") else None
+    return NotionSchema(query_path=query_path, status_type=status_type)
+
+
+class SchemaCache:
+    """
+    Probed schemas in the state database, keyed by database / data source id.
+
+    Args:
+        path: State database path (defaults to STATE_DIR/state.db)
+        ttl_seconds: Age after which a schema is probed again (NOTION_SCHEMA_TTL_SECONDS, default 86400)
+        clock: Wall clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else get_int("NOTION_SCHEMA_TTL_SECONDS", 86400)
+        self._clock = clock
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS notion_schema (
+                    key TEXT PRIMARY KEY,
+                    schema TEXT NOT NULL,
+                    probed_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, key: str) -> Optional[NotionSchema]:
+        with self._lock:
+            row = self._conn.execute("SELECT schema, probed_at FROM notion_schema WHERE key = ?", (key,)).fetchone()
+        if row is None or self._clock() - row[1] > self.ttl_seconds:
+            return None
+        return NotionSchema(**json.loads(row[0]))
+
+    def put(self, key: str, schema: NotionSchema) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO notion_schema (key, schema, probed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET schema = excluded.schema, probed_at = excluded.probed_at",
+                (key, json.dumps(asdict(schema)), self._clock()),
+            )
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM notion_schema WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def schema_key(database_id: str, data_source_id: Optional[str], status_property: str) -> str:
+    return f"{database_id}:{data_source_id or ''}:{status_property}"
+
+
+def load_schema(
+    client: Any,
+    database_id: str,
+    data_source_id: Optional[str],
+    status_property: str,
+    cache: Optional[SchemaCache] = None,
+) -> Optional[NotionSchema]:
+    """Cached schema, probing (and caching) it when missing or stale; None if the probe fails."""
+    key = schema_key(database_id, data_source_id, status_property)
+    schema = cache.get(key) if cache is not None else None
+    if schema is not None:
+        return schema
+    try:
+        schema = probe_schema(client, database_id, data_source_id, status_property)
+    except Exception as exc:
+        logger.warning("Notion schema probe failed, using per-request fallbacks: %s", exc)
+        return None
+    logger.info("Notion schema: query=%s status=%s", schema.query_path, schema.status_type)
+    if cache is not None:
+        cache.put(key, schema)
+    return schema
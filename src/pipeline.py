@@ -0,0 +1,140 @@
+"""
+Staged async pipeline with bounded queues.
+
+Each stage has its own worker count and hands payloads to the next stage
+through an ``asyncio.Queue`` with a fixed ``maxsize``. A full queue blocks the
+upstream stage, so a slow consumer (e.g., Notion writes) throttles producers
+(e.g., browser fetches) instead of letting in-flight payloads pile up.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Outcome:
+    """Terminal result for an item; returning it from a stage ends that item's journey."""
+    value: str
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline stage.
+
+    Attributes:
+        name: Stage name used in logs and metrics
+        handler: Coroutine taking a payload and returning either the payload for
+            the next stage or an Outcome
+        concurrency: Number of workers pulling from this stage's queue
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    busy_seconds: float = 0.0
+    peak_queue: int = 0
+
+
+@dataclass
+class PipelineResult:
+    outcomes: List[str] = field(default_factory=list)
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+
+ErrorHandler = Callable[[str, Any, BaseException], Awaitable[str]]
+
+
+async def run_pipeline(
+    items: Iterable[Any],
+    stages: List[Stage],
+    on_error: ErrorHandler,
+    queue_size: int = 8,
+) -> PipelineResult:
+    """
+    Push ``items`` through ``stages`` and collect one outcome per item.
+
+    Args:
+        items: Initial payloads fed to the first stage
+        stages: Ordered stages; the last one must return an Outcome
+        on_error: Coroutine ``(stage_name, payload, exc) -> outcome`` used when a
+            handler raises, so one bad item never stops the pipeline
+        queue_size: Capacity of every inter-stage queue (backpressure bound)
+
+    Returns:
+        PipelineResult with outcomes and per-stage statistics
+    """
+    if not stages:
+        raise ValueError("pipeline needs at least one stage")
+
+    queues = [asyncio.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    result = PipelineResult(stages={stage.name: StageStats() for stage in stages})
+
+    async def _worker(index: int) -> None:
+        stage = stages[index]
+        inbox = queues[index]
+        outbox: Optional[asyncio.Queue] = queues[index + 1] if index + 1 < len(stages) else None
+        stats = result.stages[stage.name]
+        while True:
+            payload = await inbox.get()
+            if payload is _STOP:
+                return
+            started = time.monotonic()
+            try:
+                produced = await stage.handler(payload)
+            except Exception as exc:
+                logger.exception("Pipeline stage %s failed", stage.name)
+                produced = Outcome(await on_error(stage.name, payload, exc))
+            stats.processed += 1
+            stats.busy_seconds += time.monotonic() - started
+
+            if isinstance(produced, Outcome):
+                result.outcomes.append(produced.value)
+            elif outbox is None:
+                raise TypeError(f"final stage {stage.name} must return an Outcome")
+            else:
+                await outbox.put(produced)
+                next_stats = result.stages[stages[index + 1].name]
+                next_stats.peak_queue = max(next_stats.peak_queue, outbox.qsize())
+
+    workers = [
+        [asyncio.create_task(_worker(i)) for _ in range(max(1, stage.concurrency))]
+        for i, stage in enumerate(stages)
+    ]
+
+    try:
+        for item in items:
+            await queues[0].put(item)
+            result.stages[stages[0].name].peak_queue = max(
+                result.stages[stages[0].name].peak_queue, queues[0].qsize()
+            )
+        # Drain stage by stage: once every worker of a stage exits, stop the next one
+        for i, stage_workers in enumerate(workers):
+            for _ in stage_workers:
+                await queues[i].put(_STOP)
+            await asyncio.gather(*stage_workers)
+    except BaseException:
+        for stage_workers in workers:
+            for task in stage_workers:
+                task.cancel()
+        raise
+
+    for name, stats in result.stages.items():
+        logger.info(
+            "METRIC pipeline_stage name=%s processed=%d busy_s=%.2f peak_queue=%d",
+            name,
+            stats.processed,
+            stats.busy_seconds,
+            stats.peak_queue,
+        )
+    return result
@@ -7,15 +7,18 @@ Uses smart routing to classify items and apply appropriate processing:
 - EMPTY_INVALID: Mark as Error
 """
 import asyncio
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from src.browser import fetch_page_content, fetch_page_title
-from src.content_type import ContentType, detect_content_type_sync
+from src.browser import BrowserSession, fetch_page_content, fetch_page_title
+from src.content_type import ContentType, detect_content_type, detect_content_type_sync
+from src.dedupe import canonical_url
 from src.routing import ItemType, classify_item
-from src.utils import generate_note_name
+from src.utils import generate_note_name, get_int, normalize_tweet_url
 
 
 def _first_non_empty_line(text: str) -> Optional[str]:
@@ -48,6 +51,24 @@ def fetch_title_from_url(url: str, cdp_url: str) -> Optional[str]:
         return None
 
 
+async def fetch_text_from_url_async(url: str, cdp_url: str, session: Optional[BrowserSession] = None) -> Optional[str]:
+    """Async variant of fetch_text_from_url for callers that own the event loop."""
+    try:
+        return await fetch_page_content(url, cdp_url, session=session)
+    except Exception as exc:
+        logging.warning("Preprocess: fetch_page_content failed for %s: %s", url, exc)
+        return None
+
+
+async def fetch_title_from_url_async(url: str, cdp_url: str, session: Optional[BrowserSession] = None) -> Optional[str]:
+    """Async variant of fetch_title_from_url for callers that own the event loop."""
+    try:
+        return await fetch_page_title(url, cdp_url, session=session)
+    except Exception as exc:
+        logging.warning("Preprocess: fetch_page_title failed for %s: %s", url, exc)
+        return None
+
+
 def _domain_from_url(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
@@ -77,13 +98,100 @@ def _is_meaningful_name(name: str, url: Optional[str]) -> bool:
     return True
 
 
+def _title_fetch_allowed(content_type: ContentType) -> bool:
+    """Only processable (or undetected) types are worth opening in the browser for a title."""
+    return content_type.processable or content_type == ContentType.UNKNOWN
+
+
+def _fallback_title(page: Dict[str, Any], content_type: ContentType) -> Optional[str]:
+    """Title candidates that need no page navigation, in priority order."""
+    url = page.get("url")
+    raw_content = (page.get("raw_content") or "").strip()
+    attachments: List[str] = page.get("attachments") or []
+
+    title = None
+    if url and not _title_fetch_allowed(content_type):
+        # For non-processable types (PDF, IMAGE, etc.), use URL filename
+        title = _extract_filename_from_url(url, content_type)
+    if not title and raw_content:
+        title = derive_title_from_content(raw_content)
+    if not title and attachments:
+        title = attachments[0].split("/")[-1][:140]
+    if not title and url:
+        domain = _domain_from_url(url)
+        if domain:
+            title = f"Bookmark:{domain}"[:140]
+    return title
+
+
+def is_already_routed(page: Dict[str, Any]) -> bool:
+    """
+    True if an earlier run fully preprocessed this URL_RESOURCE: ItemType and
+    ContentType are set, the Name is meaningful, and the URL still matches the
+    Canonical URL recorded by ingest (when there is one).
+    """
+    url = (page.get("url") or "").strip()
+    if not url or page.get("item_type") != ItemType.URL_RESOURCE.value:
+        return False
+    try:
+        ContentType(page.get("content_type"))
+    except ValueError:
+        return False
+    stored_canonical = page.get("canonical_url")
+    if stored_canonical and stored_canonical != canonical_url(normalize_tweet_url(url) or url):
+        return False
+    return _is_meaningful_name((page.get("title") or "").strip(), url)
+
+
+def _skip_routed(page: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "action": "skip",
+        "reason": "already routed",
+        "item_type": "url_resource",
+        "content_type": page.get("content_type"),
+    }
+
+
+def _finish_url_resource(
+    page: Dict[str, Any],
+    notion: Any,
+    content_type: ContentType,
+    title: Optional[str],
+    has_name: bool,
+) -> Dict[str, Any]:
+    """Apply the ContentType-dependent outcome once title backfill is settled."""
+    page_id = page.get("id", "")
+    name = (page.get("title") or "").strip()
+
+    if not content_type.processable and content_type != ContentType.UNKNOWN:
+        # Non-processable content (PDF, IMAGE, VIDEO, AUDIO, BINARY)
+        # Use fallback handler: mark as ready without content extraction
+        summary = f"[{content_type.value.upper()}] {title or name or 'Untitled'}"
+        notion.mark_as_done(page_id, summary, status=notion.status.ready)
+        action = "backfilled" if title else ("skip" if has_name else "ready")
+        return {
+            "action": action,
+            "item_type": "url_resource",
+            "content_type": content_type.value,
+            "title": title,
+        }
+
+    # Processable content type
+    if has_name:
+        return {"action": "skip", "item_type": "url_resource", "content_type": content_type.value}
+    
+    if title:
+        return {"action": "backfilled", "title": title, "item_type": "url_resource", "content_type": content_type.value}
+
+    notion.mark_as_error(page_id, "unable to backfill Name from URL")
+    return {"action": "error", "reason": "backfill failed", "item_type": "url_resource", "content_type": content_type.value}
+
+
 def _process_url_resource(page: Dict[str, Any], notion: Any, cdp_url: str) -> Dict[str, Any]:
     """Process URL_RESOURCE: detect ContentType, backfill title if needed, set ItemType."""
     page_id = page.get("id", "")
     name = (page.get("title") or "").strip()
     url = page.get("url")
-    raw_content = (page.get("raw_content") or "").strip()
-    attachments: List[str] = page.get("attachments") or []
 
     # Always set ItemType
     notion.set_item_type(page_id, "url_resource")
@@ -108,53 +216,96 @@ def _process_url_resource(page: Dict[str, Any], notion: Any, cdp_url: str) -> Di
     title = None
 
     if not has_name:
-        # Try to backfill title regardless of ContentType
-        if url:
-            # For processable types, try fetching title from page
-            if content_type.processable or content_type == ContentType.UNKNOWN:
-                title = fetch_title_from_url(url, cdp_url)
-                if not title:
-                    text = fetch_text_from_url(url, cdp_url) or ""
-                    title = derive_title_from_content(text)
-            else:
-                # For non-processable types (PDF, IMAGE, etc.), use URL filename
-                title = _extract_filename_from_url(url, content_type)
-        
-        if not title and raw_content:
-            title = derive_title_from_content(raw_content)
-        if not title and attachments:
-            title = attachments[0].split("/")[-1][:140]
-        if not title and url:
-            domain = _domain_from_url(url)
-            if domain:
-                title = f"Bookmark:{domain}"[:140]
+        # For processable types, try fetching title from page
+        if url and _title_fetch_allowed(content_type):
+            title = fetch_title_from_url(url, cdp_url)
+            if not title:
+                text = fetch_text_from_url(url, cdp_url) or ""
+                title = derive_title_from_content(text)
+        title = title or _fallback_title(page, content_type)
 
         if title:
             notion.set_title(page_id, title, note="Backfilled Name from URL")
 
-    # Now handle based on ContentType processability
-    if not content_type.processable and content_type != ContentType.UNKNOWN:
-        # Non-processable content (PDF, IMAGE, VIDEO, AUDIO, BINARY)
-        # Use fallback handler: mark as ready without content extraction
-        summary = f"[{content_type.value.upper()}] {title or name or 'Untitled'}"
-        notion.mark_as_done(page_id, summary, status=notion.status.ready)
-        action = "backfilled" if title else ("skip" if has_name else "ready")
-        return {
-            "action": action,
-            "item_type": "url_resource",
-            "content_type": content_type.value,
-            "title": title,
-        }
+    return _finish_url_resource(page, notion, content_type, title, has_name)
 
-    # Processable content type
-    if has_name:
-        return {"action": "skip", "item_type": "url_resource", "content_type": content_type.value}
-    
-    if title:
-        return {"action": "backfilled", "title": title, "item_type": "url_resource", "content_type": content_type.value}
 
-    notion.mark_as_error(page_id, "unable to backfill Name from URL")
-    return {"action": "error", "reason": "backfill failed", "item_type": "url_resource", "content_type": content_type.value}
+def route_fetched_url_resource(
+    page: Dict[str, Any],
+    notion: Any,
+    content_type: ContentType,
+    fetched_title: Optional[str] = None,
+    fetched_text: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    URL_RESOURCE preprocessing for callers that already navigated to the page.
+
+    Performs the same writes and returns the same result shape as
+    _process_url_resource, using the title/text from that navigation instead
+    of a HEAD request and extra page loads.
+    """
+    page_id = page.get("id", "")
+    name = (page.get("title") or "").strip()
+    url = page.get("url")
+
+    # The navigation just observed the real type; rewrite only what changed
+    if page.get("item_type") != ItemType.URL_RESOURCE.value:
+        notion.set_item_type(page_id, "url_resource")
+    if page.get("content_type") != content_type.value:
+        notion.set_content_type(page_id, content_type.value)
+
+    has_name = _is_meaningful_name(name, url)
+    title = None
+    if not has_name:
+        if _title_fetch_allowed(content_type):
+            title = fetched_title or derive_title_from_content(fetched_text)
+        title = title or _fallback_title(page, content_type)
+        if title:
+            notion.set_title(page_id, title, note="Backfilled Name from URL")
+
+    return _finish_url_resource(page, notion, content_type, title, has_name)
+
+
+async def _process_url_resource_async(
+    page: Dict[str, Any],
+    notion: Any,
+    cdp_url: str,
+    session: Optional[BrowserSession] = None,
+    http_client: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Async URL_RESOURCE flow; Notion writes run in worker threads to keep the loop free."""
+    page_id = page.get("id", "")
+    name = (page.get("title") or "").strip()
+    url = page.get("url")
+
+    await asyncio.to_thread(notion.set_item_type, page_id, "url_resource")
+
+    content_type = ContentType.UNKNOWN
+    if url:
+        try:
+            content_type, content_type_reason = await detect_content_type(url, client=http_client)
+            logging.debug(f"ContentType detected for {url}: {content_type.value} ({content_type_reason})")
+        except Exception as e:
+            logging.warning(f"ContentType detection failed for {url}: {e}")
+            content_type = ContentType.UNKNOWN
+
+    await asyncio.to_thread(notion.set_content_type, page_id, content_type.value)
+
+    has_name = _is_meaningful_name(name, url)
+    title = None
+
+    if not has_name:
+        if url and _title_fetch_allowed(content_type):
+            title = await fetch_title_from_url_async(url, cdp_url, session)
+            if not title:
+                text = await fetch_text_from_url_async(url, cdp_url, session) or ""
+                title = derive_title_from_content(text)
+        title = title or _fallback_title(page, content_type)
+
+        if title:
+            await asyncio.to_thread(notion.set_title, page_id, title, note="Backfilled Name from URL")
+
+    return await asyncio.to_thread(_finish_url_resource, page, notion, content_type, title, has_name)
 
 
 def _extract_filename_from_url(url: str, content_type: Optional[ContentType] = None) -> Optional[str]:
@@ -250,7 +401,14 @@ def _process_empty_invalid(page: Dict[str, Any], notion: Any, reason: str) -> Di
     return {"action": "error", "reason": reason, "item_type": "empty_invalid"}
 
 
-def preprocess_item(page: Dict[str, Any], notion: Any, cdp_url: str, note_sequence: int = 1) -> Dict[str, Any]:
+def preprocess_item(
+    page: Dict[str, Any],
+    notion: Any,
+    cdp_url: str,
+    note_sequence: int = 1,
+    routed: Optional[Tuple[ItemType, str]] = None,
+    reroute: bool = False,
+) -> Dict[str, Any]:
     """
     Preprocess a single item using smart routing.
     
@@ -259,40 +417,213 @@ def preprocess_item(page: Dict[str, Any], notion: Any, cdp_url: str, note_sequen
         notion: NotionManager instance
         cdp_url: Chrome DevTools Protocol URL
         note_sequence: Sequence number for NOTE_CONTENT naming
+        routed: (ItemType, reason) from an earlier classify_item call, to avoid routing twice
+        reroute: Route, detect and write again even if the item is already routed
         
     Returns:
         Dict with action, reason, item_type, and optionally title
     """
-    item_type, reason = classify_item(page, notion)
-    
-    if item_type == ItemType.URL_RESOURCE:
-        return _process_url_resource(page, notion, cdp_url)
-    elif item_type == ItemType.NOTE_CONTENT:
-        return _process_note_content(page, notion, note_sequence)
-    else:  # EMPTY_INVALID
-        return _process_empty_invalid(page, notion, reason)
+    if not reroute and is_already_routed(page):
+        return _skip_routed(page)
+
+    item_type, reason = routed or classify_item(page, notion)
+
+    # ItemType, ContentType, Name and Status go out as one pages.update
+    with notion.unit_of_work(page.get("id", "")):
+        if item_type == ItemType.URL_RESOURCE:
+            return _process_url_resource(page, notion, cdp_url)
+        elif item_type == ItemType.NOTE_CONTENT:
+            return _process_note_content(page, notion, note_sequence)
+        else:  # EMPTY_INVALID
+            return _process_empty_invalid(page, notion, reason)
+
+
+def _count(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    counters = {"backfilled": 0, "error": 0, "skip": 0, "ready": 0, "unprocessed": 0}
+    for result in results:
+        action = result.get("action", "skip")
+        counters[action if action in counters else "skip"] += 1
+    return counters
 
 
-def preprocess_batch(pages: List[Dict[str, Any]], notion: Any, cdp_url: str) -> Dict[str, int]:
+def _batch_workers(workers: Optional[int]) -> int:
+    return max(1, workers if workers is not None else get_int("PREPROCESS_WORKERS", 1))
+
+
+def _route_failed(page: Dict[str, Any], exc: Exception) -> Dict[str, Any]:
+    # Nothing was written yet, so the item simply stays pending for the next run
+    logging.warning("Preprocess: routing failed for %s: %s", page.get("id", ""), exc)
+    return {"action": "error", "reason": f"routing failed: {exc}"}
+
+
+def assign_note_sequences(
+    pages: List[Dict[str, Any]],
+    routes: List[Optional[Tuple[ItemType, str]]],
+    start: int = 1,
+    counter: Optional[Iterator[int]] = None,
+) -> List[int]:
+    """
+    Pre-assign NOTE-YYYYMMDD-N numbers before items are dispatched concurrently.
+
+    Only NOTE_CONTENT items that will get a generated name draw a number, oldest
+    ``created_date`` first (undated items last, list order breaking ties), so
+    the names do not depend on which worker finishes first.
+
+    Args:
+        counter: Numbers to draw from (e.g. one shared across watch polls);
+            defaults to counting up from ``start``
+
+    Returns:
+        One sequence per page (``start`` for pages that do not need one)
+    """
+    sequences = [start] * len(pages)
+    needs_name = [
+        index
+        for index, (page, routed) in enumerate(zip(pages, routes))
+        if routed is not None
+        and routed[0] == ItemType.NOTE_CONTENT
+        and not _is_meaningful_name((page.get("title") or "").strip(), None)
+    ]
+    created = [page.get("created_date") or "" for page in pages]
+    needs_name.sort(key=lambda index: (0 if created[index] else 1, created[index]))
+    numbers = counter if counter is not None else itertools.count(start)
+    for index in needs_name:
+        sequences[index] = next(numbers)
+    return sequences
+
+
+def preprocess_batch(
+    pages: List[Dict[str, Any]],
+    notion: Any,
+    cdp_url: str,
+    reroute: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
     """
     Preprocess a batch of items.
-    
+
+    With more than one worker (PREPROCESS_WORKERS, default 1) items are routed
+    up front, notes are numbered by assign_note_sequences, and detection and
+    title backfill run on a thread pool.
+
     Returns counters for each action type.
     """
-    counters = {"backfilled": 0, "error": 0, "skip": 0, "ready": 0, "unprocessed": 0}
-    note_sequence = 1  # Track sequence for NOTE_CONTENT items today
-    
-    for page in pages:
-        result = preprocess_item(page, notion, cdp_url, note_sequence)
-        action = result.get("action", "skip")
-        
-        if action in counters:
-            counters[action] += 1
-        else:
-            counters["skip"] += 1
-        
-        # Increment sequence for NOTE_CONTENT
-        if result.get("item_type") == "note_content" and action == "ready":
-            note_sequence += 1
-    
-    return counters
+    workers = _batch_workers(workers)
+    if workers <= 1:
+        results = []
+        note_sequence = 1  # Track sequence for NOTE_CONTENT items today
+        for page in pages:
+            result = preprocess_item(page, notion, cdp_url, note_sequence, reroute=reroute)
+            results.append(result)
+            # Increment sequence for NOTE_CONTENT
+            if result.get("item_type") == "note_content" and result.get("action") == "ready":
+                note_sequence += 1
+        return _count(results)
+
+    todo = [page for page in pages if reroute or not is_already_routed(page)]
+    skipped = [_skip_routed(page) for page in pages if not reroute and is_already_routed(page)]
+
+    def _route(page: Dict[str, Any]) -> Any:
+        try:
+            return classify_item(page, notion)
+        except Exception as exc:
+            return exc
+
+    def _run(item: Tuple[Dict[str, Any], Any, int]) -> Dict[str, Any]:
+        page, routed, sequence = item
+        if isinstance(routed, Exception):
+            return _route_failed(page, routed)
+        try:
+            return preprocess_item(page, notion, cdp_url, sequence, routed=routed, reroute=True)
+        except Exception as exc:
+            logging.exception("Preprocess failed for %s", page.get("id", ""))
+            return {"action": "error", "reason": str(exc)}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preprocess") as pool:
+        routes = list(pool.map(_route, todo))
+        sequences = assign_note_sequences(todo, [r if isinstance(r, tuple) else None for r in routes])
+        results = list(pool.map(_run, zip(todo, routes, sequences)))
+    return _count(skipped + results)
+
+
+async def preprocess_item_async(
+    page: Dict[str, Any],
+    notion: Any,
+    cdp_url: str,
+    note_sequence: int = 1,
+    session: Optional[BrowserSession] = None,
+    http_client: Optional[Any] = None,
+    reroute: bool = False,
+    routed: Optional[Tuple[ItemType, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of preprocess_item sharing the caller's event loop.
+
+    Args:
+        session: Shared BrowserSession for title/content fetches
+        http_client: Shared httpx.AsyncClient for ContentType HEAD requests
+        reroute: Route, detect and write again even if the item is already routed
+        routed: (ItemType, reason) from an earlier classify_item call
+    """
+    if not reroute and is_already_routed(page):
+        return _skip_routed(page)
+
+    item_type, reason = routed or await asyncio.to_thread(classify_item, page, notion)
+
+    async with notion.unit_of_work_async(page.get("id", "")):
+        if item_type == ItemType.URL_RESOURCE:
+            return await _process_url_resource_async(page, notion, cdp_url, session, http_client)
+        elif item_type == ItemType.NOTE_CONTENT:
+            return await asyncio.to_thread(_process_note_content, page, notion, note_sequence)
+        else:  # EMPTY_INVALID
+            return await asyncio.to_thread(_process_empty_invalid, page, notion, reason)
+
+
+async def preprocess_batch_async(
+    pages: List[Dict[str, Any]],
+    notion: Any,
+    cdp_url: str,
+    session: Optional[BrowserSession] = None,
+    http_client: Optional[Any] = None,
+    reroute: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """Async counterpart of preprocess_batch; extra workers share the session and HTTP client."""
+    workers = _batch_workers(workers)
+    if workers <= 1:
+        results = []
+        note_sequence = 1
+        for page in pages:
+            result = await preprocess_item_async(page, notion, cdp_url, note_sequence, session, http_client, reroute)
+            results.append(result)
+            if result.get("item_type") == "note_content" and result.get("action") == "ready":
+                note_sequence += 1
+        return _count(results)
+
+    todo = [page for page in pages if reroute or not is_already_routed(page)]
+    skipped = [_skip_routed(page) for page in pages if not reroute and is_already_routed(page)]
+    limit = asyncio.Semaphore(workers)
+
+    async def _route(page: Dict[str, Any]) -> Any:
+        async with limit:
+            try:
+                return await asyncio.to_thread(classify_item, page, notion)
+            except Exception as exc:
+                return exc
+
+    async def _run(page: Dict[str, Any], routed: Any, sequence: int) -> Dict[str, Any]:
+        if isinstance(routed, Exception):
+            return _route_failed(page, routed)
+        async with limit:
+            try:
+                return await preprocess_item_async(
+                    page, notion, cdp_url, sequence, session, http_client, reroute=True, routed=routed
+                )
+            except Exception as exc:
+                logging.exception("Preprocess failed for %s", page.get("id", ""))
+                return {"action": "error", "reason": str(exc)}
+
+    routes = await asyncio.gather(*(_route(page) for page in todo))
+    sequences = assign_note_sequences(todo, [r if isinstance(r, tuple) else None for r in routes])
+    results = await asyncio.gather(*(_run(*item) for item in zip(todo, routes, sequences)))
+    return _count(skipped + list(results))
@@ -0,0 +1,122 @@
+"""
+Quarantine for URLs that keep failing to fetch.
+
+Failures are counted per canonical URL, so a bad URL is recognised even when
+it sits on several Inbox pages or a page is reset to pending by hand. After
+QUARANTINE_AFTER consecutive failures (default 3) the URL is quarantined:
+pending listings drop every page pointing at it until it is released with
+``main.py quarantine --release``. Any successful fetch resets the counter.
+Transient failures are counted only once the retry queue has given up on
+them, so a slow site is retried RETRY_MAX_ATTEMPTS times before it can be
+quarantined.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from src.state import connect
+from src.utils import get_int
+
+
+@dataclass(frozen=True)
+class QuarantineEntry:
+    canonical_url: str
+    failures: int
+    last_error: str
+    page_id: str
+    quarantined_at: float
+
+
+class Quarantine:
+    """
+    Consecutive-failure counters keyed by canonical URL.
+
+    Args:
+        path: State database path (defaults to STATE_DIR/state.db)
+        threshold: Consecutive failures before quarantine (QUARANTINE_AFTER, default 3)
+        clock: Wall clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        threshold: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.threshold = max(1, threshold if threshold is not None else get_int("QUARANTINE_AFTER", 3))
+        self._clock = clock
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS url_failures (
+                    canonical_url TEXT PRIMARY KEY,
+                    failures INTEGER NOT NULL,
+                    last_error TEXT,
+                    page_id TEXT,
+                    quarantined_at REAL
+                )
+                """
+            )
+
+    def record_failure(self, canonical_url: str, page_id: str, error: str) -> bool:
+        """
+        Count a failed fetch of ``canonical_url``.
+
+        Returns:
+            True if this failure put the URL into quarantine
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT failures, quarantined_at FROM url_failures WHERE canonical_url = ?", (canonical_url,)
+            ).fetchone()
+            failures = (row[0] if row else 0) + 1
+            already = row is not None and row[1] is not None
+            quarantined_at = row[1] if already else (self._clock() if failures >= self.threshold else None)
+            self._conn.execute(
+                "INSERT INTO url_failures (canonical_url, failures, last_error, page_id, quarantined_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(canonical_url) DO UPDATE SET "
+                "failures = excluded.failures, last_error = excluded.last_error, "
+                "page_id = excluded.page_id, quarantined_at = excluded.quarantined_at",
+                (canonical_url, failures, error, page_id, quarantined_at),
+            )
+        return not already and quarantined_at is not None
+
+    def record_success(self, canonical_url: str) -> None:
+        """A successful fetch ends the failure streak."""
+        self.release(canonical_url)
+
+    def is_quarantined(self, canonical_url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT quarantined_at FROM url_failures WHERE canonical_url = ?", (canonical_url,)
+            ).fetchone()
+        return row is not None and row[0] is not None
+
+    def entries(self) -> List[QuarantineEntry]:
+        """Quarantined URLs, most recent first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT canonical_url, failures, last_error, page_id, quarantined_at FROM url_failures "
+                "WHERE quarantined_at IS NOT NULL ORDER BY quarantined_at DESC"
+            ).fetchall()
+        return [
+            QuarantineEntry(url, failures, error or "", page_id or "", at)
+            for url, failures, error, page_id, at in rows
+        ]
+
+    def release(self, canonical_url: Optional[str] = None) -> int:
+        """Forget ``canonical_url`` (or every tracked URL when None); returns rows removed."""
+        with self._lock:
+            if canonical_url is None:
+                cur = self._conn.execute("DELETE FROM url_failures")
+            else:
+                cur = self._conn.execute("DELETE FROM url_failures WHERE canonical_url = ?", (canonical_url,))
+            return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
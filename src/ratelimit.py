@@ -0,0 +1,183 @@
+"""
+Token-bucket throttling for long backfills.
+
+A bucket refills ``rate_per_minute`` units per minute up to ``capacity``
+(one minute's worth by default). ``acquire`` blocks until the requested
+amount is available; requests larger than the capacity are let through
+once the bucket is full and leave it in debt, so a single huge item slows
+the following ones down instead of blocking forever.
+
+``pause`` holds every caller back for a while (e.g. a 429 ``Retry-After``).
+``SQLiteTokenBucket`` keeps the same state in the local state database so
+several processes on one machine share a single budget.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.state import connect
+
+
+class TokenBucket:
+    """
+    Args:
+        rate_per_minute: Refill rate; 0 or less disables throttling
+        capacity: Burst size (defaults to one minute of refill)
+        clock: Monotonic clock (injectable for tests)
+        sleep: Sleep function (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_second = max(0.0, rate_per_minute) / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_second <= 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take ``amount`` units, sleeping as needed; returns seconds waited."""
+        waited = 0.0
+        with self._lock:
+            pause = self._paused_until - self._clock()
+            if pause > 0:
+                self._sleep(pause)
+                waited += pause
+            if self.unlimited:
+                return waited
+            needed = min(amount, self.capacity)
+            self._refill()
+            while self._tokens < needed:
+                delay = (needed - self._tokens) / self.rate_per_second
+                self._sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= amount
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Make every caller wait at least ``seconds`` from now."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class SQLiteTokenBucket:
+    """
+    TokenBucket whose state lives in the state database, shared by processes.
+
+    Each acquire runs in an ``IMMEDIATE`` transaction, so concurrent processes
+    take turns; sleeping happens outside the transaction.
+
+    Args:
+        name: Bucket key (one row per name)
+        rate_per_minute: Refill rate; 0 or less disables throttling
+        capacity: Burst size (defaults to one minute of refill)
+        path: State database path (defaults to STATE_DIR/state.db)
+        clock: Wall clock, comparable across processes (injectable for tests)
+        sleep: Sleep function (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.name = name
+        self.rate_per_second = max(0.0, rate_per_minute) / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute)
+        self._clock = clock
+        self._sleep = sleep
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    paused_until REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_second <= 0
+
+    def _take(self, amount: float) -> float:
+        """One transaction: take ``amount`` if available; otherwise return the delay to sleep."""
+        now = self._clock()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT tokens, updated, paused_until FROM rate_buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens, updated, paused_until = row if row else (self.capacity, now, 0.0)
+            tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate_per_second)
+            needed = min(amount, self.capacity)
+            if paused_until > now:
+                delay = paused_until - now
+            elif self.unlimited or tokens >= needed:
+                delay = 0.0
+                if not self.unlimited:
+                    tokens -= amount
+            else:
+                delay = (needed - tokens) / self.rate_per_second
+            self._conn.execute(
+                "INSERT INTO rate_buckets (name, tokens, updated, paused_until) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (self.name, tokens, now, paused_until),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return delay
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take ``amount`` units, sleeping as needed; returns seconds waited."""
+        waited = 0.0
+        with self._lock:
+            while True:
+                delay = self._take(amount)
+                if delay <= 0:
+                    return waited
+                self._sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Make every caller, in every process, wait at least ``seconds`` from now."""
+        until = self._clock() + seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO rate_buckets (name, tokens, updated, paused_until) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET paused_until = MAX(paused_until, excluded.paused_until)",
+                (self.name, self.capacity, self._clock(), until),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
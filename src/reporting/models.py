@@ -70,6 +70,23 @@ class ReportPeriod:
             return f"周报 - {self.start_date.year}年第{week_num:02d}周 ({start_str} ~ {end_str})"
         else:  # MONTHLY
             return f"月报 - {self.start_date.strftime('%Y年%m月')}"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dict."""
+        return {
+            "type": self.type.value,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReportPeriod":
+        """Inverse of to_dict()."""
+        return cls(
+            type=ReportType(data["type"]),
+            start_date=date.fromisoformat(data["start_date"]),
+            end_date=date.fromisoformat(data["end_date"]),
+        )
 
 
 @dataclass
@@ -102,4 +119,26 @@ class ReportData:
     def is_empty(self) -> bool:
         """Check if report has no content."""
         return self.source_count == 0 and not self.overview
-
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dict (used by the run journal)."""
+        return {
+            "period": self.period.to_dict(),
+            "overview": self.overview,
+            "highlights": list(self.highlights),
+            "source_ids": list(self.source_ids),
+            "content_blocks": list(self.content_blocks),
+            "categories": dict(self.categories),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReportData":
+        """Inverse of to_dict()."""
+        return cls(
+            period=ReportPeriod.from_dict(data["period"]),
+            overview=data.get("overview", ""),
+            highlights=data.get("highlights", []),
+            source_ids=data.get("source_ids", []),
+            content_blocks=data.get("content_blocks", []),
+            categories=data.get("categories", {}),
+        )
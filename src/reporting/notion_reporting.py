@@ -4,11 +4,12 @@ Notion manager for the Reporting database.
 
 import logging
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from notion_client import Client
 from notion_client.errors import APIResponseError
 
+from src.notion_rate import notion_http_client
 from src.utils import get_env
 from src.reporting.models import ReportData
 
@@ -30,7 +31,7 @@ class ReportingDBManager:
         token = get_env("NOTION_TOKEN", required=True)
         self.database_id = get_env("NOTION_REPORTING_DB_ID", required=True)
         self.data_source_id = get_env("NOTION_REPORTING_DS_ID", required=False)
-        self.client = Client(auth=token)
+        self.client = Client(auth=token, client=notion_http_client())
         
         # Property names (can be made configurable via env vars if needed)
         self.prop_title = "Name"
@@ -42,34 +43,46 @@ class ReportingDBManager:
         self.prop_summary = "Summary"
         self.prop_highlights = "Highlights"
         self.prop_status = "Status"
+        # Set once the data_source endpoint is known not to work, so later queries skip it
+        self._data_source_unsupported = False
     
-    def _query(self, filter_obj: Dict[str, Any], sorts: List[Dict] = None) -> List[Dict]:
+    def _query(self, body: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Query the Reporting database.
+        Query the Reporting database (one result page).
         
         Prioritizes data_source query if available, falls back to database query.
         """
-        body: Dict[str, Any] = {"filter": filter_obj}
-        if sorts:
-            body["sorts"] = sorts
-        
         # Try data_source query first if available
-        if self.data_source_id:
+        if self.data_source_id and not self._data_source_unsupported:
             ds_path = f"data_sources/{self.data_source_id}/query"
             try:
-                response = self.client.request(path=ds_path, method="post", body=body)
-                return response.get("results", [])
+                return self.client.request(path=ds_path, method="post", body=body)
             except APIResponseError as exc:
                 if exc.code == "invalid_request_url":
                     # Fallback to database query
-                    pass
+                    self._data_source_unsupported = True
                 else:
                     raise
         
         # Use database query via client.request()
         db_path = f"databases/{self.database_id}/query"
-        response = self.client.request(path=db_path, method="post", body=body)
-        return response.get("results", [])
+        return self.client.request(path=db_path, method="post", body=body)
+    
+    def iter_query(self, body: Dict[str, Any], page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Stream simplified reports for ``body``, following ``next_cursor``.
+        
+        Only one result page (``page_size`` rows, at most 100) is held at a time.
+        """
+        request = dict(body, page_size=max(1, min(100, page_size)))
+        while True:
+            response = self._query(request)
+            for page in response.get("results", []):
+                yield self._simplify_report(page)
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+            request = dict(request, start_cursor=cursor)
     
     def find_report(
         self,
@@ -99,10 +112,7 @@ class ReportingDBManager:
             ]
         }
         
-        results = self._query(filter_obj)
-        if results:
-            return self._simplify_report(results[0])
-        return None
+        return next(self.iter_query({"filter": filter_obj}, page_size=1), None)
     
     def query_reports_in_range(
         self,
@@ -140,14 +150,15 @@ class ReportingDBManager:
         
         sorts = [{"property": self.prop_date, "direction": "ascending"}]
         
-        results = self._query(filter_obj, sorts)
-        return [self._simplify_report(r) for r in results]
+        # A list: the service counts missing reports and the builders walk them several times
+        return list(self.iter_query({"filter": filter_obj, "sorts": sorts}))
     
     def create_report(
         self,
         report_data: ReportData,
         source_item_ids: List[str] = None,
         source_report_ids: List[str] = None,
+        on_progress: Optional[Callable[[str, int], None]] = None,
     ) -> Optional[str]:
         """
         Create a new report page in the Reporting database.
@@ -156,6 +167,8 @@ class ReportingDBManager:
             report_data: The report data to create
             source_item_ids: List of Inbox item IDs (for daily reports)
             source_report_ids: List of report IDs (for weekly/monthly)
+            on_progress: Called with (page_id, blocks_written) after the page is
+                created and after every appended batch
             
         Returns:
             Created page ID or None on failure
@@ -211,12 +224,12 @@ class ReportingDBManager:
                 children=first_batch,
             )
             page_id = page.get("id")
+            if page_id and on_progress:
+                on_progress(page_id, len(first_batch))
             
             # Append remaining blocks in batches
             if page_id and remaining:
-                for i in range(0, len(remaining), self.BATCH_SIZE):
-                    batch = remaining[i : i + self.BATCH_SIZE]
-                    self.client.blocks.children.append(block_id=page_id, children=batch)
+                self.append_blocks(page_id, children_blocks, offset=len(first_batch), on_progress=on_progress)
             
             return page_id
             
@@ -224,6 +237,28 @@ class ReportingDBManager:
             logger.error(f"Failed to create report: {e}")
             return None
     
+    def append_blocks(
+        self,
+        page_id: str,
+        blocks: List[Dict[str, Any]],
+        offset: int = 0,
+        on_progress: Optional[Callable[[str, int], None]] = None,
+    ) -> None:
+        """
+        Append ``blocks[offset:]`` to an existing report page in batches.
+        
+        Args:
+            page_id: Report page to append to
+            blocks: Full list of content blocks for the page
+            offset: Number of leading blocks already on the page
+            on_progress: Called with (page_id, blocks_written) after each batch
+        """
+        for i in range(offset, len(blocks), self.BATCH_SIZE):
+            batch = blocks[i : i + self.BATCH_SIZE]
+            self.client.blocks.children.append(block_id=page_id, children=batch)
+            if on_progress:
+                on_progress(page_id, i + len(batch))
+    
     def _simplify_report(self, page: Dict[str, Any]) -> Dict[str, Any]:
         """Extract key fields from a Notion page."""
         props = page.get("properties", {})
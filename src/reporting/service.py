@@ -5,11 +5,14 @@ Key points:
 - Daily digest: Queries INBOX DB for "ready" items by created_time
 - Weekly digest: Queries REPORTING DB for "Daily" reports
 - Monthly digest: Queries REPORTING DB for "Weekly" reports
+- With a RunJournal, a report interrupted mid-write is resumed on the next
+  run: the built ReportData is reused and only missing blocks are appended
+  (``force=True`` discards that progress and rebuilds from the source data)
 """
 
 import logging
 from datetime import date
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from src.reporting.models import ReportData, ReportPeriod, ReportType
 from src.reporting.date_utils import (
@@ -37,16 +40,18 @@ class DigestService:
     - Create reports in Reporting DB
     """
     
-    def __init__(self, inbox_manager, reporting_manager):
+    def __init__(self, inbox_manager, reporting_manager, journal=None):
         """
         Initialize the digest service.
         
         Args:
             inbox_manager: NotionManager for the Inbox database
             reporting_manager: ReportingDBManager for the Reporting database
+            journal: Optional RunJournal used to resume interrupted reports
         """
         self.inbox = inbox_manager
         self.reporting = reporting_manager
+        self.journal = journal
         
         # Builders for each level
         self.daily_builder = DailyReportBuilder()
@@ -75,6 +80,14 @@ class DigestService:
             end_date=end_date,
         )
         
+        progress = self._progress(period, force)
+        if "written" in progress:
+            return self._finish_written(period, progress)
+        if "built" in progress:
+            logger.info(f"Resuming daily report for {start_date} from journal")
+            report_data = ReportData.from_dict(progress["built"])
+            return self._publish(period, report_data, source_item_ids=report_data.source_ids)
+        
         # Check for existing report
         if not force:
             existing = self.reporting.find_report(ReportType.DAILY.value, start_date)
@@ -106,10 +119,8 @@ class DigestService:
             logger.debug(f"Source item IDs: {report_data.source_ids[:5]}...")
         
         # Create in Reporting DB
-        page_id = self.reporting.create_report(
-            report_data=report_data,
-            source_item_ids=report_data.source_ids,
-        )
+        self._record(period, "built", report_data.to_dict())
+        page_id = self._publish(period, report_data, source_item_ids=report_data.source_ids)
         
         logger.info(f"Created daily digest for {start_date}: {page_id}")
         return page_id
@@ -136,6 +147,14 @@ class DigestService:
             end_date=end_date,
         )
         
+        progress = self._progress(period, force)
+        if "written" in progress:
+            return self._finish_written(period, progress)
+        if "built" in progress:
+            logger.info(f"Resuming weekly report for {start_date} from journal")
+            report_data = ReportData.from_dict(progress["built"])
+            return self._publish(period, report_data, source_report_ids=report_data.source_ids)
+        
         # Check for existing report
         if not force:
             existing = self.reporting.find_report(ReportType.WEEKLY.value, start_date)
@@ -168,10 +187,8 @@ class DigestService:
         )
         
         # Create in Reporting DB
-        page_id = self.reporting.create_report(
-            report_data=report_data,
-            source_report_ids=report_data.source_ids,
-        )
+        self._record(period, "built", report_data.to_dict())
+        page_id = self._publish(period, report_data, source_report_ids=report_data.source_ids)
         
         logger.info(f"Created weekly digest for week of {start_date}: {page_id}")
         return page_id
@@ -198,6 +215,14 @@ class DigestService:
             end_date=end_date,
         )
         
+        progress = self._progress(period, force)
+        if "written" in progress:
+            return self._finish_written(period, progress)
+        if "built" in progress:
+            logger.info(f"Resuming monthly report for {start_date} from journal")
+            report_data = ReportData.from_dict(progress["built"])
+            return self._publish(period, report_data, source_report_ids=report_data.source_ids)
+        
         # Check for existing report
         if not force:
             existing = self.reporting.find_report(ReportType.MONTHLY.value, start_date)
@@ -229,14 +254,63 @@ class DigestService:
         )
         
         # Create in Reporting DB
-        page_id = self.reporting.create_report(
-            report_data=report_data,
-            source_report_ids=report_data.source_ids,
-        )
+        self._record(period, "built", report_data.to_dict())
+        page_id = self._publish(period, report_data, source_report_ids=report_data.source_ids)
         
         logger.info(f"Created monthly digest for {start_date.strftime('%Y-%m')}: {page_id}")
         return page_id
     
+    def _journal_key(self, period: ReportPeriod) -> str:
+        return f"report:{period.type.value}:{period.start_date.isoformat()}"
+    
+    def _progress(self, period: ReportPeriod, force: bool = False) -> Dict[str, Any]:
+        """Journaled progress to resume; ``force`` abandons it so the report is rebuilt."""
+        if self.journal is None:
+            return {}
+        key = self._journal_key(period)
+        progress = self.journal.progress(key)
+        if force and progress:
+            logger.info(f"Discarding interrupted {period.type.value} report for {period.start_date} (force)")
+            self.journal.complete(key)
+            return {}
+        return progress
+    
+    def _record(self, period: ReportPeriod, stage: str, payload: Dict[str, Any]) -> None:
+        if self.journal is not None:
+            self.journal.record(self._journal_key(period), stage, payload)
+    
+    def _publish(self, period: ReportPeriod, report_data: ReportData, **relations) -> Optional[str]:
+        """Create the report page, journaling every written block batch."""
+        if self.journal is None:
+            return self.reporting.create_report(report_data=report_data, **relations)
+        
+        def _on_progress(page_id: str, blocks_written: int) -> None:
+            self._record(period, "written", {"page_id": page_id, "blocks": blocks_written})
+        
+        page_id = self.reporting.create_report(report_data=report_data, on_progress=_on_progress, **relations)
+        if page_id:
+            self.journal.complete(self._journal_key(period))
+        return page_id
+    
+    def _finish_written(self, period: ReportPeriod, progress: Dict[str, Any]) -> Optional[str]:
+        """Append the blocks a crashed run did not get to, then close the journal entry."""
+        written = progress["written"]
+        page_id = written["page_id"]
+        blocks = progress.get("built", {}).get("content_blocks", [])
+        offset = written.get("blocks", 0)
+        if offset < len(blocks):
+            logger.info(
+                f"Resuming {period.type.value} report {page_id}: appending {len(blocks) - offset} remaining blocks"
+            )
+            self.reporting.append_blocks(
+                page_id,
+                blocks,
+                offset=offset,
+                on_progress=lambda pid, n: self._record(period, "written", {"page_id": pid, "blocks": n}),
+            )
+        self.journal.complete(self._journal_key(period))
+        return page_id
+    
     def _get_daily_overview_fn(self):
         """Get the AI overview function for daily digests."""
         try:
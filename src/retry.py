@@ -0,0 +1,134 @@
+"""
+Persistent retry queue for transient fetch failures.
+
+A timeout, an HTTP 5xx or a Twitter "something went wrong" page usually
+clears up on its own, so instead of marking the item ``error`` the run leaves
+it pending and records a next-attempt time here. Later runs skip the item
+until that time has passed and then try again, with the delay doubling on
+every failure (RETRY_BASE_SECONDS, capped at RETRY_MAX_SECONDS). After
+RETRY_MAX_ATTEMPTS failures the item is marked ``error`` like any other
+fetch failure.
+
+Permanent failures (login walls, invalid tweet URLs, blocked pages) never
+enter the queue and fail fast.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from tenacity import RetryError
+except Exception:  # pragma: no cover
+    RetryError = None
+
+from src.browser import TransientFetchError, TwitterServerError
+from src.state import connect
+from src.utils import get_int
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True if a fetch failure is worth retrying in a later run."""
+    if RetryError is not None and isinstance(exc, RetryError):
+        last = getattr(exc, "last_attempt", None)
+        inner = last.exception() if last is not None else None
+        if inner is None:
+            return False
+        exc = inner
+    return isinstance(exc, (TransientFetchError, TwitterServerError, TimeoutError))
+
+
+class RetryQueue:
+    """
+    Per-item retry schedule backed by the local state database.
+
+    Args:
+        path: State database path (defaults to STATE_DIR/state.db)
+        base_seconds: Delay after the first failure (RETRY_BASE_SECONDS, default 300)
+        max_seconds: Upper bound for the delay (RETRY_MAX_SECONDS, default 21600)
+        max_attempts: Failures before giving up (RETRY_MAX_ATTEMPTS, default 5)
+        clock: Wall clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        base_seconds: Optional[int] = None,
+        max_seconds: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.base_seconds = base_seconds if base_seconds is not None else get_int("RETRY_BASE_SECONDS", 300)
+        self.max_seconds = max_seconds if max_seconds is not None else get_int("RETRY_MAX_SECONDS", 21600)
+        self.max_attempts = max_attempts if max_attempts is not None else get_int("RETRY_MAX_ATTEMPTS", 5)
+        self._clock = clock
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS retry_queue (
+                    page_id TEXT PRIMARY KEY,
+                    attempts INTEGER NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT
+                )
+                """
+            )
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next try after ``attempts`` consecutive failures."""
+        return float(min(self.max_seconds, self.base_seconds * 2 ** max(0, attempts - 1)))
+
+    def attempts(self, page_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM retry_queue WHERE page_id = ?", (page_id,)).fetchone()
+        return row[0] if row else 0
+
+    def waiting(self, page_id: str) -> bool:
+        """True while ``page_id`` is backing off and should not be fetched yet."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_attempt_at FROM retry_queue WHERE page_id = ?", (page_id,)
+            ).fetchone()
+        return row is not None and row[0] > self._clock()
+
+    def due_at(self, page_id: str) -> Optional[float]:
+        """Wall-clock time of the next attempt for ``page_id``, if it is queued."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_attempt_at FROM retry_queue WHERE page_id = ?", (page_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def defer(self, page_id: str, error: str) -> Optional[float]:
+        """
+        Record a transient failure for ``page_id``.
+
+        Returns:
+            Seconds until the next attempt, or None once the item has used up
+            its attempts (it is dropped from the queue; the caller marks it error)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM retry_queue WHERE page_id = ?", (page_id,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if attempts > self.max_attempts:
+                self._conn.execute("DELETE FROM retry_queue WHERE page_id = ?", (page_id,))
+                return None
+            delay = self.backoff(attempts)
+            self._conn.execute(
+                "INSERT INTO retry_queue (page_id, attempts, next_attempt_at, last_error) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(page_id) DO UPDATE SET attempts = excluded.attempts, "
+                "next_attempt_at = excluded.next_attempt_at, last_error = excluded.last_error",
+                (page_id, attempts, self._clock() + delay, error),
+            )
+        return delay
+
+    def clear(self, page_id: str) -> None:
+        """Forget ``page_id`` (its fetch succeeded or it failed for good)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM retry_queue WHERE page_id = ?", (page_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
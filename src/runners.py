@@ -0,0 +1,436 @@
+"""
+Mode runners behind the ``main.py`` commands: the one-shot ``process`` run,
+``watch`` polling, ``webhook`` event batches, ``serve`` captures and the
+``reprocess`` backfill. They take already-open clients and state (see
+src.runtime) and hand items to the engine in src.ingest.
+"""
+import asyncio
+import functools
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.browser import BrowserSession, fetch_page_content
+from src.capture import Capture, KeyedLock
+from src.ingest import (
+    _active_pages,
+    _canonical_target,
+    _fetch_failure_reason,
+    _is_meaningful_name,
+    _list_pending,
+    _log_ingest_counts,
+    _offload,
+    _schedule,
+    _summarize,
+    _summary_text,
+    _write_results,
+    run_fused,
+    run_ingest_async,
+    run_ingest_pipeline,
+)
+from src.journal import RunJournal
+from src.lease import Lease, LeaseManager, default_owner
+from src.llm import PROMPT_VERSION, estimate_tokens, generate_digest
+from src.notion import NotionManager
+from src.notion_async import AsyncNotion
+from src.preprocess import preprocess_batch, preprocess_batch_async
+from src.quarantine import Quarantine
+from src.ratelimit import TokenBucket
+from src.retry import RetryQueue
+from src.scheduler import Deadline
+from src.utils import get_int, get_timezone
+from src.watch import HighWaterMark, InboxWatcher
+
+
+def run_preprocess(
+    notion: NotionManager,
+    cdp_url: str,
+    scope: str,
+    list_pending: Optional[Callable[..., List[dict]]] = None,
+    reroute: bool = False,
+) -> None:
+    items = list_pending() if list_pending else _list_pending(notion)
+    stats = preprocess_batch(items, notion, cdp_url, reroute=reroute)
+    logging.info("Preprocess scope=%s results: %s", scope, stats)
+
+
+async def run_process(
+    notion: NotionManager,
+    cdp_url: str,
+    scope: str,
+    preprocess_only: bool,
+    workers: int,
+    pipeline: bool = False,
+    fused: bool = False,
+    journal: Optional[RunJournal] = None,
+    lease: Optional[LeaseManager] = None,
+    deadline: Optional[Deadline] = None,
+    list_pending: Optional[Callable[..., List[dict]]] = None,
+    reroute: bool = False,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> None:
+    """
+    Whole ``process`` run on one event loop sharing a browser driver and HTTP
+    client; per-item Notion calls go through ``notion_io`` if given.
+    """
+    list_pending = list_pending or functools.partial(_list_pending, notion)
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover
+        httpx = None
+
+    async with BrowserSession(cdp_url) as session:
+        if fused and not preprocess_only:
+            pending = await asyncio.to_thread(list_pending)
+            pending = await asyncio.to_thread(_schedule, pending, journal)
+            counts = await run_fused(
+                pending,
+                notion,
+                cdp_url,
+                workers=workers,
+                session=session,
+                journal=journal,
+                lease=lease,
+                deadline=deadline,
+                retries=retries,
+                quarantine=quarantine,
+                notion_io=notion_io,
+            )
+            _log_ingest_counts(counts)
+            return
+
+        http_client = httpx.AsyncClient(follow_redirects=True, max_redirects=5) if httpx else None
+        try:
+            items = await asyncio.to_thread(list_pending)
+            stats = await preprocess_batch_async(items, notion, cdp_url, session, http_client, reroute)
+            logging.info("Preprocess scope=%s results: %s", scope, stats)
+        finally:
+            if http_client is not None:
+                await http_client.aclose()
+        if preprocess_only:
+            return
+
+        pending = await asyncio.to_thread(list_pending)
+        pending = await asyncio.to_thread(_schedule, pending, journal)
+        ingest = run_ingest_pipeline if pipeline else run_ingest_async
+        counts = await ingest(
+            pending,
+            notion,
+            cdp_url,
+            workers=workers,
+            session=session,
+            journal=journal,
+            deadline=deadline,
+            retries=retries,
+            quarantine=quarantine,
+            notion_io=notion_io,
+        )
+    _log_ingest_counts(counts)
+
+
+class _DailyNoteCounter:
+    """NOTE-YYYYMMDD-N sequence that restarts at 1 when the local date changes."""
+
+    def __init__(self) -> None:
+        self._day = None
+        self._next = 1
+
+    def __iter__(self) -> "_DailyNoteCounter":
+        return self
+
+    def __next__(self) -> int:
+        today = datetime.now(get_timezone()).date()
+        if today != self._day:
+            self._day, self._next = today, 1
+        value, self._next = self._next, self._next + 1
+        return value
+
+
+async def run_watch(
+    notion: NotionManager,
+    cdp_url: str,
+    workers: int = 1,
+    interval: float = 15.0,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    mark: Optional[HighWaterMark] = None,
+    stop: Optional[asyncio.Event] = None,
+    max_polls: Optional[int] = None,
+    lease: Optional[LeaseManager] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> None:
+    """
+    Keep polling the Inbox for pages edited since the high-water mark and run
+    each new batch through the fused preprocess + ingest pass (on ``notion_io``
+    if given). Items waiting in the retry queue come back with the periodic
+    full sync once they are due.
+    """
+    notes = _DailyNoteCounter()
+
+    async def _handle(pages: List[dict]) -> Dict[str, int]:
+        pages = await asyncio.to_thread(_schedule, pages, journal)
+        counts = await run_fused(
+            pages,
+            notion,
+            cdp_url,
+            workers=workers,
+            session=session,
+            journal=journal,
+            note_counter=notes,
+            lease=lease,
+            retries=retries,
+            quarantine=quarantine,
+            notion_io=notion_io,
+        )
+        _log_ingest_counts(counts)
+        return counts
+
+    own_mark = mark is None
+    mark = mark or HighWaterMark()
+    watcher = InboxWatcher(
+        lambda since: _list_pending(notion, retries=retries, quarantine=quarantine, edited_since=since),
+        _handle,
+        mark,
+        interval=interval,
+        overlap_seconds=get_int("WATCH_OVERLAP_SECONDS", 60),
+        full_sync_every=get_int("WATCH_FULL_SYNC_EVERY", 240),
+    )
+    try:
+        await watcher.run(stop, max_polls)
+    finally:
+        if own_mark:
+            mark.close()
+
+
+def _stored_text(page: dict, journal: Optional[RunJournal]) -> Tuple[Optional[str], str]:
+    """
+    Text to re-summarize without a fetch: the journaled page text if it is
+    still there for this URL, else the Raw Content property (first 1900 chars).
+    """
+    if journal is not None:
+        fetched = journal.latest(page.get("id", ""), "fetched")
+        if fetched and fetched.get("url") == page.get("url") and fetched.get("text"):
+            return fetched["text"], "journal"
+    if page.get("raw_content"):
+        return page["raw_content"], "raw_content"
+    return None, ""
+
+
+def run_reprocess(
+    notion: NotionManager,
+    prompt_version: str,
+    journal: Optional[RunJournal] = None,
+    items: Optional[TokenBucket] = None,
+    tokens: Optional[TokenBucket] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    cdp_url: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Re-summarize ``ready`` pages whose Prompt Version differs from ``prompt_version``.
+
+    Only the Summary and Prompt Version are rewritten: this refreshes summaries
+    after a prompt change, it does not re-triage, so status, classification
+    and Raw Content stay as they are. Text comes from storage (see
+    _stored_text); pages without any are re-fetched only when ``cdp_url`` is
+    given, otherwise skipped. Every LLM call first takes one unit from
+    ``items`` and its estimated token count from ``tokens``.
+
+    Returns:
+        Counters keyed by reprocessed/skipped/error (``reprocessed`` counts
+        candidates in a dry run)
+    """
+    counts = {"reprocessed": 0, "skipped": 0, "error": 0}
+    sources: Dict[str, int] = {}
+    # One listing up front: rewritten pages leave the filter, which would shift a live cursor
+    for page in notion.get_stale_ready(prompt_version):
+        if limit is not None and counts["reprocessed"] >= limit:
+            break
+        page_id = page.get("id", "")
+        text, source = _stored_text(page, journal)
+        if not text and cdp_url and page.get("url"):
+            try:
+                text, source = asyncio.run(fetch_page_content(page["url"], cdp_url)), "fetch"
+            except Exception as exc:
+                logging.warning("Reprocess: fetch failed for %s: %s", page_id, _fetch_failure_reason(exc))
+        if not text:
+            counts["skipped"] += 1
+            continue
+        sources[source] = sources.get(source, 0) + 1
+        if dry_run:
+            counts["reprocessed"] += 1
+            continue
+        if items is not None:
+            items.acquire()
+        if tokens is not None:
+            tokens.acquire(estimate_tokens(text))
+        try:
+            notion.set_summary(page_id, _summary_text(generate_digest(text)), PROMPT_VERSION)
+        except Exception:
+            logging.exception("Reprocess failed for %s", page_id)
+            counts["error"] += 1
+            continue
+        counts["reprocessed"] += 1
+    logging.info("Reprocess text sources: %s", sources)
+    logging.info(
+        "METRIC reprocess_counts reprocessed=%d skipped=%d error=%d dry_run=%s",
+        counts["reprocessed"],
+        counts["skipped"],
+        counts["error"],
+        dry_run,
+    )
+    return counts
+
+
+def _is_pending_status(page: dict, notion: NotionManager) -> bool:
+    """Same statuses as _list_pending (``processing`` ones are filtered by lease later)."""
+    status = notion.status
+    return page.get("status") in {None, "", status.to_read, status.pending, status.unprocessed, status.processing}
+
+
+def _load_event_pages(
+    notion: NotionManager,
+    page_ids: List[str],
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+) -> List[dict]:
+    """Re-read pages named by webhook events and keep those that still need work."""
+    pages = []
+    for page_id in page_ids:
+        try:
+            page = notion.get_page(page_id)
+        except Exception as exc:
+            logging.warning("Webhook: unable to read %s: %s", page_id, exc)
+            continue
+        if _is_pending_status(page, notion):
+            pages.append(page)
+    return _active_pages(pages, notion, retries=retries, quarantine=quarantine)
+
+
+async def run_webhook(
+    notion: NotionManager,
+    cdp_url: str,
+    page_ids: "asyncio.Queue[str]",
+    workers: int = 1,
+    session: Optional[BrowserSession] = None,
+    journal: Optional[RunJournal] = None,
+    stop: Optional[asyncio.Event] = None,
+    max_batches: Optional[int] = None,
+    lease: Optional[LeaseManager] = None,
+    retries: Optional[RetryQueue] = None,
+    quarantine: Optional[Quarantine] = None,
+    initial: Optional[List[dict]] = None,
+    notion_io: Optional[AsyncNotion] = None,
+) -> None:
+    """
+    Process the pages named by webhook events as they arrive.
+
+    Ids are collected for WEBHOOK_DEBOUNCE_SECONDS (default 2) after the first
+    one so bursts of edits to one page become one item, then each page is
+    re-read and pending ones go through the fused pass. Pages this process
+    has just written come back as events too and are dropped by the status
+    check. ``initial`` pages (the catch-up listing) are already fresh and
+    filtered, so they go through the fused pass first without a re-read.
+    With ``notion_io``, the re-reads and the fused pass use its Notion pool.
+    """
+    notes = _DailyNoteCounter()
+    debounce = float(get_int("WEBHOOK_DEBOUNCE_SECONDS", 2))
+    stop = stop or asyncio.Event()
+
+    async def _process(pages: List[dict]) -> None:
+        pages = await asyncio.to_thread(_schedule, pages, journal)
+        counts = await run_fused(
+            pages,
+            notion,
+            cdp_url,
+            workers=workers,
+            session=session,
+            journal=journal,
+            note_counter=notes,
+            lease=lease,
+            retries=retries,
+            quarantine=quarantine,
+            notion_io=notion_io,
+        )
+        _log_ingest_counts(counts)
+
+    if initial:
+        logging.info("Webhook: initial sync, %d pending page(s)", len(initial))
+        await _process(initial)
+    batches = 0
+    while not stop.is_set() and (max_batches is None or batches < max_batches):
+        try:
+            first = await asyncio.wait_for(page_ids.get(), timeout=1.0)
+        except asyncio.TimeoutError:
+            continue
+        if debounce > 0:
+            await asyncio.sleep(debounce)
+        batch = [first]
+        while not page_ids.empty():
+            batch.append(page_ids.get_nowait())
+        batches += 1
+        unique = list(dict.fromkeys(batch))
+        pages = await _offload(notion_io)(_load_event_pages, notion, unique, retries, quarantine)
+        logging.info("Webhook: %d event(s), %d page(s), %d pending", len(batch), len(unique), len(pages))
+        if pages:
+            await _process(pages)
+
+
+def _finish_capture(page: dict, notion: NotionManager, canonical: str, text: str, journal: Optional[RunJournal]) -> str:
+    """Summarize and write a pushed capture; on failure hand it to the polling path."""
+    page_id = page.get("id", "")
+    try:
+        classification, summary = _summarize(text)
+        with notion.unit_of_work(page_id):
+            outcome = _write_results(page, notion, canonical, text, classification, summary, journal)
+    except Exception as exc:
+        logging.exception("Capture summarize failed for %s", page_id)
+        try:
+            notion.mark_pending(page_id, f"capture summarize failed: {exc}")
+        except Exception:
+            logging.warning("Unable to hand capture %s back to polling", page_id)
+        return "error"
+    logging.info("Capture %s finished: %s", page_id, outcome)
+    return outcome
+
+
+# Serializes duplicate check + create per canonical URL across request threads
+_capture_locks = KeyedLock()
+
+
+def accept_capture(
+    capture: Capture,
+    notion: NotionManager,
+    submit: Callable[..., object],
+    journal: Optional[RunJournal] = None,
+) -> Dict[str, str]:
+    """
+    Create the Inbox page for a pushed capture and queue its summarization.
+
+    With enough pre-extracted text (CAPTURE_MIN_TEXT_CHARS, default 200) the
+    browser is skipped: the page is created ``processing`` under a lease, so
+    pollers leave it alone, and ``submit`` runs summarize + write on a worker.
+    If the endpoint dies first, pollers pick the page up once the lease expires.
+    Shorter captures are created ``pending`` for the regular fetch path.
+    Canonical URLs already in the Inbox are reported as duplicates; pushes of
+    the same URL are checked and created one at a time, so a double submit
+    yields one page.
+    """
+    canonical = _canonical_target(capture.url)
+    title = capture.title if _is_meaningful_name(capture.title, capture.url) else ""
+    with _capture_locks.hold(canonical):
+        existing = notion.find_by_canonical(canonical)
+        if existing:
+            return {"id": existing.get("id", ""), "status": "duplicate"}
+        if len(capture.text) < get_int("CAPTURE_MIN_TEXT_CHARS", 200):
+            page = notion.create_item(capture.url, title, capture.source, canonical)
+            return {"id": page.get("id", ""), "status": notion.status.pending}
+        expires = datetime.now(timezone.utc) + timedelta(seconds=get_int("LEASE_TTL_SECONDS", 900))
+        lease = Lease(f"capture:{default_owner()}", expires).format()
+        page = notion.create_item(capture.url, title, capture.source, canonical, notion.status.processing, lease)
+    submit(_finish_capture, page, notion, canonical, capture.text, journal)
+    return {"id": page.get("id", ""), "status": notion.status.processing}
@@ -0,0 +1,125 @@
+"""
+Shared setup and teardown for the ``main.py`` modes.
+
+Every mode that touches the Inbox needs the same long-lived objects: the
+Notion manager with its canonical URL index, the run journal, the retry
+queue, the quarantine and, when several instances share the Inbox, a lease
+manager. ``Runtime`` opens them on entry and closes whatever it opened on
+exit (also when a later one fails to open):
+
+    with Runtime(lease=True) as runtime:
+        async with runtime.notion_pool() as notion_io:
+            ...
+"""
+import asyncio
+import contextlib
+import signal
+from typing import Any, AsyncIterator, Optional
+
+from src.journal import RunJournal
+from src.lease import LeaseManager
+from src.notion import NotionManager
+from src.notion_async import AsyncNotion
+from src.quarantine import Quarantine
+from src.retry import RetryQueue
+from src.url_index import CanonicalIndex
+from src.utils import get_bool, get_env
+
+
+def open_journal() -> Optional[RunJournal]:
+    """Open the crash-recovery journal unless RUN_JOURNAL=false."""
+    if not get_bool("RUN_JOURNAL", True):
+        return None
+    journal = RunJournal()
+    journal.prune()
+    return journal
+
+
+def attach_canonical_index(notion: NotionManager, lease: bool = False) -> Optional[CanonicalIndex]:
+    """
+    Answer dedupe lookups from the local canonical URL index unless CANONICAL_INDEX=false.
+
+    With ``lease`` other machines write Canonical URLs this index never sees,
+    so misses are checked against Notion (see src.url_index).
+    """
+    if not get_bool("CANONICAL_INDEX", True):
+        return None
+    notion.canonical_index = CanonicalIndex(trust_misses=False if lease else None)
+    return notion.canonical_index
+
+
+def open_retry_queue() -> Optional[RetryQueue]:
+    """Open the transient-failure retry queue unless RETRY_QUEUE=false."""
+    if not get_bool("RETRY_QUEUE", True):
+        return None
+    return RetryQueue()
+
+
+def stop_on_signals() -> asyncio.Event:
+    """Event set on SIGINT/SIGTERM (call from inside the running loop)."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):  # pragma: no cover - Windows
+            pass
+    return stop
+
+
+class Runtime:
+    """
+    Args:
+        lease: Claim items with a LeaseManager (also makes index misses go to Notion)
+        index: Attach the canonical URL index to the Notion manager
+        retries: Open the retry queue (RETRY_QUEUE may still turn it off)
+        quarantine: Open the quarantine
+    """
+
+    def __init__(self, lease: bool = False, index: bool = True, retries: bool = True, quarantine: bool = True) -> None:
+        self.cdp_url = get_env("CHROME_REMOTE_URL", "http://localhost:9222")
+        self._lease = lease
+        self._index = index
+        self._retries = retries
+        self._quarantine = quarantine
+        self.notion: Optional[NotionManager] = None
+        self.canonical_index: Optional[CanonicalIndex] = None
+        self.journal: Optional[RunJournal] = None
+        self.retries: Optional[RetryQueue] = None
+        self.quarantine: Optional[Quarantine] = None
+        self.lease: Optional[LeaseManager] = None
+        self._stack = contextlib.ExitStack()
+
+    def __enter__(self) -> "Runtime":
+        with contextlib.ExitStack() as stack:
+            self.notion = NotionManager()
+            if self._index:
+                self.canonical_index = attach_canonical_index(self.notion, self._lease)
+                self._close_later(stack, self.canonical_index)
+            self.journal = self._close_later(stack, open_journal())
+            if self._retries:
+                self.retries = self._close_later(stack, open_retry_queue())
+            if self._quarantine:
+                self.quarantine = self._close_later(stack, Quarantine())
+            if self._lease:
+                self.lease = LeaseManager(self.notion)
+            self._stack = stack.pop_all()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stack.close()
+
+    @staticmethod
+    def _close_later(stack: contextlib.ExitStack, resource: Any) -> Any:
+        if resource is not None:
+            stack.callback(resource.close)
+        return resource
+
+    @contextlib.asynccontextmanager
+    async def notion_pool(self) -> AsyncIterator[AsyncNotion]:
+        """The bounded Notion pool for one event loop; logs its queue stats on exit."""
+        async with AsyncNotion(self.notion) as notion_io:
+            try:
+                yield notion_io
+            finally:
+                notion_io.log_stats()
@@ -0,0 +1,202 @@
+"""
+Ordering of pending Inbox items before dispatch.
+
+All ingest engines dispatch items in list order (FIFO semaphores, ordered
+thread-pool map, the pipeline's first queue), so sorting the pending list is
+enough to decide which items reach ``ready`` first when a run is cut short.
+
+Priority classes, lowest value first:
+
+0. ``Source`` in PRIORITY_SOURCES (default ``plugin``) — captured by a user
+1. Cheap items: resumable from the run journal, or without a URL (notes)
+2. Regular URLs
+3. URLs on SLOW_HOSTS (default ``twitter.com,x.com``)
+
+Within a class the oldest ``created_date`` goes first.
+
+``Deadline`` gives a run a time budget: engines stop dispatching new items
+once only the reserve is left and report the rest as deferred.
+
+``HostShards`` splits the (already ordered) list by host for parallel runs:
+each worker sticks to one host until its shard drains, so cookies, TLS
+sessions and Chrome's per-origin process stay warm, and at most
+HOST_MAX_WORKERS workers hit the same host at once.
+"""
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from src.browser import _host
+from src.utils import get_env, get_int
+
+DEFAULT_PRIORITY_SOURCES = "plugin"
+DEFAULT_SLOW_HOSTS = "twitter.com,x.com"
+
+PRIORITY_SOURCE = 0
+PRIORITY_CHEAP = 1
+PRIORITY_NORMAL = 2
+PRIORITY_SLOW = 3
+
+
+def _csv_set(value: str) -> Set[str]:
+    return {part.strip().lower() for part in value.split(",") if part.strip()}
+
+
+def _host_matches(host: str, hosts: Iterable[str]) -> bool:
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+class PriorityPolicy:
+    """
+    Computes a sort key per page.
+
+    Args:
+        priority_sources: Source values that jump the queue (PRIORITY_SOURCES)
+        slow_hosts: Hosts known to be slow to fetch (SLOW_HOSTS)
+        is_cached: Optional predicate; True means the page can be finished
+            without a fresh fetch (e.g., journaled progress)
+    """
+
+    def __init__(
+        self,
+        priority_sources: Optional[Iterable[str]] = None,
+        slow_hosts: Optional[Iterable[str]] = None,
+        is_cached: Optional[Callable[[dict], bool]] = None,
+    ) -> None:
+        self.priority_sources = (
+            {s.lower() for s in priority_sources}
+            if priority_sources is not None
+            else _csv_set(get_env("PRIORITY_SOURCES", DEFAULT_PRIORITY_SOURCES))
+        )
+        self.slow_hosts = (
+            {h.lower() for h in slow_hosts}
+            if slow_hosts is not None
+            else _csv_set(get_env("SLOW_HOSTS", DEFAULT_SLOW_HOSTS))
+        )
+        self.is_cached = is_cached
+
+    def priority_class(self, page: dict) -> int:
+        if (page.get("source") or "").strip().lower() in self.priority_sources:
+            return PRIORITY_SOURCE
+        url = page.get("url")
+        if not url or (self.is_cached is not None and self.is_cached(page)):
+            return PRIORITY_CHEAP
+        host = (urlparse(url).hostname or "").lower()
+        if _host_matches(host, self.slow_hosts):
+            return PRIORITY_SLOW
+        return PRIORITY_NORMAL
+
+    def key(self, page: dict) -> Tuple[int, int, str]:
+        created = page.get("created_date")
+        # Items without a creation time sort last within their class
+        return (self.priority_class(page), 0 if created else 1, created or "")
+
+
+def prioritize(pages: List[dict], policy: Optional[PriorityPolicy] = None) -> List[dict]:
+    """Return ``pages`` sorted by priority (stable, so ties keep query order)."""
+    policy = policy or PriorityPolicy()
+    return sorted(pages, key=policy.key)
+
+
+class Deadline:
+    """
+    Time budget for one run.
+
+    Args:
+        budget_seconds: Total wall-clock budget (None = unlimited)
+        reserve_seconds: Headroom kept for in-flight items; no new item is
+            dispatched once less than this is left
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        budget_seconds: Optional[float],
+        reserve_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budget_seconds = budget_seconds
+        self.reserve_seconds = max(0.0, reserve_seconds)
+        self._clock = clock
+        self._started = clock()
+
+    def remaining(self) -> float:
+        """Seconds left before the hard end of the budget."""
+        if self.budget_seconds is None:
+            return float("inf")
+        return self.budget_seconds - (self._clock() - self._started)
+
+    def exhausted(self) -> bool:
+        """True once the run should stop dispatching new items."""
+        return self.remaining() <= self.reserve_seconds
+
+
+def page_host(page: dict) -> str:
+    """Shard key: the URL's host without ``www.`` ("" for notes and attachments)."""
+    host = _host(page.get("url") or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostShards:
+    """
+    Per-host work queues with affinity and work stealing.
+
+    A worker keeps taking items from its current host. When that shard is
+    empty it moves to the unclaimed shard whose next item comes earliest in
+    the original order (so priority order is kept across hosts); when every
+    non-empty shard already has a worker it steals from the largest one that
+    is still below ``host_limit``.
+
+    Args:
+        items: Items in dispatch order
+        host_limit: Workers allowed on one host at a time (HOST_MAX_WORKERS, default 2)
+        key: Maps an item to its shard (defaults to page_host)
+    """
+
+    def __init__(
+        self,
+        items: List[Any],
+        host_limit: Optional[int] = None,
+        key: Callable[[Any], str] = page_host,
+    ) -> None:
+        self.host_limit = max(1, host_limit if host_limit is not None else get_int("HOST_MAX_WORKERS", 2))
+        self._shards: Dict[str, Deque[Tuple[int, Any]]] = {}
+        for index, item in enumerate(items):
+            self._shards.setdefault(key(item), deque()).append((index, item))
+        self._home: Dict[int, str] = {}
+        self._workers_on: Counter = Counter()
+        self.steals = 0
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    def take(self, worker: int) -> Optional[Tuple[int, Any]]:
+        """
+        Next ``(index, item)`` for ``worker``.
+
+        Returns None when nothing is left that this worker may take; every
+        remaining shard then already has a worker that will drain it.
+        """
+        home = self._home.get(worker)
+        if home is not None:
+            if self._shards[home]:
+                return self._shards[home].popleft()
+            self._leave(worker)
+        open_hosts = [h for h, queue in self._shards.items() if queue and self._workers_on[h] < self.host_limit]
+        if not open_hosts:
+            return None
+        unclaimed = [h for h in open_hosts if self._workers_on[h] == 0]
+        if unclaimed:
+            host = min(unclaimed, key=lambda h: self._shards[h][0][0])
+        else:
+            host = max(open_hosts, key=lambda h: len(self._shards[h]))
+            self.steals += 1
+        self._home[worker] = host
+        self._workers_on[host] += 1
+        return self._shards[host].popleft()
+
+    def _leave(self, worker: int) -> None:
+        host = self._home.pop(worker)
+        self._workers_on[host] -= 1
@@ -0,0 +1,37 @@
+"""
+Local on-disk state shared by run-to-run bookkeeping (journal, caches, indexes).
+
+Everything lives in one SQLite file under STATE_DIR (default ``.state``) so a
+crashed or killed run can be picked up by the next one.
+"""
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from src.utils import get_env
+
+DEFAULT_STATE_DIR = ".state"
+DEFAULT_DB_NAME = "state.db"
+
+
+def state_dir() -> Path:
+    """Return (and create) the directory holding local state."""
+    path = Path(get_env("STATE_DIR", DEFAULT_STATE_DIR))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Open the state database.
+
+    The connection is shared across worker threads (callers serialize access
+    with their own lock) and runs in autocommit mode with WAL, so each write is
+    durable as soon as the statement returns.
+    """
+    db_path = Path(path) if path else state_dir() / DEFAULT_DB_NAME
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,144 @@
+"""
+Local canonical URL → Inbox page index for dedupe.
+
+Checking whether a canonical URL is already in the Inbox used to cost one
+Notion database query per item. The index keeps that mapping in the state
+database instead:
+
+- built from one paginated scan of every page with a Canonical URL (oldest
+  first, so the original page wins over later duplicates), and rebuilt when
+  the last scan is older than CANONICAL_INDEX_RECONCILE_SECONDS (default 86400)
+- kept current by the pipeline's own writes (NotionManager.set_classification
+  and create_item record the URLs they set)
+- shared by every process using the same STATE_DIR
+
+A hit is re-read from Notion by the caller, so a page deleted or edited by
+hand since the last scan is dropped, not reported as a duplicate (see
+NotionManager.find_by_canonical).
+
+A miss is answered locally only while ``trust_misses`` holds. That is safe
+when every writer of Canonical URLs shares this STATE_DIR (one machine:
+process, watch, webhook and serve alike); a URL written anywhere else (a
+``--lease`` node on another machine, a manual edit) stays invisible until the
+next rebuild, up to CANONICAL_INDEX_RECONCILE_SECONDS, and one duplicate can
+slip through in that window. Multi-node runs therefore turn trust_misses off
+(misses are checked against Notion, as before the index);
+CANONICAL_INDEX_TRUST_MISSES=false does the same for other setups.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from src.state import connect
+from src.utils import get_bool, get_int
+
+
+class CanonicalIndex:
+    """
+    Args:
+        path: State database path (defaults to STATE_DIR/state.db)
+        reconcile_seconds: Maximum age of the last full scan
+            (CANONICAL_INDEX_RECONCILE_SECONDS, default 86400)
+        trust_misses: Answer misses without asking Notion
+            (CANONICAL_INDEX_TRUST_MISSES, default true)
+        clock: Wall clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        reconcile_seconds: Optional[int] = None,
+        trust_misses: Optional[bool] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.reconcile_seconds = (
+            reconcile_seconds if reconcile_seconds is not None else get_int("CANONICAL_INDEX_RECONCILE_SECONDS", 86400)
+        )
+        self.trust_misses = trust_misses if trust_misses is not None else get_bool("CANONICAL_INDEX_TRUST_MISSES", True)
+        self._clock = clock
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS canonical_index (
+                    canonical_url TEXT PRIMARY KEY,
+                    page_id TEXT NOT NULL,
+                    status TEXT,
+                    recorded_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS canonical_index_page ON canonical_index (page_id)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS canonical_index_meta (key TEXT PRIMARY KEY, value REAL)")
+
+    def lookup(self, canonical_url: str) -> Optional[Dict[str, Any]]:
+        """``{"id", "status"}`` of the page recorded for ``canonical_url``, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_id, status FROM canonical_index WHERE canonical_url = ?", (canonical_url,)
+            ).fetchone()
+        return {"id": row[0], "status": row[1]} if row else None
+
+    def record(self, canonical_url: str, page_id: str, status: Optional[str] = None) -> None:
+        """Remember that ``page_id`` carries ``canonical_url``; an existing other page keeps the URL."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO canonical_index (canonical_url, page_id, status, recorded_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(canonical_url) DO UPDATE SET status = COALESCE(excluded.status, status), "
+                "recorded_at = excluded.recorded_at WHERE page_id = excluded.page_id",
+                (canonical_url, page_id, status, self._clock()),
+            )
+
+    def forget(self, canonical_url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM canonical_index WHERE canonical_url = ?", (canonical_url,))
+
+    def needs_rebuild(self) -> bool:
+        """True before the first scan and once the last one is older than reconcile_seconds."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM canonical_index_meta WHERE key = 'scanned_at'").fetchone()
+        return row is None or self._clock() - row[0] > self.reconcile_seconds
+
+    def rebuild(self, pages: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the index with a full scan of simplified pages (oldest first).
+
+        ``pages`` may be a lazy scan: entries record()ed while it runs are newer
+        than anything it returns, so they are kept rather than wiped.
+
+        Returns:
+            Number of canonical URLs indexed
+        """
+        started = self._clock()
+        rows = []
+        seen = set()
+        for page in pages:
+            canonical = page.get("canonical_url")
+            if canonical and canonical not in seen:
+                seen.add(canonical)
+                rows.append((canonical, page.get("id", ""), page.get("status"), started))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM canonical_index WHERE recorded_at < ?", (started,))
+                self._conn.executemany(
+                    "INSERT INTO canonical_index (canonical_url, page_id, status, recorded_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(canonical_url) DO NOTHING",
+                    rows,
+                )
+                self._conn.execute(
+                    "INSERT INTO canonical_index_meta (key, value) VALUES ('scanned_at', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (started,),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -45,6 +45,10 @@ def _parse_bool(val: Optional[str], default: bool) -> bool:
     return val.lower() in ("1", "true", "yes", "on")
 
 
+def get_bool(key: str, default: bool) -> bool:
+    return _parse_bool(os.getenv(key), default)
+
+
 def get_int(key: str, default: int) -> int:
     try:
         return int(os.getenv(key, default))
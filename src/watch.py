@@ -0,0 +1,139 @@
+"""
+Incremental Inbox polling for the long-running ``main.py watch`` mode.
+
+Each poll asks Notion only for pending pages edited since a persisted
+high-water mark (``last_edited_time``). Notion truncates that timestamp to the
+minute, so polls re-read a short overlap window and drop pages that were
+already handled and have not been edited since.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.state import connect
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _shift_iso(value: str, seconds: float) -> str:
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00")) + timedelta(seconds=seconds)
+    return moment.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class HighWaterMark:
+    """Named cursor persisted in the local state database."""
+
+    def __init__(self, name: str = "inbox", path: Optional[Path] = None) -> None:
+        self.name = name
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS markers (name TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def get(self) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM markers WHERE name = ?", (self.name,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO markers (name, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (self.name, value, time.time()),
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class InboxWatcher:
+    """
+    Poll loop feeding newly edited pending pages to an async handler.
+
+    Args:
+        fetch: ``fetch(edited_since)`` returning simplified pending pages (sync,
+            run in a worker thread); ``edited_since`` is None for a full sweep
+        handle: Coroutine processing a batch of pages and returning outcome counts
+        mark: Persisted high-water mark
+        interval: Seconds between polls
+        overlap_seconds: How far behind the mark each poll re-reads
+        full_sync_every: Every N polls ignore the mark and sweep all pending
+            pages (0 disables), catching anything the incremental query missed
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], List[dict]],
+        handle: Callable[[List[dict]], Awaitable[Dict[str, int]]],
+        mark: HighWaterMark,
+        interval: float = 15.0,
+        overlap_seconds: float = 60.0,
+        full_sync_every: int = 0,
+    ) -> None:
+        self.fetch = fetch
+        self.handle = handle
+        self.mark = mark
+        self.interval = interval
+        self.overlap_seconds = overlap_seconds
+        self.full_sync_every = full_sync_every
+        self.polls = 0
+        # page id -> time our handling finished; edits at or before it are ours
+        self._handled: Dict[str, str] = {}
+
+    def _is_new(self, page: dict) -> bool:
+        handled_at = self._handled.get(page.get("id", ""))
+        if handled_at is None:
+            return True
+        edited = page.get("last_edited_time")
+        return bool(edited) and edited > handled_at
+
+    async def poll_once(self) -> Dict[str, int]:
+        """Fetch pages edited since the mark, process the new ones, advance the mark."""
+        cursor = self.mark.get()
+        full_sync = cursor is None or (self.full_sync_every > 0 and self.polls % self.full_sync_every == 0)
+        since = None if full_sync else _shift_iso(cursor, -self.overlap_seconds)
+        self.polls += 1
+
+        pages = await asyncio.to_thread(self.fetch, since)
+        fresh = [page for page in pages if self._is_new(page)]
+        edits = [page["last_edited_time"] for page in pages if page.get("last_edited_time")]
+
+        counts: Dict[str, int] = {}
+        if fresh:
+            logger.info("Watch poll picked up %d new item(s) (%d returned)", len(fresh), len(pages))
+            counts = await self.handle(fresh)
+            finished = _utc_now_iso()
+            for page in fresh:
+                self._handled[page.get("id", "")] = finished
+
+        newest = max(edits + ([cursor] if cursor else []), default=None)
+        if newest:
+            self.mark.set(newest)
+            # Pages handled before the overlap window can no longer be returned
+            horizon = _shift_iso(newest, -self.overlap_seconds)
+            self._handled = {pid: at for pid, at in self._handled.items() if at >= horizon}
+        return counts
+
+    async def run(self, stop: Optional[asyncio.Event] = None, max_polls: Optional[int] = None) -> None:
+        """Poll until ``stop`` is set (or ``max_polls`` polls have run)."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                counts = await self.poll_once()
+                if counts:
+                    logger.info("METRIC watch_poll counts=%s latency_s=%.2f", counts, time.monotonic() - started)
+            except Exception:
+                logger.exception("Watch poll failed; retrying after %.0fs", self.interval)
+            if max_polls is not None and self.polls >= max_polls:
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,169 @@
+"""
+Notion webhook receiver for event-driven processing (``main.py webhook``).
+
+Notion posts an event whenever a page in a subscribed workspace changes. Only
+page events whose parent is the Inbox database (or its data source) are
+forwarded, as bare page ids, to the ``on_page`` callback; the caller re-reads
+each page and decides whether it still needs work, so duplicate, reordered or
+self-triggered events are harmless.
+
+Subscription setup: Notion first posts ``{"verification_token": ...}``. The
+token is logged so it can be pasted into the integration settings and set
+as WEBHOOK_VERIFICATION_TOKEN, after which every event must carry a valid
+``X-Notion-Signature: sha256=<hmac(body)>`` header.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from src.utils import get_env, get_int
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+PAGE_EVENTS = frozenset(
+    {"page.created", "page.content_updated", "page.properties_updated", "page.undeleted", "page.moved"}
+)
+
+
+def _normalize_id(value: Optional[str]) -> str:
+    return (value or "").replace("-", "").lower()
+
+
+def sign(body: bytes, token: str) -> str:
+    """``X-Notion-Signature`` value for ``body``."""
+    return "sha256=" + hmac.new(token.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body: bytes, header: Optional[str], token: str) -> bool:
+    return bool(header) and hmac.compare_digest(sign(body, token), header)
+
+
+def page_id_from_event(event: Any, parent_ids: Iterable[str]) -> Optional[str]:
+    """
+    Page id of an Inbox page event, or None for anything else.
+
+    Args:
+        event: Decoded webhook payload
+        parent_ids: Inbox database / data source ids (dashes optional)
+    """
+    if not isinstance(event, dict) or event.get("type") not in PAGE_EVENTS:
+        return None
+    entity = event.get("entity") or {}
+    if entity.get("type") != "page" or not entity.get("id"):
+        return None
+    parent = (event.get("data") or {}).get("parent") or {}
+    wanted = {_normalize_id(pid) for pid in parent_ids if pid}
+    if wanted and _normalize_id(parent.get("id") or parent.get("data_source_id")) not in wanted:
+        return None
+    return entity["id"]
+
+
+def synthetic_event(page_id: str, parent_id: str, event_type: str = "page.created") -> dict:
+    """Minimal Notion-shaped event, for local testing without a public endpoint."""
+    return {
+        "type": event_type,
+        "entity": {"id": page_id, "type": "page"},
+        "data": {"parent": {"id": parent_id, "type": "database"}},
+        "attempt_number": 1,
+    }
+
+
+class WebhookServer:
+    """
+    Threaded stdlib HTTP server that turns Notion events into page ids.
+
+    Args:
+        on_page: Called with each relevant page id (from the HTTP thread; must not block)
+        parent_ids: Inbox database / data source ids to accept events for
+        host: Bind address (WEBHOOK_HOST, default 127.0.0.1)
+        port: Bind port (WEBHOOK_PORT, default 8766; 0 picks a free port)
+        verification_token: Signing secret (WEBHOOK_VERIFICATION_TOKEN); unsigned
+            events are accepted only while it is unset
+        path: Request path Notion posts to
+    """
+
+    def __init__(
+        self,
+        on_page: Callable[[str], None],
+        parent_ids: Iterable[str],
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        verification_token: Optional[str] = None,
+        path: str = "/notion/webhook",
+    ) -> None:
+        self.on_page = on_page
+        self.parent_ids = [pid for pid in parent_ids if pid]
+        self.verification_token = (
+            verification_token if verification_token is not None else get_env("WEBHOOK_VERIFICATION_TOKEN", "")
+        )
+        self.path = path
+        bind = (
+            host if host is not None else get_env("WEBHOOK_HOST", "127.0.0.1"),
+            port if port is not None else get_int("WEBHOOK_PORT", 8766),
+        )
+        self._httpd = ThreadingHTTPServer(bind, self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt: str, *args: Any) -> None:
+                logger.debug("webhook: " + fmt, *args)
+
+            def _reply(self, code: int) -> None:
+                self.send_response(code)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self) -> None:
+                if self.path != server.path:
+                    self._reply(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                if length <= 0 or length > MAX_BODY_BYTES:
+                    self._reply(400)
+                    return
+                body = self.rfile.read(length)
+                try:
+                    event = json.loads(body.decode("utf-8"))
+                except (ValueError, UnicodeDecodeError):
+                    self._reply(400)
+                    return
+                if isinstance(event, dict) and "verification_token" in event:
+                    logger.warning(
+                        "Notion webhook verification token: %s (set WEBHOOK_VERIFICATION_TOKEN)",
+                        event["verification_token"],
+                    )
+                    self._reply(200)
+                    return
+                token = server.verification_token
+                if token and not verify_signature(body, self.headers.get("X-Notion-Signature"), token):
+                    self._reply(401)
+                    return
+                page_id = page_id_from_event(event, server.parent_ids)
+                if page_id:
+                    server.on_page(page_id)
+                self._reply(200)
+
+        return Handler
+
+    def start(self) -> None:
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="webhook", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
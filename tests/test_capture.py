@@ -0,0 +1,212 @@
+"""Tests for the push-ingest capture endpoint."""
+import json
+import urllib.error
+import urllib.request
+from contextlib import asynccontextmanager, contextmanager
+
+import pytest
+
+from src.capture import Capture, CaptureServer, parse_capture
+from src.runners import accept_capture
+
+
+class FakeNotion:
+    def __init__(self, existing=None):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready", "processing": "processing"})()
+        self.existing = existing
+        self.created = []
+        self.calls = []
+
+    def find_by_canonical(self, canonical_url):
+        return self.existing
+
+    def create_item(self, url, title, source=None, canonical_url=None, status=None, lease=None):
+        self.created.append({"url": url, "title": title, "source": source, "status": status, "lease": lease})
+        return {"id": f"new{len(self.created)}", "url": url, "title": title, "source": source}
+
+    def set_classification(self, **kwargs):
+        self.calls.append(("classified", kwargs["page_id"], kwargs["canonical_url"]))
+
+    def mark_as_done(self, page_id, summary, status=None):
+        self.calls.append(("done", page_id, summary))
+
+    def set_title(self, page_id, title, note=None):
+        self.calls.append(("title", page_id, title))
+
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
+
+def _post(address, payload, token=None):
+    request = urllib.request.Request(
+        f"http://{address[0]}:{address[1]}/capture",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json", **({"Authorization": f"Bearer {token}"} if token else {})},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_parse_capture_accepts_contract_aliases():
+    capture = parse_capture({"url": "https://example.com/a", "raw_text": " body ", "source_channel": "extension"})
+    assert capture == Capture(url="https://example.com/a", title="", text="body", source="extension")
+    with pytest.raises(ValueError):
+        parse_capture({"raw_text": "no url"})
+    with pytest.raises(ValueError):
+        parse_capture(["not", "an", "object"])
+
+
+def test_server_routes_valid_captures_and_rejects_bad_ones():
+    received = []
+    accept = lambda c: received.append(c) or {"id": "p1", "status": "processing"}  # noqa: E731
+    server = CaptureServer(accept, "127.0.0.1", 0, "s3cret")
+    server.start()
+    try:
+        assert _post(server.address, {"url": "https://example.com/a"}) == (401, {"error": "unauthorized"})
+        assert _post(server.address, {"title": "x"}, token="s3cret")[0] == 400
+        assert _post(server.address, {"url": "https://example.com/a", "text": "t"}, token="s3cret") == (
+            202,
+            {"id": "p1", "status": "processing"},
+        )
+    finally:
+        server.shutdown()
+    assert [c.url for c in received] == ["https://example.com/a"]
+
+
+def test_capture_with_text_skips_the_browser(monkeypatch):
+    notion = FakeNotion()
+
+    async def no_fetch(*args, **kwargs):
+        raise AssertionError("captures with text must not be fetched")
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", no_fetch)
+    monkeypatch.setattr("src.ingest.fetch_rendered_page", no_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": ["news"], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "short summary"})
+    capture = Capture(url="https://example.com/post?utm_source=x", title="A real title", text="body " * 100)
+
+    result = accept_capture(capture, notion, submit=lambda fn, *args: fn(*args))
+
+    assert result == {"id": "new1", "status": "processing"}
+    assert notion.created[0]["status"] == "processing"
+    assert notion.created[0]["lease"].startswith("capture:")
+    assert ("classified", "new1", "https://example.com/post") in notion.calls
+    assert ("done", "new1", "short summary") in notion.calls
+
+
+def test_short_or_duplicate_captures_use_the_regular_path():
+    submitted = []
+    notion = FakeNotion()
+
+    result = accept_capture(Capture(url="https://example.com/a", text="tiny"), notion, submit=submitted.append)
+
+    assert result == {"id": "new1", "status": "pending"}
+    assert notion.created[0]["status"] is None
+    assert submitted == []
+
+    dup = FakeNotion(existing={"id": "old"})
+    assert accept_capture(Capture(url="https://example.com/a"), dup, submit=submitted.append) == {
+        "id": "old",
+        "status": "duplicate",
+    }
+    assert dup.created == []
+
+
+def test_concurrent_pushes_of_one_url_create_one_page():
+    import threading
+    import time
+
+    class SlowNotion(FakeNotion):
+        def find_by_canonical(self, canonical_url):
+            return {"id": "new1"} if self.created else None
+
+        def create_item(self, *args, **kwargs):
+            time.sleep(0.05)  # both requests would pass the check without the lock
+            return super().create_item(*args, **kwargs)
+
+    notion = SlowNotion()
+    results = []
+    capture = Capture(url="https://example.com/same", text="tiny")
+    threads = [
+        threading.Thread(target=lambda: results.append(accept_capture(capture, notion, submit=lambda *a: None)))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(notion.created) == 1
+    assert sorted(r["status"] for r in results) == ["duplicate", "pending"]
+
+
+def test_server_requires_a_valid_content_length():
+    import http.client
+
+    server = CaptureServer(lambda c: {"id": "p1", "status": "pending"}, "127.0.0.1", 0)
+    server.start()
+    try:
+        for length, expected in ((None, 411), ("abc", 400)):
+            conn = http.client.HTTPConnection(*server.address, timeout=5)
+            conn.putrequest("POST", "/capture")
+            if length is not None:
+                conn.putheader("Content-Length", length)
+            conn.endheaders()
+            assert conn.getresponse().status == expected
+            conn.close()
+    finally:
+        server.shutdown()
+
+
+def test_capture_writes_are_one_unit_and_orphans_are_polled_again(monkeypatch):
+    from contextlib import contextmanager
+    from datetime import datetime, timedelta, timezone
+
+    from src.ingest import _list_pending
+    from src.lease import Lease
+
+    class UnitNotion(FakeNotion):
+        def __init__(self):
+            super().__init__()
+            self.status.unprocessed = "unprocessed"
+            self.open = False
+
+        @contextmanager
+        def unit_of_work(self, page_id):
+            self.open = True
+            yield
+            self.open = False
+            self.calls.append(("sent", page_id))
+
+        def mark_as_done(self, page_id, summary, status=None):
+            assert self.open
+            super().mark_as_done(page_id, summary, status)
+
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "short summary"})
+    notion = UnitNotion()
+    accept_capture(Capture(url="https://example.com/a", text="body " * 100), notion, submit=lambda fn, *args: fn(*args))
+    assert notion.calls[-1] == ("sent", "new1")
+
+    # A capture whose endpoint died before finishing is listed once its lease runs out
+    now = datetime.now(timezone.utc)
+    live = Lease("capture:x", now + timedelta(minutes=5)).format()
+    dead = Lease("capture:x", now - timedelta(minutes=5)).format()
+    notion.get_pending_tasks = lambda **query: [
+        {"id": "live", "status": "processing", "lease": live, "url": "https://example.com/live"},
+        {"id": "dead", "status": "processing", "lease": dead, "url": "https://example.com/dead"},
+    ]
+    assert [p["id"] for p in _list_pending(notion)] == ["dead"]
@@ -1,10 +1,11 @@
 import asyncio
 import os
+from contextlib import asynccontextmanager, contextmanager
 
 import pytest
 
 from src import dedupe
-from main import process_item
+from src.ingest import process_item
 
 
 def test_canonical_url_strips_tracking_and_fragment():
@@ -47,6 +48,18 @@ class FakeNotion:
     def set_title(self, page_id, title, note=None):
         self.record["marked"].append(("set_title", page_id, title, note))
 
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
 
 def test_process_item_low_confidence(monkeypatch):
     fake = FakeNotion()
@@ -62,9 +75,9 @@ def test_process_item_low_confidence(monkeypatch):
     def fake_digest(text):
         return {"tldr": "short"}
 
-    monkeypatch.setattr("main.fetch_page_content", fake_fetch)
-    monkeypatch.setattr("main.classify", fake_classify)
-    monkeypatch.setattr("main.generate_digest", fake_digest)
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", fake_classify)
+    monkeypatch.setattr("src.ingest.generate_digest", fake_digest)
 
     # run process_item (it is sync but uses asyncio loop internally)
     page = {"id": "1", "url": "https://example.com/article", "attachments": []}
@@ -92,3 +105,101 @@ def test_process_item_duplicate(monkeypatch):
     assert fake.record["duplicate_of"][1] == "abc"
 
 
+
+
+def test_settled_low_confidence_items_are_skipped_unless_refreshed():
+    from src.ingest import _list_pending, is_settled
+    from src.llm import PROMPT_VERSION, RULE_VERSION
+    from src.notion import SETTLED_NOTE
+
+    fingerprint = {"rule_version": RULE_VERSION, "prompt_version": PROMPT_VERSION}
+    settled = dict(
+        fingerprint,
+        id="s",
+        status="pending",
+        url="https://example.com/a?utm_source=x",
+        canonical_url=dedupe.canonical_url("https://example.com/a"),
+        reason=SETTLED_NOTE,
+    )
+    moved = dict(settled, id="m", url="https://example.com/b")
+
+    def elsewhere(path, **fields):
+        # Same fingerprint on another URL (one page per URL and batch is listed)
+        url = f"https://example.com/{path}"
+        return dict(settled, url=url, canonical_url=dedupe.canonical_url(url), **fields)
+
+    old_prompt = elsewhere("c", id="o", prompt_version="prompt-old")
+    # Classified, but the summary/status write never happened
+    half_written = elsewhere("d", id="h", reason="capture summarize failed: boom")
+    fresh = {"id": "f", "status": "pending", "url": "https://example.com/e"}
+
+    notion = FakeNotion()
+    notion.status.unprocessed = "unprocessed"
+    notion.get_pending_tasks = lambda **query: [settled, moved, old_prompt, half_written, fresh]
+
+    assert is_settled(settled, notion)
+    assert not is_settled(half_written, notion)
+    assert not is_settled(fresh, notion)
+    assert [p["id"] for p in _list_pending(notion)] == ["m", "o", "h", "f"]
+    assert [p["id"] for p in _list_pending(notion, refresh=True)] == ["s", "m", "o", "h", "f"]
+
+
+def test_concurrent_pages_sharing_a_url_are_fetched_once(monkeypatch):
+    import threading
+    import time
+
+    from src.ingest import _list_pending, run_ingest
+
+    class ListingNotion(FakeNotion):
+        """Pending listing plus a canonical lookup that only sees classified pages."""
+
+        def __init__(self, pages):
+            super().__init__()
+            self.status.unprocessed = "unprocessed"
+            self.pages = pages
+            self.canonical = {}
+            self.duplicates = []
+
+        def get_pending_tasks(self, **query):
+            return [p for p in self.pages if p["id"] not in self.canonical.values()]
+
+        def find_by_canonical(self, canonical_url):
+            page_id = self.canonical.get(canonical_url)
+            return {"id": page_id, "status": self.status.ready} if page_id else None
+
+        def set_classification(self, **kwargs):
+            self.canonical[kwargs["canonical_url"]] = kwargs["page_id"]
+
+        def set_duplicate_of(self, page_id, canonical_id, note):
+            self.duplicates.append((page_id, canonical_id))
+
+    fetched = []
+    fetch_lock = threading.Lock()
+
+    async def slow_fetch(url, cdp_url):
+        with fetch_lock:
+            fetched.append(url)
+        time.sleep(0.05)
+        return "hello world"
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", slow_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "short"})
+
+    fake = ListingNotion(
+        [
+            {"id": "a", "url": "https://example.com/post?utm_source=x", "attachments": []},
+            {"id": "b", "url": "https://example.com/post", "attachments": []},
+        ]
+    )
+
+    counts = run_ingest(_list_pending(fake), fake, "cdp", workers=2)
+    assert counts["success"] == 1
+    assert len(fetched) == 1
+    assert fake.duplicates == []
+
+    # Next run: the held-back page is now a duplicate of the written one
+    counts = run_ingest(_list_pending(fake), fake, "cdp", workers=2)
+    assert counts["duplicate"] == 1
+    assert fake.duplicates == [("b", "a")]
+    assert len(fetched) == 1
@@ -0,0 +1,183 @@
+"""Tests for the fused preprocess + ingest pass."""
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+
+from src.browser import RenderedPage
+
+
+class FakeNotion:
+    def __init__(self, blocks=None):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready"})()
+        self.blocks = blocks or {}
+        self.calls = []
+        self.pending_queries = 0
+
+    def has_page_blocks(self, page_id):
+        return self.blocks.get(page_id, False)
+
+    def find_by_canonical(self, canonical_url):
+        return None
+
+    def set_duplicate_of(self, page_id, canonical_id, note):
+        self.calls.append(("duplicate", page_id))
+
+    def set_item_type(self, page_id, item_type):
+        self.calls.append(("item_type", page_id, item_type))
+
+    def set_content_type(self, page_id, content_type):
+        self.calls.append(("content_type", page_id, content_type))
+
+    def set_classification(self, **kwargs):
+        self.calls.append(("classified", kwargs["page_id"]))
+
+    def mark_as_done(self, page_id, summary, status=None):
+        self.calls.append(("done", page_id, summary, status))
+
+    def mark_unprocessed(self, page_id, note):
+        self.calls.append(("unprocessed", page_id))
+
+    def mark_as_error(self, page_id, note):
+        self.calls.append(("error", page_id, note))
+
+    def set_title(self, page_id, title, note=None):
+        self.calls.append(("title", page_id, title))
+
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
+
+def _patch_llm(monkeypatch):
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "tldr line"})
+
+
+def test_fused_url_item_navigates_once(monkeypatch):
+    from src.ingest import run_fused
+
+    fake = FakeNotion()
+    navigations = []
+
+    async def fake_render(url, cdp_url, session=None, want_title=False):
+        navigations.append((url, want_title))
+        return RenderedPage(url=url, html="<p>x</p>", title="Page Title", content_type="text/html; charset=utf-8")
+
+    monkeypatch.setattr("src.ingest.fetch_rendered_page", fake_render)
+    monkeypatch.setattr("src.ingest.extract_text", lambda rendered: "Body text")
+    _patch_llm(monkeypatch)
+
+    page = {"id": "u1", "title": "", "url": "https://example.com/post", "attachments": []}
+    counts = asyncio.run(run_fused([page], fake, "cdp", workers=2))
+
+    assert counts["success"] == 1
+    assert navigations == [("https://example.com/post", True)]
+    assert ("item_type", "u1", "url_resource") in fake.calls
+    assert ("content_type", "u1", "html") in fake.calls
+    assert ("title", "u1", "Page Title") in fake.calls
+    assert ("classified", "u1") in fake.calls
+    # Title came from the navigation, so the summary must not overwrite it
+    assert [c for c in fake.calls if c[0] == "title"] == [("title", "u1", "Page Title")]
+
+
+def test_fused_pdf_url_skips_navigation(monkeypatch):
+    from src.ingest import run_fused
+
+    fake = FakeNotion()
+
+    async def fail_render(*args, **kwargs):
+        raise AssertionError("PDF URLs must not be navigated")
+
+    monkeypatch.setattr("src.ingest.fetch_rendered_page", fail_render)
+
+    page = {"id": "p1", "title": "", "url": "https://example.com/files/report.pdf", "attachments": []}
+    counts = asyncio.run(run_fused([page], fake, "cdp"))
+
+    assert counts["success"] == 1
+    assert ("content_type", "p1", "pdf") in fake.calls
+    assert ("done", "p1", "[PDF] report.pdf", "ready") in fake.calls
+
+
+def test_fused_assigns_note_sequences_in_order(monkeypatch):
+    from src.ingest import run_fused
+
+    fake = FakeNotion(blocks={"n1": True, "n2": True})
+    pages = [
+        {"id": "n1", "title": "", "url": None},
+        {"id": "e1", "title": "", "url": None},
+        {"id": "n2", "title": "", "url": None},
+    ]
+
+    counts = asyncio.run(run_fused(pages, fake, "cdp", workers=3))
+
+    titles = {c[1]: c[2] for c in fake.calls if c[0] == "title"}
+    assert titles["n1"].endswith("-1")
+    assert titles["n2"].endswith("-2")
+    assert counts == {"success": 2, "error": 1, "duplicate": 0, "unprocessed": 0, "deferred": 0, "retry": 0}
+
+
+def test_fused_note_sequences_follow_created_date_not_dispatch(monkeypatch):
+    from src.ingest import run_fused
+
+    monkeypatch.setenv("INGEST_HOST_AFFINITY", "true")
+    fake = FakeNotion(blocks={"n1": True, "n2": True, "n3": True})
+    pages = [
+        {"id": "n1", "title": "", "url": None, "created_date": "2025-01-01T10:00:00Z"},
+        {"id": "n2", "title": "", "url": None, "created_date": "2025-01-01T08:00:00Z"},
+        {"id": "n3", "title": "Meeting notes", "url": None, "created_date": "2025-01-01T07:00:00Z"},
+    ]
+
+    asyncio.run(run_fused(pages, fake, "cdp", workers=2, note_counter=iter([5, 6, 7])))
+
+    titles = {c[1]: c[2] for c in fake.calls if c[0] == "title"}
+    assert titles["n2"].endswith("-5")
+    assert titles["n1"].endswith("-6")
+    assert "n3" not in titles
+
+
+def test_fused_routes_through_notion_pool():
+    import threading
+
+    from src.ingest import run_fused
+    from src.notion_async import AsyncNotion
+
+    class PoolNotion(FakeNotion):
+        """Records the thread of every Notion call."""
+
+        def __init__(self, blocks=None):
+            super().__init__(blocks)
+            self.threads = []
+
+        def has_page_blocks(self, page_id):
+            self.threads.append(threading.current_thread().name)
+            return super().has_page_blocks(page_id)
+
+        def mark_as_error(self, page_id, note):
+            self.threads.append(threading.current_thread().name)
+            super().mark_as_error(page_id, note)
+
+        def set_title(self, page_id, title, note=None):
+            self.threads.append(threading.current_thread().name)
+            super().set_title(page_id, title, note)
+
+    fake = PoolNotion(blocks={"n1": True})
+    pages = [{"id": "n1", "title": "", "url": None}, {"id": "e1", "title": "", "url": None}]
+
+    async def _run():
+        async with AsyncNotion(fake, max_workers=1) as notion_io:
+            counts = await run_fused(pages, fake, "cdp", workers=2, notion_io=notion_io)
+            return counts, notion_io.stats.calls
+
+    counts, calls = asyncio.run(_run())
+
+    assert calls > 2  # routing, then each item's own writes
+    assert fake.threads and all(name.startswith("notion") for name in fake.threads)
+    assert counts["success"] == 1
+    assert counts["error"] == 1
@@ -1,6 +1,10 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
 import pytest
 
-from main import process_item
+from src.ingest import process_item, process_item_async, run_ingest, run_ingest_async
 
 
 class FakeNotion:
@@ -30,6 +34,18 @@ class FakeNotion:
     def set_title(self, page_id, title, note=None):
         self.record["marked"].append(("set_title", page_id, title, note))
 
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
 
 def test_ingest_happy_path(monkeypatch):
     fake = FakeNotion()
@@ -43,9 +59,9 @@ def test_ingest_happy_path(monkeypatch):
     def fake_digest(text):
         return {"tldr": "short summary"}
 
-    monkeypatch.setattr("main.fetch_page_content", fake_fetch)
-    monkeypatch.setattr("main.classify", fake_classify)
-    monkeypatch.setattr("main.generate_digest", fake_digest)
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", fake_classify)
+    monkeypatch.setattr("src.ingest.generate_digest", fake_digest)
 
     page = {"id": "123", "url": "https://example.com/ok", "attachments": []}
     process_item(page, fake, "http://localhost:9222")
@@ -55,3 +71,189 @@ def test_ingest_happy_path(monkeypatch):
     assert ("done", "123", "short summary", fake.status.ready) in fake.record["marked"]
 
 
+
+
+def test_run_ingest_parallel_counts_and_isolates_failures(monkeypatch):
+    fake = FakeNotion()
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    async def fake_fetch(url, cdp_url):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if url.endswith("/boom"):
+            raise ValueError("boom")
+        return "hello content"
+
+    def fake_classify(text):
+        return {"tags": [], "sensitivity": "public", "confidence": 0.9}
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", fake_classify)
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "ok"})
+
+    pages = [{"id": str(i), "url": f"https://example.com/{i}", "attachments": []} for i in range(6)]
+    pages.append({"id": "bad", "url": "https://example.com/boom", "attachments": []})
+    pages.append({"id": "file", "url": None, "attachments": ["https://example.com/a.png"]})
+
+    counts = run_ingest(pages, fake, "http://localhost:9222", workers=3)
+
+    assert counts == {"success": 6, "error": 1, "duplicate": 0, "unprocessed": 1, "deferred": 0, "retry": 0}
+    assert 1 < active["peak"] <= 3
+
+
+def test_run_ingest_unexpected_exception_marks_item_error(monkeypatch):
+    fake = FakeNotion()
+
+    def exploding_classify(text):
+        raise RuntimeError("llm down")
+
+    async def fake_fetch(url, cdp_url):
+        return "hello content"
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", exploding_classify)
+
+    pages = [{"id": "1", "url": "https://example.com/1", "attachments": []}]
+    counts = run_ingest(pages, fake, "http://localhost:9222", workers=2)
+
+    assert counts["error"] == 1
+    assert ("error", "1", "ingest failed: llm down") in fake.record["marked"]
+
+
+def test_process_item_async_shares_browser_session(monkeypatch):
+    fake = FakeNotion()
+    seen = []
+    session = object()
+
+    async def fake_fetch(url, cdp_url, session=None):
+        seen.append(session)
+        return "hello content"
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "ok"})
+
+    pages = [{"id": str(i), "url": f"https://example.com/{i}", "attachments": []} for i in range(3)]
+
+    async def _run():
+        first = await process_item_async(pages[0], fake, "cdp", session)
+        counts = await run_ingest_async(pages[1:], fake, "cdp", workers=2, session=session)
+        return first, counts
+
+    first, counts = asyncio.run(_run())
+
+    assert first == "success"
+    assert counts["success"] == 2
+    assert seen == [session, session, session]
+
+
+def test_run_ingest_defers_items_after_budget(monkeypatch):
+    from src.scheduler import Deadline
+
+    fake = FakeNotion()
+    now = [0.0]
+
+    async def fake_fetch(url, cdp_url):
+        now[0] += 40  # every fetch burns 40 "seconds" of a 100 s budget
+        return "hello content"
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "ok"})
+
+    pages = [{"id": str(i), "url": f"https://example.com/{i}", "attachments": []} for i in range(5)]
+    deadline = Deadline(100, reserve_seconds=10, clock=lambda: now[0])
+    counts = run_ingest(pages, fake, "cdp", deadline=deadline)
+
+    assert counts["success"] == 3
+    assert counts["deferred"] == 2
+
+
+def test_run_ingest_async_cancels_in_flight_at_hard_deadline(monkeypatch):
+    from src.scheduler import Deadline
+
+    fake = FakeNotion()
+
+    async def fake_fetch(url, cdp_url, session=None):
+        if url.endswith("/slow"):
+            await asyncio.sleep(5)
+        return "hello content"
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "ok"})
+
+    pages = [
+        {"id": "fast", "url": "https://example.com/fast", "attachments": []},
+        {"id": "slow", "url": "https://example.com/slow", "attachments": []},
+    ]
+    counts = asyncio.run(run_ingest_async(pages, fake, "cdp", workers=2, deadline=Deadline(0.2)))
+
+    assert counts["success"] == 1
+    assert counts["deferred"] == 1
+    assert not [m for m in fake.record["marked"] if m[1] == "slow"]
+
+
+def test_parked_items_are_skipped_until_url_or_files_change():
+    from src.ingest import _list_pending, park_reason
+
+    class ListingNotion(FakeNotion):
+        def __init__(self, pages):
+            super().__init__()
+            self.status = type("S", (), {"pending": "pending", "ready": "ready", "unprocessed": "unprocessed"})()
+            self.pages = pages
+            self.queries = []
+
+        def get_pending_tasks(self, **query):
+            self.queries.append(query)
+            return self.pages
+
+    pages = [
+        {"id": "pdf", "status": "unprocessed", "url": "https://example.com/a.pdf", "attachments": []},
+        {"id": "file", "status": "unprocessed", "url": None, "attachments": ["https://example.com/a.png"]},
+        # URL replaced by a readable page since it was parked
+        {"id": "fixed", "status": "unprocessed", "url": "https://example.com/article", "attachments": []},
+        {"id": "new-pdf", "status": "To Read", "url": "https://example.com/b.pdf", "attachments": []},
+    ]
+    notion = ListingNotion(pages)
+
+    active = _list_pending(notion)
+
+    assert [p["id"] for p in active] == ["fixed", "new-pdf"]
+    assert park_reason(pages[0]) is not None
+    assert park_reason(pages[2]) is None
+    assert notion.queries == [{"parked_since": None, "include_processing": True}]
+
+
+def test_run_ingest_async_limits_workers_per_host(monkeypatch):
+    fake = FakeNotion()
+    active = {}
+    peaks = {}
+
+    async def fake_fetch(url, cdp_url):
+        host = url.split("/")[2]
+        active[host] = active.get(host, 0) + 1
+        peaks[host] = max(peaks.get(host, 0), active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return "hello content"
+
+    monkeypatch.setenv("HOST_MAX_WORKERS", "1")
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "ok"})
+
+    pages = [
+        {"id": f"{host}-{i}", "url": f"https://{host}/{i}", "attachments": []}
+        for i in range(3)
+        for host in ("a.example", "b.example")
+    ]
+    counts = asyncio.run(run_ingest_async(pages, fake, "cdp", workers=3))
+
+    assert counts["success"] == 6
+    assert peaks == {"a.example": 1, "b.example": 1}
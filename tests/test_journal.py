@@ -0,0 +1,177 @@
+"""Tests for the crash-recovery run journal."""
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ingest import process_item
+from src.journal import RunJournal
+from src.reporting.models import ReportData, ReportPeriod, ReportType
+from src.reporting.service import DigestService
+
+
+@pytest.fixture
+def journal(tmp_path):
+    j = RunJournal(tmp_path / "state.sqlite3")
+    yield j
+    j.close()
+
+
+class FakeNotion:
+    def __init__(self):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready"})()
+        self.classified = []
+        self.marked = []
+
+    def find_by_canonical(self, canonical_url):
+        return None
+
+    def set_classification(self, **kwargs):
+        self.classified.append(kwargs["page_id"])
+
+    def mark_as_done(self, page_id, summary, status=None):
+        self.marked.append(("done", page_id, summary))
+
+    def mark_as_error(self, page_id, note):
+        self.marked.append(("error", page_id, note))
+
+    def set_title(self, page_id, title, note=None):
+        self.marked.append(("set_title", page_id, title))
+
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
+
+def test_progress_resets_after_complete(journal):
+    journal.record("a", "fetched", {"text": "hello"})
+    journal.record("a", "summarized", {"summary": {"tldr": "x"}})
+
+    assert set(journal.progress("a")) == {"fetched", "summarized"}
+    assert journal.progress("a")["fetched"] == {"text": "hello"}
+
+    journal.complete("a")
+    assert journal.progress("a") == {}
+    assert journal.progress("other") == {}
+
+
+def test_prune_keeps_unfinished_attempts(journal):
+    journal.record("done-key", "fetched", {})
+    journal.complete("done-key")
+    journal.record("open-key", "fetched", {"text": "t"})
+
+    removed = journal.prune(retention_days=-1)
+
+    assert removed == 2
+    assert "fetched" in journal.progress("open-key")
+
+
+def test_process_item_resumes_without_refetch_or_llm(monkeypatch, journal):
+    page = {"id": "p1", "title": "Named", "url": "https://example.com/a", "attachments": []}
+    journal.record("p1", "fetched", {"url": page["url"], "canonical": page["url"], "text": "body"})
+    journal.record(
+        "p1",
+        "summarized",
+        {"classification": {"tags": ["t"], "sensitivity": "public", "confidence": 0.9}, "summary": {"tldr": "cached"}},
+    )
+
+    async def fail_fetch(url, cdp_url):
+        raise AssertionError("journaled page must not be fetched again")
+
+    def fail_llm(text):
+        raise AssertionError("journaled page must not be summarized again")
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fail_fetch)
+    monkeypatch.setattr("src.ingest.classify", fail_llm)
+    monkeypatch.setattr("src.ingest.generate_digest", fail_llm)
+
+    fake = FakeNotion()
+    assert process_item(page, fake, "cdp", journal=journal) == "success"
+
+    assert fake.classified == ["p1"]
+    assert ("done", "p1", "cached") in fake.marked
+    assert journal.progress("p1") == {}
+
+
+def test_process_item_ignores_journal_when_url_changed(monkeypatch, journal):
+    page = {"id": "p2", "title": "Named", "url": "https://example.com/new", "attachments": []}
+    journal.record("p2", "fetched", {"url": "https://example.com/old", "canonical": "x", "text": "stale"})
+
+    async def fake_fetch(url, cdp_url):
+        return "fresh"
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", fake_fetch)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": f"digest of {text}"})
+
+    fake = FakeNotion()
+    process_item(page, fake, "cdp", journal=journal)
+
+    assert ("done", "p2", "digest of fresh") in fake.marked
+
+
+def test_report_resume_appends_only_missing_blocks(journal):
+    period = ReportPeriod(type=ReportType.DAILY, start_date=date(2025, 1, 15), end_date=date(2025, 1, 15))
+    blocks = [{"type": "paragraph", "n": i} for i in range(250)]
+    report = ReportData(period=period, overview="o", source_ids=["s1"], content_blocks=blocks)
+    key = "report:Daily:2025-01-15"
+    journal.record(key, "built", report.to_dict())
+    journal.record(key, "written", {"page_id": "page-1", "blocks": 100})
+
+    reporting = MagicMock()
+    service = DigestService(MagicMock(), reporting, journal=journal)
+
+    assert service.generate_daily(date(2025, 1, 15)) == "page-1"
+
+    reporting.find_report.assert_not_called()
+    reporting.create_report.assert_not_called()
+    reporting.append_blocks.assert_called_once()
+    assert reporting.append_blocks.call_args.kwargs["offset"] == 100
+    assert journal.progress(key) == {}
+
+
+def test_report_resume_reuses_built_data(journal):
+    period = ReportPeriod(type=ReportType.WEEKLY, start_date=date(2025, 1, 13), end_date=date(2025, 1, 19))
+    report = ReportData(period=period, overview="weekly", source_ids=["d1", "d2"])
+    journal.record("report:Weekly:2025-01-13", "built", report.to_dict())
+
+    reporting = MagicMock()
+    reporting.create_report.return_value = "weekly-page"
+    service = DigestService(MagicMock(), reporting, journal=journal)
+
+    assert service.generate_weekly(date(2025, 1, 15)) == "weekly-page"
+
+    reporting.query_reports_in_range.assert_not_called()
+    kwargs = reporting.create_report.call_args.kwargs
+    assert kwargs["report_data"].overview == "weekly"
+    assert kwargs["source_report_ids"] == ["d1", "d2"]
+
+
+def test_forced_report_rebuilds_despite_journaled_progress(journal):
+    period = ReportPeriod(type=ReportType.WEEKLY, start_date=date(2025, 1, 13), end_date=date(2025, 1, 19))
+    stale = ReportData(period=period, overview="stale", source_ids=["d1"])
+    key = "report:Weekly:2025-01-13"
+    journal.record(key, "built", stale.to_dict())
+
+    reporting = MagicMock()
+    reporting.query_reports_in_range.return_value = [{"id": "d1"}, {"id": "d2"}]
+    reporting.create_report.return_value = "weekly-page"
+    service = DigestService(MagicMock(), reporting, journal=journal)
+    service.weekly_builder = MagicMock()
+    service.weekly_builder.build.return_value = ReportData(period=period, overview="fresh", source_ids=["d1", "d2"])
+
+    assert service.generate_weekly(date(2025, 1, 15), force=True) == "weekly-page"
+
+    reporting.find_report.assert_not_called()
+    reporting.query_reports_in_range.assert_called_once()
+    assert reporting.create_report.call_args.kwargs["report_data"].overview == "fresh"
+    assert journal.progress(key) == {}
@@ -0,0 +1,168 @@
+"""Tests for lease-based item claiming."""
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta, timezone
+
+from src.lease import Lease, LeaseManager
+
+
+class Status:
+    pending = "pending"
+    ready = "ready"
+    to_read = "To Read"
+    unprocessed = "unprocessed"
+    processing = "processing"
+
+
+class FakeNotion:
+    """Pages keyed by id; set_lease can be hijacked to simulate a racing worker."""
+
+    def __init__(self, pages):
+        self.status = Status()
+        self.pages = pages
+        self.on_set_lease = None
+        self.tick = 0
+
+    def get_page(self, page_id):
+        return dict(self.pages[page_id])
+
+    def set_lease(self, page_id, lease):
+        self.tick += 1
+        self.pages[page_id].update(status="processing", lease=lease, last_edited_time=f"t{self.tick}")
+        if self.on_set_lease:
+            self.on_set_lease(page_id)
+
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
+
+def _lease_text(owner, minutes):
+    return Lease(owner, datetime.now(timezone.utc) + timedelta(minutes=minutes)).format()
+
+
+def test_lease_round_trip():
+    lease = Lease.parse(_lease_text("host:1:abc", 5))
+    assert lease.owner == "host:1:abc"
+    assert not lease.expired()
+    assert Lease.parse("garbage") is None
+    assert Lease.parse("") is None
+
+
+def test_claim_pending_page():
+    notion = FakeNotion({"a": {"id": "a", "status": "pending", "lease": "", "last_edited_time": "t0"}})
+    manager = LeaseManager(notion, owner="me", settle_seconds=0)
+
+    assert manager.claim({"id": "a", "last_edited_time": "t0"})
+    assert Lease.parse(notion.pages["a"]["lease"]).owner == "me"
+
+
+def test_claim_lost_to_concurrent_writer():
+    notion = FakeNotion({"a": {"id": "a", "status": "pending", "lease": "", "last_edited_time": "t0"}})
+    notion.on_set_lease = lambda pid: notion.pages[pid].update(lease=_lease_text("other", 5))
+    manager = LeaseManager(notion, owner="me", settle_seconds=0)
+
+    assert not manager.claim({"id": "a", "last_edited_time": "t0"})
+
+
+def test_live_foreign_lease_blocks_and_expired_lease_is_reclaimed():
+    notion = FakeNotion(
+        {
+            "live": {"id": "live", "status": "processing", "lease": _lease_text("other", 5), "last_edited_time": "t0"},
+            "dead": {"id": "dead", "status": "processing", "lease": _lease_text("other", -5), "last_edited_time": "t0"},
+        }
+    )
+    manager = LeaseManager(notion, owner="me", settle_seconds=0)
+
+    assert not manager.claim({"id": "live", "last_edited_time": "t0"})
+    assert manager.claim({"id": "dead", "last_edited_time": "t0"})
+
+
+def test_claim_rejects_stale_snapshot():
+    notion = FakeNotion({"a": {"id": "a", "status": "pending", "lease": "", "last_edited_time": "t9"}})
+    manager = LeaseManager(notion, owner="me", settle_seconds=0)
+
+    assert not manager.claim({"id": "a", "last_edited_time": "t0"})
+
+
+def test_run_fused_skips_items_claimed_elsewhere(monkeypatch):
+    from src.ingest import run_fused
+
+    class Claims:
+        async def claim_async(self, page, offload):
+            return page["id"] != "taken"
+
+    processed = []
+
+    async def fake_fused(page, notion, cdp_url, routed, note_sequence=1, session=None, journal=None, retries=None, *rest):
+        processed.append(page["id"])
+        return "success"
+
+    monkeypatch.setattr("src.ingest.classify_item", lambda page, notion: (None, ""))
+    monkeypatch.setattr("src.ingest.process_item_fused", fake_fused)
+
+    pages = [{"id": "mine"}, {"id": "taken"}]
+    counts = asyncio.run(run_fused(pages, FakeNotion({}), "cdp", workers=2, lease=Claims()))
+
+    assert processed == ["mine"]
+    assert counts["success"] == 1
+
+
+def test_retry_releases_lease_at_due_time(monkeypatch, tmp_path):
+    from src.ingest import run_fused
+    from src.retry import RetryQueue
+
+    notion = FakeNotion({"a": {"id": "a", "status": "pending", "lease": "", "last_edited_time": "t0"}})
+    manager = LeaseManager(notion, owner="me", settle_seconds=0)
+    queue = RetryQueue(tmp_path / "state.db", base_seconds=600)
+
+    async def fake_fused(page, notion, cdp_url, routed, note_sequence=1, session=None, journal=None, retries=None, *rest):
+        retries.defer(page["id"], "timed out")
+        return "retry"
+
+    monkeypatch.setattr("src.ingest.classify_item", lambda page, notion: (None, ""))
+    monkeypatch.setattr("src.ingest.process_item_fused", fake_fused)
+
+    counts = asyncio.run(run_fused([{"id": "a", "last_edited_time": "t0"}], notion, "cdp", lease=manager, retries=queue))
+
+    assert counts["retry"] == 1
+    lease = Lease.parse(notion.pages["a"]["lease"])
+    assert lease.expires_at == datetime.fromtimestamp(queue.due_at("a"), timezone.utc).replace(microsecond=0)
+    # Another node may take the page over once the backoff is due, not before
+    other = LeaseManager(notion, owner="other", settle_seconds=0)
+    assert not other.claim(notion.get_page("a"))
+    notion.pages["a"]["lease"] = Lease("me", datetime.now(timezone.utc) - timedelta(seconds=1)).format()
+    assert other.claim(notion.get_page("a"))
+    queue.close()
+
+
+def test_async_claims_settle_without_holding_notion_threads():
+    import time
+
+    from src.notion_async import AsyncNotion
+
+    pages = {pid: {"id": pid, "status": "pending", "lease": "", "last_edited_time": "t0"} for pid in "abc"}
+    notion = FakeNotion(pages)
+    manager = LeaseManager(notion, owner="me", settle_seconds=0.1)
+
+    async def _run():
+        async with AsyncNotion(notion, max_workers=1) as notion_io:
+            started = time.monotonic()
+            won = await asyncio.gather(
+                *(manager.claim_async({"id": pid, "last_edited_time": "t0"}, notion_io.run) for pid in "abc")
+            )
+            return won, time.monotonic() - started
+
+    won, elapsed = asyncio.run(_run())
+
+    assert won == [True, True, True]
+    # Three settles overlap even though the Notion pool has a single thread
+    assert elapsed < 0.25
@@ -1,3 +1,6 @@
+import httpx
+from notion_client.errors import APIResponseError
+
 from src.notion import NotionManager
 
 
@@ -6,3 +9,224 @@ def test_notion_manager_imports(monkeypatch):
     monkeypatch.setenv("NOTION_ITEM_DB_ID", "dummy")
     nm = NotionManager()
     assert nm is not None
+
+
+def _manager(monkeypatch):
+    monkeypatch.setenv("NOTION_TOKEN", "dummy")
+    monkeypatch.setenv("NOTION_ITEM_DB_ID", "dummy")
+    monkeypatch.setenv("NOTION_SCHEMA_CACHE", "false")
+    nm = NotionManager()
+    bodies = []
+    nm._query = lambda body: bodies.append(body) or {"results": []}
+    return nm, bodies
+
+
+def test_pending_query_limits_parked_items_to_recent_edits(monkeypatch):
+    nm, bodies = _manager(monkeypatch)
+
+    nm.get_pending_tasks(parked_since="2025-01-15T00:00:00+00:00")
+
+    clauses = bodies[0]["filter"]["or"]
+    parked = [c for c in clauses if "and" in c]
+    assert len(parked) == 1
+    assert parked[0]["and"][0]["select"]["equals"] == nm.status.unprocessed
+    assert parked[0]["and"][1]["last_edited_time"] == {"on_or_after": "2025-01-15T00:00:00+00:00"}
+
+
+def _paged(pages):
+    """Fake _query serving ``pages`` in cursor-linked chunks; records each request body."""
+    bodies = []
+
+    def _query(body):
+        bodies.append(body)
+        start = int(body.get("start_cursor") or 0)
+        end = start + body["page_size"]
+        return {
+            "results": pages[start:end],
+            "has_more": end < len(pages),
+            "next_cursor": str(end) if end < len(pages) else None,
+        }
+
+    return _query, bodies
+
+
+def test_iter_query_follows_cursor_lazily(monkeypatch):
+    nm, _ = _manager(monkeypatch)
+    nm._query, bodies = _paged([{"id": f"p{i}", "properties": {}} for i in range(5)])
+
+    rows = nm.iter_query({"filter": {"x": 1}}, page_size=2)
+    assert next(rows)["id"] == "p0"
+    assert len(bodies) == 1
+
+    assert [row["id"] for row in rows] == ["p1", "p2", "p3", "p4"]
+    assert [body.get("start_cursor") for body in bodies] == [None, "2", "4"]
+    assert all(body["filter"] == {"x": 1} for body in bodies)
+
+
+def test_pending_tasks_are_not_capped_at_one_query_page(monkeypatch):
+    nm, _ = _manager(monkeypatch)
+    nm._query, bodies = _paged([{"id": f"p{i}", "properties": {}} for i in range(250)])
+
+    pending = nm.get_pending_tasks()
+
+    assert len(pending) == 250
+    assert len(bodies) == 3
+
+
+def test_reporting_iter_query_pages_through_reports(monkeypatch):
+    from src.reporting.notion_reporting import ReportingDBManager
+
+    monkeypatch.setenv("NOTION_TOKEN", "dummy")
+    monkeypatch.setenv("NOTION_REPORTING_DB_ID", "dummy")
+    manager = ReportingDBManager()
+    manager._query, bodies = _paged([{"id": f"r{i}", "properties": {}} for i in range(3)])
+
+    assert [r["id"] for r in manager.iter_query({"filter": {}}, page_size=2)] == ["r0", "r1", "r2"]
+    assert len(bodies) == 2
+
+
+def _response(status):
+    return httpx.Response(status, request=httpx.Request("PATCH", "https://api.notion.com/v1/pages/x"))
+
+
+class _RecordingPages:
+    def __init__(self, fail_status_type=False, fail_reason=False):
+        self.updates = []
+        self.fail_status_type = fail_status_type
+        self.fail_reason = fail_reason
+
+    def update(self, page_id, properties):
+        if self.fail_status_type and any("status" in v for v in properties.values() if isinstance(v, dict)):
+            raise ValueError("Status is not a status property")
+        if self.fail_reason and "Reason" in properties:
+            raise APIResponseError(_response(400), "Reason is not a property that exists.", "validation_error")
+        self.updates.append((page_id, properties))
+
+
+def _writer(monkeypatch, **kwargs):
+    nm, _ = _manager(monkeypatch)
+    pages = _RecordingPages(**kwargs)
+    nm.client = type("FakeClient", (), {"pages": pages})()
+    return nm, pages
+
+
+def test_unit_of_work_coalesces_item_writes(monkeypatch):
+    nm, pages = _writer(monkeypatch)
+
+    with nm.unit_of_work("p1"):
+        nm.set_item_type("p1", "url_resource")
+        nm.set_content_type("p1", "html")
+        nm.set_title("p1", "First", note="Backfilled Name from URL")
+        with nm.unit_of_work("p1"):
+            nm.mark_as_done("p1", "summary")
+        nm.set_title("p1", "Second")
+        nm.set_item_type("other", "note_content")
+        assert len(pages.updates) == 1  # only the page outside the unit
+
+    assert len(pages.updates) == 2
+    page_id, props = pages.updates[1]
+    assert page_id == "p1"
+    assert props["Name"]["title"][0]["text"]["content"] == "Second"
+    assert props["ItemType"]["select"]["name"] == "url_resource"
+    assert props["ContentType"]["select"]["name"] == "html"
+    assert props["Status"] == {"status": {"name": "ready"}}
+    assert "Reason" in props
+
+
+def test_unit_of_work_flushes_on_error_and_at_checkpoints(monkeypatch):
+    nm, pages = _writer(monkeypatch)
+
+    try:
+        with nm.unit_of_work("p1"):
+            nm.set_item_type("p1", "url_resource")
+            nm.flush("p1")
+            assert len(pages.updates) == 1
+            nm.set_content_type("p1", "pdf")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert [list(props) for _, props in pages.updates] == [["ItemType"], ["ContentType"]]
+
+
+def test_coalesced_flush_keeps_status_and_reason_fallbacks(monkeypatch):
+    nm, pages = _writer(monkeypatch, fail_status_type=True, fail_reason=True)
+
+    with nm.unit_of_work("p1"):
+        nm.mark_as_error("p1", "fetch failed")
+
+    (_, props), = pages.updates
+    assert props["Status"] == {"select": {"name": "Error"}}
+    assert "Reason" not in props
+
+
+def test_low_confidence_done_writes_settled_marker_with_status(monkeypatch):
+    from src.notion import SETTLED_NOTE
+
+    nm, pages = _writer(monkeypatch)
+
+    nm.set_classification("p1", [], "public", 0.2, "r1", "p1", canonical_url="https://example.com/a")
+    nm.mark_as_done("p1", "summary", status="pending")
+    nm.mark_as_done("p2", "summary")
+
+    classified, pending, ready = (props for _, props in pages.updates)
+    assert classified["Reason"] == {"rich_text": []}
+    assert pending["Status"] == {"status": {"name": "pending"}}
+    assert pending["Reason"]["rich_text"][0]["text"]["content"] == SETTLED_NOTE
+    assert "Reason" not in ready
+
+
+def test_create_item_takes_content_type_from_url_extension(monkeypatch):
+    nm, _ = _manager(monkeypatch)
+    created = []
+
+    class Pages:
+        def create(self, parent, properties):
+            created.append(properties)
+            return {"id": f"n{len(created)}", "properties": {}}
+
+    nm.client = type("FakeClient", (), {"pages": Pages()})()
+
+    nm.create_item("https://example.com/paper.pdf", "Paper")
+    nm.create_item("https://example.com/post", "Post")
+
+    assert created[0]["ContentType"] == {"select": {"name": "pdf"}}
+    assert "ContentType" not in created[1]
+
+
+def test_after_write_waits_for_the_coalesced_update(monkeypatch):
+    nm, pages = _writer(monkeypatch)
+    done = []
+
+    nm.after_write("p0", lambda: done.append("p0"))  # no unit: nothing pending
+    with nm.unit_of_work("p1"):
+        nm.mark_as_done("p1", "summary")
+        nm.after_write("p1", lambda: done.append("p1"))
+        assert done == ["p0"]
+    assert done == ["p0", "p1"]
+
+    def fail(page_id, properties):
+        raise RuntimeError("network")
+
+    pages.update = fail
+    try:
+        with nm.unit_of_work("p2"):
+            nm.set_item_type("p2", "url_resource")
+            nm.after_write("p2", lambda: done.append("p2"))
+    except RuntimeError:
+        pass
+    assert done == ["p0", "p1"]
+
+
+def test_items_for_date_are_streamed(monkeypatch):
+    from datetime import date
+
+    nm, _ = _manager(monkeypatch)
+    nm._query, bodies = _paged([{"id": f"p{i}", "properties": {}} for i in range(250)])
+
+    items = nm.fetch_items_for_date(date(2025, 1, 15), status_filter="ready")
+    assert bodies == []
+    assert next(items)["id"] == "p0"
+    assert len(bodies) == 1
+    assert sum(1 for _ in items) == 249
+    assert len(bodies) == 3
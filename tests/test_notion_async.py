@@ -0,0 +1,95 @@
+"""Tests for the thread-pool facade over the blocking Notion managers."""
+import asyncio
+import threading
+import time
+
+from src.notion_async import AsyncNotion
+
+
+class BlockingManager:
+    status = "status-names"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def mark_as_done(self, page_id, summary, status=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.calls.append((page_id, summary, status))
+        return page_id
+
+
+def test_methods_become_awaitable_and_attributes_pass_through():
+    manager = BlockingManager()
+
+    async def _run():
+        async with AsyncNotion(manager, max_workers=2) as notion_io:
+            result = await notion_io.mark_as_done("p1", "summary", status="ready")
+            return result, notion_io.status, notion_io.stats.calls
+
+    result, status, calls = asyncio.run(_run())
+
+    assert result == "p1"
+    assert status == "status-names"
+    assert calls == 1
+    assert manager.calls == [("p1", "summary", "ready")]
+    assert all(name.startswith("notion") for name in manager.threads)
+
+
+def test_pool_bounds_concurrency_and_records_queue_wait():
+    manager = BlockingManager(delay=0.02)
+
+    async def _run():
+        async with AsyncNotion(manager, max_workers=2) as notion_io:
+            await asyncio.gather(*(notion_io.mark_as_done(f"p{i}", "s") for i in range(6)))
+            return notion_io.stats
+
+    stats = asyncio.run(_run())
+
+    assert manager.peak == 2
+    assert stats.calls == 6
+    # Six calls through two threads: the last pair waited for two rounds
+    assert stats.wait_max >= 0.03
+    assert 0 < stats.wait_avg < stats.wait_max
+
+
+def test_run_offloads_helpers_without_blocking_the_loop():
+    manager = BlockingManager(delay=0.05)
+    ticks = []
+
+    def helper(notion, page_id):
+        return notion.mark_as_done(page_id, "via helper")
+
+    async def _ticker():
+        for _ in range(3):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def _run():
+        async with AsyncNotion(manager, max_workers=1) as notion_io:
+            return await asyncio.gather(notion_io.run(helper, manager, "p1"), _ticker())
+
+    result, _ = asyncio.run(_run())
+
+    assert result == "p1"
+    assert len(ticks) == 3
+    assert ticks[-1] - ticks[0] < 0.05
+
+
+def test_pool_size_reads_env(monkeypatch):
+    monkeypatch.setenv("NOTION_MAX_WORKERS", "5")
+    notion_io = AsyncNotion(BlockingManager())
+    try:
+        assert notion_io.max_workers == 5
+    finally:
+        notion_io.close()
@@ -0,0 +1,106 @@
+"""Tests for Notion request pacing and 429 handling."""
+from datetime import datetime, timezone
+
+import httpx
+from notion_client import Client
+
+from src.notion_rate import RateLimitedTransport, RateLimitStats, retry_after_seconds
+from src.ratelimit import SQLiteTokenBucket, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _replies(*statuses, retry_after="2"):
+    """MockTransport answering with ``statuses`` in order; returns (transport, request count list)."""
+    sent = []
+
+    def handler(request):
+        status = statuses[min(len(sent), len(statuses) - 1)]
+        sent.append(request)
+        headers = {"Retry-After": retry_after} if status == 429 and retry_after else {}
+        body = {"object": "error", "status": 429, "code": "rate_limited", "message": "slow down"}
+        return httpx.Response(status, headers=headers, json=body if status == 429 else {"object": "list"})
+
+    return httpx.MockTransport(handler), sent
+
+
+def test_requests_are_paced_by_the_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(120, capacity=1, clock=clock, sleep=clock.sleep)
+    inner, sent = _replies(200)
+    stats = RateLimitStats()
+    client = httpx.Client(transport=RateLimitedTransport(bucket, inner=inner, stats=stats))
+
+    for _ in range(3):
+        client.get("https://api.notion.com/v1/users")
+
+    assert len(sent) == 3
+    assert clock.slept == [0.5, 0.5]
+    assert stats.requests == 3
+    assert stats.wait_total == 1.0
+
+
+def test_429_pauses_bucket_and_retries_after_delay():
+    clock = FakeClock()
+    bucket = TokenBucket(0, clock=clock, sleep=clock.sleep)
+    inner, sent = _replies(429, 200)
+    stats = RateLimitStats()
+    transport = RateLimitedTransport(bucket, max_retries=3, inner=inner, stats=stats)
+    notion = Client(auth="dummy", client=httpx.Client(transport=transport))
+
+    assert notion.request(path="users", method="GET") == {"object": "list"}
+
+    assert len(sent) == 2
+    assert clock.slept == [2.0]
+    assert stats.throttled == 1
+    assert stats.wait_max == 2.0
+
+
+def test_429_reaches_caller_after_max_retries():
+    clock = FakeClock()
+    bucket = TokenBucket(0, clock=clock, sleep=clock.sleep)
+    inner, sent = _replies(429, retry_after=None)
+    client = httpx.Client(transport=RateLimitedTransport(bucket, max_retries=2, inner=inner))
+
+    response = client.get("https://api.notion.com/v1/users")
+
+    assert response.status_code == 429
+    assert len(sent) == 3
+    assert clock.slept == [1.0, 1.0]
+
+
+def test_retry_after_parsing():
+    now = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    assert retry_after_seconds("3") == 3.0
+    assert retry_after_seconds("Wed, 01 Jan 2025 12:00:05 GMT", now=now) == 5.0
+    assert retry_after_seconds(None) == 1.0
+    assert retry_after_seconds("soon") == 1.0
+
+
+def test_sqlite_bucket_is_shared_between_instances(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "state.db"
+    first = SQLiteTokenBucket("notion", 60, capacity=1, path=path, clock=clock, sleep=clock.sleep)
+    second = SQLiteTokenBucket("notion", 60, capacity=1, path=path, clock=clock, sleep=clock.sleep)
+    try:
+        assert first.acquire() == 0
+        # The token taken through ``first`` is gone for ``second`` too
+        assert second.acquire() == 1.0
+
+        second.pause(5)
+        assert first.acquire() == 5.0
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,111 @@
+"""Tests for the Notion schema probe and its on-disk cache."""
+import httpx
+from notion_client.errors import APIResponseError
+
+from src.notion import NotionManager
+from src.notion_schema import NotionSchema, SchemaCache, probe_schema
+
+
+def _api_error(code, status=400):
+    response = httpx.Response(status, request=httpx.Request("POST", "https://api.notion.com/v1/x"))
+    return APIResponseError(response, f"{code} error", code)
+
+
+class FakeClient:
+    """Records every request; ``data_sources/*`` can be made unsupported."""
+
+    def __init__(self, status_type="select", data_source_supported=True):
+        self.requests = []
+        self.status_type = status_type
+        self.data_source_supported = data_source_supported
+        self.pages = self
+
+    def request(self, path, method, body=None):
+        self.requests.append((method, path))
+        if path.startswith("data_sources/") and not self.data_source_supported:
+            raise _api_error("invalid_request_url")
+        if method == "get":
+            return {"properties": {"Status": {"type": self.status_type}, "Name": {"type": "title"}}}
+        return {"results": [], "has_more": False}
+
+    def update(self, page_id, properties):
+        value = properties["Status"]
+        if self.status_type not in value:
+            raise _api_error("validation_error")
+        self.requests.append(("patch", f"pages/{page_id}"))
+
+
+def _manager(monkeypatch, tmp_path, client, data_source="ds1"):
+    monkeypatch.setenv("NOTION_TOKEN", "dummy")
+    monkeypatch.setenv("NOTION_ITEM_DB_ID", "db1")
+    monkeypatch.setenv("NOTION_ITEM_DS_ID", data_source)
+    monkeypatch.setenv("STATE_DIR", str(tmp_path))
+    nm = NotionManager()
+    nm.client = client
+    return nm
+
+
+def test_probe_prefers_data_source_and_reads_status_type():
+    schema = probe_schema(FakeClient("status"), "db1", "ds1", "Status")
+
+    assert schema == NotionSchema(query_path="data_sources/ds1/query", status_type="status")
+
+
+def test_probe_falls_back_to_database_endpoint():
+    client = FakeClient("select", data_source_supported=False)
+
+    schema = probe_schema(client, "db1", "ds1", "Status")
+
+    assert schema == NotionSchema(query_path="databases/db1/query", status_type="select")
+    assert client.requests == [("get", "data_sources/ds1"), ("get", "databases/db1")]
+
+
+def test_cache_expires_after_ttl(tmp_path):
+    now = [1000.0]
+    cache = SchemaCache(tmp_path / "state.db", ttl_seconds=60, clock=lambda: now[0])
+    try:
+        cache.put("k", NotionSchema("databases/db1/query", "select"))
+        assert cache.get("k").status_type == "select"
+        now[0] += 61
+        assert cache.get("k") is None
+    finally:
+        cache.close()
+
+
+def test_status_writes_and_queries_take_one_request(monkeypatch, tmp_path):
+    client = FakeClient("select", data_source_supported=False)
+    nm = _manager(monkeypatch, tmp_path, client)
+
+    nm.get_pending_tasks()
+    nm.mark_as_done("p1", "summary")
+    nm.mark_as_done("p2", "summary")
+
+    assert client.requests == [
+        ("get", "data_sources/ds1"),
+        ("get", "databases/db1"),
+        ("post", "databases/db1/query"),
+        ("patch", "pages/p1"),
+        ("patch", "pages/p2"),
+    ]
+
+    # A second manager (next run) reuses the cached probe
+    second = FakeClient("select", data_source_supported=False)
+    _manager(monkeypatch, tmp_path, second).mark_as_done("p3", "summary")
+    assert second.requests == [("patch", "pages/p3")]
+
+
+def test_stale_schema_falls_back_and_is_invalidated(monkeypatch, tmp_path):
+    nm = _manager(monkeypatch, tmp_path, FakeClient("status"))
+    nm.mark_as_done("p1", "summary")
+
+    # The Status property was changed to a select since the probe was cached
+    client = FakeClient("select")
+    nm = _manager(monkeypatch, tmp_path, client)
+    nm.mark_as_done("p2", "summary")
+
+    assert client.requests[-1] == ("patch", "pages/p2")
+    cache = SchemaCache(tmp_path / "state.db")
+    try:
+        assert cache.get("db1:ds1:Status") is None
+    finally:
+        cache.close()
@@ -0,0 +1,207 @@
+"""Tests for the staged ingest pipeline."""
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+
+from src.browser import RenderedPage
+from src.pipeline import Outcome, Stage, run_pipeline
+
+
+def test_pipeline_runs_items_through_all_stages():
+    async def double(x):
+        return x * 2
+
+    async def finish(x):
+        return Outcome("even" if x % 4 == 0 else "odd")
+
+    async def on_error(stage, payload, exc):
+        return "error"
+
+    result = asyncio.run(run_pipeline(range(6), [Stage("double", double, 2), Stage("finish", finish)], on_error))
+
+    assert sorted(result.outcomes) == sorted(["even", "odd", "even", "odd", "even", "odd"])
+    assert result.stages["double"].processed == 6
+    assert result.stages["finish"].processed == 6
+
+
+def test_pipeline_early_outcome_skips_later_stages():
+    seen = []
+
+    async def gate(x):
+        return Outcome("skipped") if x == 0 else x
+
+    async def finish(x):
+        seen.append(x)
+        return Outcome("done")
+
+    async def on_error(stage, payload, exc):
+        return "error"
+
+    result = asyncio.run(run_pipeline([0, 1, 2], [Stage("gate", gate), Stage("finish", finish)], on_error))
+
+    assert sorted(result.outcomes) == ["done", "done", "skipped"]
+    assert sorted(seen) == [1, 2]
+
+
+def test_pipeline_isolates_stage_errors():
+    failures = []
+
+    async def maybe_fail(x):
+        if x == 2:
+            raise ValueError("bad item")
+        return x
+
+    async def finish(x):
+        return Outcome("ok")
+
+    async def on_error(stage, payload, exc):
+        failures.append((stage, payload, str(exc)))
+        return "error"
+
+    result = asyncio.run(run_pipeline([1, 2, 3], [Stage("work", maybe_fail), Stage("finish", finish)], on_error))
+
+    assert sorted(result.outcomes) == ["error", "ok", "ok"]
+    assert failures == [("work", 2, "bad item")]
+
+
+def test_pipeline_bounded_queue_applies_backpressure():
+    in_flight = {"now": 0, "peak": 0}
+    release = None
+
+    async def produce(x):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        return x
+
+    async def slow_consume(x):
+        await release.wait()
+        in_flight["now"] -= 1
+        return Outcome("ok")
+
+    async def on_error(stage, payload, exc):
+        return "error"
+
+    async def _run():
+        nonlocal release
+        release = asyncio.Event()
+        task = asyncio.create_task(
+            run_pipeline(range(20), [Stage("produce", produce, 4), Stage("consume", slow_consume, 1)], on_error, queue_size=2)
+        )
+        await asyncio.sleep(0.05)
+        peak_while_blocked = in_flight["peak"]
+        release.set()
+        result = await task
+        return peak_while_blocked, result
+
+    peak_while_blocked, result = asyncio.run(_run())
+
+    # queue (2) + one item held by each blocked worker (4 producers + 1 consumer)
+    assert peak_while_blocked <= 2 + 4 + 1
+    assert len(result.outcomes) == 20
+
+
+class FakeNotion:
+    def __init__(self):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready"})()
+        self.marked = []
+        self.classified = []
+
+    def find_by_canonical(self, canonical_url):
+        return None
+
+    def set_duplicate_of(self, page_id, canonical_id, note):
+        self.marked.append(("duplicate", page_id))
+
+    def set_classification(self, **kwargs):
+        self.classified.append(kwargs["page_id"])
+
+    def mark_as_done(self, page_id, summary, status=None):
+        self.marked.append(("done", page_id, summary))
+
+    def mark_unprocessed(self, page_id, note):
+        self.marked.append(("unprocessed", page_id))
+
+    def mark_as_error(self, page_id, note):
+        self.marked.append(("error", page_id, note))
+
+    def set_title(self, page_id, title, note=None):
+        self.marked.append(("set_title", page_id, title))
+
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
+
+def test_run_ingest_pipeline_end_to_end(monkeypatch):
+    from src.ingest import run_ingest_pipeline
+
+    fake = FakeNotion()
+
+    async def fake_render(url, cdp_url, session=None):
+        if url.endswith("/empty"):
+            return RenderedPage(url=url, html="<html></html>")
+        return RenderedPage(url=url, html=f"<p>{url}</p>")
+
+    def fake_extract(rendered):
+        return None if rendered.url.endswith("/empty") else f"text of {rendered.url}"
+
+    monkeypatch.setattr("src.ingest.fetch_rendered_page", fake_render)
+    monkeypatch.setattr("src.ingest.extract_text", fake_extract)
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": f"summary: {text}"})
+
+    pages = [{"id": str(i), "title": "Named", "url": f"https://example.com/{i}", "attachments": []} for i in range(4)]
+    pages.append({"id": "e", "title": "Named", "url": "https://example.com/empty", "attachments": []})
+    pages.append({"id": "a", "url": None, "attachments": ["https://example.com/a.png"]})
+
+    counts = asyncio.run(run_ingest_pipeline(pages, fake, "cdp", workers=2))
+
+    assert counts == {"success": 4, "error": 1, "duplicate": 0, "unprocessed": 1, "deferred": 0, "retry": 0}
+    assert sorted(fake.classified) == ["0", "1", "2", "3"]
+    assert ("error", "e", "no content") in fake.marked
+    assert ("done", "2", "summary: text of https://example.com/2") in fake.marked
+
+
+def test_pipeline_write_stage_coalesces_and_journals_after_the_update(monkeypatch, tmp_path):
+    from src.ingest import run_ingest_pipeline
+    from src.journal import RunJournal
+    from src.notion import NotionManager
+
+    monkeypatch.setenv("NOTION_TOKEN", "dummy")
+    monkeypatch.setenv("NOTION_ITEM_DB_ID", "dummy")
+    monkeypatch.setenv("NOTION_SCHEMA_CACHE", "false")
+    notion = NotionManager()
+    journal = RunJournal(tmp_path / "state.db")
+    updates = []
+
+    class Pages:
+        def update(self, page_id, properties):
+            # Nothing is journaled as written before Notion has the update
+            updates.append((page_id, dict(journal.progress(page_id))))
+
+    notion.client = type("FakeClient", (), {"pages": Pages()})()
+    notion.find_by_canonical = lambda canonical_url: None
+
+    async def fake_render(url, cdp_url, session=None):
+        return RenderedPage(url=url, html="<p>x</p>")
+
+    monkeypatch.setattr("src.ingest.fetch_rendered_page", fake_render)
+    monkeypatch.setattr("src.ingest.extract_text", lambda rendered: "body text")
+    monkeypatch.setattr("src.ingest.classify", lambda text: {"tags": [], "sensitivity": "public", "confidence": 0.9})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "summary"})
+
+    page = {"id": "p1", "title": "Named", "url": "https://example.com/1", "attachments": []}
+    counts = asyncio.run(run_ingest_pipeline([page], notion, "cdp", journal=journal))
+
+    assert counts["success"] == 1
+    assert len(updates) == 1
+    assert "classified" not in updates[0][1]
+    assert journal.progress("p1") == {}  # attempt closed once the update went out
+    journal.close()
@@ -1,4 +1,6 @@
 """Tests for preprocessing with smart routing."""
+from contextlib import asynccontextmanager, contextmanager
+
 import pytest
 
 from src import preprocess
@@ -48,6 +50,18 @@ class StubNotion:
         """Return configurable result for content block check."""
         return self._has_blocks
 
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
 
 # Default mock for content type detection (always returns HTML)
 def _mock_detect_content_type_html(url, timeout=5.0):
@@ -455,3 +469,175 @@ def test_image_clip_name_gets_renamed_to_note():
     # Should have a new NOTE-xxx title
     assert "img2" in notion.titles
     assert notion.titles["img2"]["title"].startswith("NOTE-")
+
+
+def test_preprocess_item_async_uses_async_fetchers(monkeypatch):
+    import asyncio
+
+    notion = StubNotion()
+    session = object()
+    calls = []
+
+    async def fake_detect(url, client=None):
+        calls.append(("detect", client))
+        return (ContentType.HTML, "mocked")
+
+    async def fake_title(url, cdp, session=None):
+        calls.append(("title", session))
+        return "Async Title"
+
+    monkeypatch.setattr(preprocess, "detect_content_type", fake_detect)
+    monkeypatch.setattr(preprocess, "fetch_title_from_url_async", fake_title)
+
+    page = {"id": "a1", "title": "", "url": "https://example.com/post"}
+    result = asyncio.run(preprocess.preprocess_item_async(page, notion, "cdp", session=session, http_client="client"))
+
+    assert result["action"] == "backfilled"
+    assert notion.titles["a1"]["title"] == "Async Title"
+    assert notion.item_types["a1"] == "url_resource"
+    assert calls == [("detect", "client"), ("title", session)]
+
+
+# ============================================================
+# Idempotent preprocess
+# ============================================================
+
+def _routed_page(**overrides):
+    page = {
+        "id": "r1",
+        "title": "Readable title",
+        "url": "https://example.com/post",
+        "attachments": [],
+        "item_type": "url_resource",
+        "content_type": "html",
+    }
+    page.update(overrides)
+    return page
+
+
+def test_already_routed_item_is_skipped_without_writes(monkeypatch):
+    notion = StubNotion()
+
+    def fail_detect(url, timeout=5.0):
+        raise AssertionError("routed items must not be re-detected")
+
+    monkeypatch.setattr(preprocess, "detect_content_type_sync", fail_detect)
+
+    result = preprocess.preprocess_item(_routed_page(), notion, "cdp")
+
+    assert result["action"] == "skip"
+    assert result["reason"] == "already routed"
+    assert notion.item_types == {}
+    assert notion.content_types == {}
+
+
+def test_reroute_forces_routing_again():
+    notion = StubNotion()
+
+    result = preprocess.preprocess_item(_routed_page(), notion, "cdp", reroute=True)
+
+    assert result["action"] == "skip"
+    assert notion.item_types["r1"] == "url_resource"
+    assert notion.content_types["r1"] == "html"
+
+
+def test_changed_url_or_missing_fields_are_rerouted():
+    assert preprocess.is_already_routed(_routed_page())
+    assert preprocess.is_already_routed(_routed_page(canonical_url="https://example.com/post"))
+    assert not preprocess.is_already_routed(_routed_page(canonical_url="https://example.com/old"))
+    assert not preprocess.is_already_routed(_routed_page(content_type=None))
+    assert not preprocess.is_already_routed(_routed_page(item_type="note_content"))
+    assert not preprocess.is_already_routed(_routed_page(title=""))
+
+
+# ============================================================
+# Concurrent preprocess
+# ============================================================
+
+def _note(page_id, created, title=""):
+    return {"id": page_id, "title": title, "url": None, "attachments": [], "raw_content": "", "created_date": created}
+
+
+def _concurrent_pages():
+    # Newest first, as get_pending_tasks lists them
+    return [
+        _note("n3", "2025-01-03T00:00:00.000Z"),
+        _note("named", "2025-01-02T12:00:00.000Z", title="Meeting notes"),
+        _note("undated", None),
+        _note("n1", "2025-01-01T00:00:00.000Z"),
+        _note("n2", "2025-01-02T00:00:00.000Z"),
+        _routed_page(id="r1"),
+    ]
+
+
+def test_concurrent_batch_numbers_notes_by_created_date(monkeypatch):
+    import threading
+    import time
+
+    notion = StubNotion()
+    notion._has_blocks = True
+    threads = set()
+
+    def slow_set_item_type(page_id, item_type):
+        threads.add(threading.current_thread().name)
+        # Later-listed items finish first, so completion order differs from list order
+        time.sleep(0.01 * (6 - int(page_id[-1])) if page_id[-1].isdigit() else 0)
+        notion.item_types[page_id] = item_type
+
+    monkeypatch.setattr(notion, "set_item_type", slow_set_item_type)
+
+    stats = preprocess.preprocess_batch(_concurrent_pages(), notion, "cdp", workers=3)
+
+    assert stats == {"backfilled": 0, "error": 0, "skip": 1, "ready": 5, "unprocessed": 0}
+    names = {page_id: entry["title"].rsplit("-", 1)[1] for page_id, entry in notion.titles.items()}
+    assert names == {"n1": "1", "n2": "2", "n3": "3", "undated": "4"}
+    assert "r1" not in notion.item_types
+    assert len(threads) > 1
+
+
+def test_concurrent_async_batch_matches_thread_pool():
+    import asyncio
+
+    notion = StubNotion()
+    notion._has_blocks = True
+
+    stats = asyncio.run(preprocess.preprocess_batch_async(_concurrent_pages(), notion, "cdp", workers=2))
+
+    assert stats["ready"] == 5
+    assert stats["skip"] == 1
+    names = {page_id: entry["title"].rsplit("-", 1)[1] for page_id, entry in notion.titles.items()}
+    assert names == {"n1": "1", "n2": "2", "n3": "3", "undated": "4"}
+
+
+def test_concurrent_routing_failure_leaves_item_untouched(monkeypatch):
+    notion = StubNotion()
+
+    def flaky_blocks(page_id):
+        if page_id == "bad":
+            raise RuntimeError("notion 502")
+        return True
+
+    monkeypatch.setattr(notion, "has_page_blocks", flaky_blocks)
+    pages = [_note("bad", "2025-01-01T00:00:00.000Z"), _note("good", "2025-01-02T00:00:00.000Z")]
+
+    stats = preprocess.preprocess_batch(pages, notion, "cdp", workers=2)
+
+    assert stats["error"] == 1
+    assert stats["ready"] == 1
+    assert "bad" not in notion.item_types
+    assert "bad" not in notion.errors
+    assert notion.titles["good"]["title"].endswith("-1")
+
+
+def test_preprocess_workers_env_selects_concurrent_mode(monkeypatch):
+    monkeypatch.setenv("PREPROCESS_WORKERS", "2")
+    notion = StubNotion()
+    notion._has_blocks = True
+
+    pages = [_note("n3", "2025-01-03T00:00:00.000Z"), _note("n1", "2025-01-01T00:00:00.000Z")]
+
+    preprocess.preprocess_batch(pages, notion, "cdp")
+
+    # Serial mode would number in list order (newest first)
+    assert notion.titles["n1"]["title"].endswith("-1")
+    assert notion.titles["n3"]["title"].endswith("-2")
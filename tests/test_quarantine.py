@@ -0,0 +1,84 @@
+"""Tests for poison-URL quarantine."""
+from src.browser import PageTimeoutError
+from src.ingest import _list_pending, process_item
+from src.quarantine import Quarantine
+
+
+class FakeNotion:
+    def __init__(self, pages=None):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready", "unprocessed": "unprocessed"})()
+        self.pages = pages or []
+        self.marked = []
+
+    def get_pending_tasks(self, **query):
+        return self.pages
+
+    def find_by_canonical(self, canonical_url):
+        return None
+
+    def mark_as_error(self, page_id, note):
+        self.marked.append((page_id, note))
+
+
+def test_consecutive_failures_quarantine_and_success_resets(tmp_path):
+    quarantine = Quarantine(tmp_path / "state.db", threshold=2)
+
+    assert not quarantine.record_failure("https://a.example/x", "p1", "timeout")
+    quarantine.record_success("https://a.example/x")
+    assert not quarantine.record_failure("https://a.example/x", "p1", "timeout")
+    assert quarantine.record_failure("https://a.example/x", "p2", "timeout")
+    # Already quarantined: later failures do not report a new quarantine
+    assert not quarantine.record_failure("https://a.example/x", "p2", "timeout")
+
+    [entry] = quarantine.entries()
+    assert entry.canonical_url == "https://a.example/x"
+    assert entry.failures == 3
+    assert entry.page_id == "p2"
+    assert quarantine.release("https://a.example/x") == 1
+    assert not quarantine.is_quarantined("https://a.example/x")
+    quarantine.close()
+
+
+def test_poison_url_is_marked_error_and_left_out_of_listings(monkeypatch, tmp_path):
+    quarantine = Quarantine(tmp_path / "state.db", threshold=2)
+
+    async def hang(url, cdp_url):
+        raise PageTimeoutError("timed out after 15000ms")
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", hang)
+    page = {"id": "p1", "url": "https://example.com/hangs", "attachments": [], "status": "pending"}
+    notion = FakeNotion([page, {"id": "p2", "url": "https://example.com/fine", "attachments": []}])
+
+    assert process_item(page, notion, "cdp", quarantine=quarantine) == "error"
+    assert [p["id"] for p in _list_pending(notion, quarantine=quarantine)] == ["p1", "p2"]
+    assert process_item(page, notion, "cdp", quarantine=quarantine) == "error"
+
+    assert "quarantined" in notion.marked[-1][1]
+    assert [p["id"] for p in _list_pending(notion, quarantine=quarantine)] == ["p2"]
+    quarantine.close()
+
+
+def test_transient_failures_use_retries_before_counting_towards_quarantine(monkeypatch, tmp_path):
+    from src.retry import RetryQueue
+
+    quarantine = Quarantine(tmp_path / "state.db", threshold=3)
+    retries = RetryQueue(tmp_path / "state.db", max_attempts=5)
+
+    async def hang(url, cdp_url):
+        raise PageTimeoutError("timed out after 15000ms")
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", hang)
+    page = {"id": "p1", "url": "https://example.com/slow", "attachments": [], "status": "pending"}
+    notion = FakeNotion([page])
+
+    for _ in range(5):
+        assert process_item(page, notion, "cdp", retries=retries, quarantine=quarantine) == "retry"
+    assert not quarantine.is_quarantined("https://example.com/slow")
+    assert notion.marked == []
+
+    # The sixth failure exhausts the retries; only that one is counted
+    assert process_item(page, notion, "cdp", retries=retries, quarantine=quarantine) == "error"
+    assert "gave up after 5 retries" in notion.marked[-1][1]
+    assert not quarantine.is_quarantined("https://example.com/slow")
+    retries.close()
+    quarantine.close()
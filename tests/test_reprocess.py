@@ -0,0 +1,105 @@
+"""Tests for prompt-version reprocessing and its throttle."""
+from src.journal import RunJournal
+from src.llm import PROMPT_VERSION
+from src.ratelimit import TokenBucket
+from src.runners import run_reprocess
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 1.0
+    # Oversized requests wait for a full bucket and leave it in debt
+    assert bucket.acquire(5) == 2.0
+    assert bucket.acquire() == 4.0
+    assert TokenBucket(0).acquire(10 ** 6) == 0
+
+
+class FakeNotion:
+    def __init__(self, pages):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready"})()
+        self.pages = {p["id"]: p for p in pages}
+        self.summaries = []
+        self.queries = 0
+
+    def get_stale_ready(self, prompt_version):
+        self.queries += 1
+        return [dict(p) for p in self.pages.values() if p["prompt_version"] != prompt_version]
+
+    def set_summary(self, page_id, summary, prompt_version):
+        self.summaries.append((page_id, summary))
+        self.pages[page_id]["prompt_version"] = prompt_version
+
+    def set_classification(self, **kwargs):
+        raise AssertionError("reprocess must not rewrite classification or Raw Content")
+
+    def mark_as_done(self, page_id, summary, status=None):
+        raise AssertionError("reprocess must not change the status")
+
+
+def _page(page_id, raw="", url=None):
+    return {
+        "id": page_id,
+        "url": url or f"https://example.com/{page_id}",
+        "title": f"Title {page_id}",
+        "raw_content": raw,
+        "prompt_version": "prompt-old",
+    }
+
+
+def test_reprocess_uses_stored_text_and_throttles(monkeypatch, tmp_path):
+    journal = RunJournal(tmp_path / "state.db")
+    journal.record("a", "fetched", {"url": "https://example.com/a", "canonical": "c", "text": "full journaled text"})
+    journal.complete("a")
+    notion = FakeNotion([_page("a", raw="truncated"), _page("b", raw="raw only"), _page("c")])
+
+    async def no_fetch(*args, **kwargs):
+        raise AssertionError("reprocess must not fetch without --fetch-missing")
+
+    acquired = []
+
+    class Recorder:
+        def __init__(self, name):
+            self.name = name
+
+        def acquire(self, amount=1.0):
+            acquired.append((self.name, amount))
+            return 0.0
+
+    monkeypatch.setattr("src.runners.fetch_page_content", no_fetch)
+    monkeypatch.setattr("src.runners.generate_digest", lambda text: {"tldr": f"new summary of {text}"})
+
+    counts = run_reprocess(notion, PROMPT_VERSION, journal, Recorder("items"), Recorder("tokens"))
+
+    assert counts == {"reprocessed": 2, "skipped": 1, "error": 0}
+    assert notion.summaries == [("a", "new summary of full journaled text"), ("b", "new summary of raw only")]
+    assert notion.queries == 1
+    assert [name for name, _ in acquired] == ["items", "tokens", "items", "tokens"]
+    journal.close()
+
+
+def test_reprocess_dry_run_and_limit(monkeypatch):
+    notion = FakeNotion([_page("a", raw="x"), _page("b", raw="y"), _page("c", raw="z")])
+    monkeypatch.setattr("src.runners.generate_digest", lambda text: {"tldr": "s"})
+
+    assert run_reprocess(notion, PROMPT_VERSION, dry_run=True)["reprocessed"] == 3
+    assert notion.summaries == []
+
+    assert run_reprocess(notion, PROMPT_VERSION, limit=2)["reprocessed"] == 2
+    assert len(notion.summaries) == 2
@@ -0,0 +1,101 @@
+"""Tests for the transient-failure retry queue."""
+from src.browser import PageServerError, PageTimeoutError, TwitterLoginWallError, TwitterServerError
+from src.ingest import process_item
+from src.retry import RetryQueue, is_transient
+
+
+class FakeNotion:
+    def __init__(self):
+        self.status = type("S", (), {"pending": "pending", "ready": "ready"})()
+        self.record = {"marked": []}
+
+    def find_by_canonical(self, canonical_url):
+        return None
+
+    def mark_as_error(self, page_id, note):
+        self.record["marked"].append(("error", page_id, note))
+
+
+def test_transient_classification():
+    assert is_transient(PageTimeoutError("timed out"))
+    assert is_transient(PageServerError("HTTP 503"))
+    assert is_transient(TwitterServerError("something went wrong"))
+    assert not is_transient(TwitterLoginWallError("login"))
+    assert not is_transient(RuntimeError("blocked: login/JS wall detected"))
+
+
+def test_backoff_doubles_and_gives_up(tmp_path):
+    now = [1000.0]
+    queue = RetryQueue(tmp_path / "state.db", base_seconds=60, max_seconds=200, max_attempts=3, clock=lambda: now[0])
+
+    assert queue.defer("a", "timeout") == 60
+    assert queue.waiting("a")
+    now[0] += 61
+    assert not queue.waiting("a")
+    assert queue.defer("a", "timeout") == 120
+    assert queue.defer("a", "timeout") == 200
+    assert queue.defer("a", "timeout") is None
+    assert queue.attempts("a") == 0
+    queue.close()
+
+
+def test_transient_fetch_failure_stays_pending_until_attempts_run_out(monkeypatch, tmp_path):
+    fake = FakeNotion()
+    queue = RetryQueue(tmp_path / "state.db", base_seconds=0, max_attempts=1)
+
+    async def slow_fetch(url, cdp_url):
+        raise PageTimeoutError("timed out after 15000ms")
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", slow_fetch)
+    page = {"id": "p1", "url": "https://example.com/slow", "attachments": []}
+
+    assert process_item(page, fake, "cdp", retries=queue) == "retry"
+    assert fake.record["marked"] == []
+    assert queue.attempts("p1") == 1
+
+    assert process_item(page, fake, "cdp", retries=queue) == "error"
+    assert fake.record["marked"][0][:2] == ("error", "p1")
+    assert "gave up" in fake.record["marked"][0][2]
+    queue.close()
+
+
+def test_permanent_fetch_failure_fails_fast(monkeypatch, tmp_path):
+    fake = FakeNotion()
+    queue = RetryQueue(tmp_path / "state.db")
+
+    async def walled(url, cdp_url):
+        raise TwitterLoginWallError("login wall")
+
+    monkeypatch.setattr("src.ingest.fetch_page_content", walled)
+    page = {"id": "p2", "url": "https://example.com/wall", "attachments": []}
+
+    assert process_item(page, fake, "cdp", retries=queue) == "error"
+    assert queue.attempts("p2") == 0
+    queue.close()
+
+
+def test_transient_errors_are_not_retried_within_the_call(monkeypatch):
+    from tenacity import retry, wait_none
+
+    from src.browser import _retry_kwargs
+
+    monkeypatch.setenv("PAGE_FETCH_RETRIES", "3")
+    calls = []
+
+    def attempt(exc):
+        @retry(**dict(_retry_kwargs("content"), wait=wait_none(), reraise=True))
+        def _run():
+            calls.append(type(exc).__name__)
+            raise exc
+
+        try:
+            _run()
+        except type(exc):
+            pass
+
+    attempt(PageTimeoutError("timed out"))
+    attempt(TwitterServerError("something went wrong"))
+    assert calls == ["PageTimeoutError", "TwitterServerError"]
+
+    attempt(RuntimeError("blocked"))
+    assert calls[2:] == ["RuntimeError"] * 3
@@ -0,0 +1,77 @@
+"""Tests for the shared setup/teardown of the main.py modes."""
+import asyncio
+
+import pytest
+
+import src.runtime
+from src.runtime import Runtime
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    monkeypatch.setenv("NOTION_TOKEN", "dummy")
+    monkeypatch.setenv("NOTION_ITEM_DB_ID", "dummy")
+    monkeypatch.setenv("NOTION_SCHEMA_CACHE", "false")
+    monkeypatch.setenv("STATE_DIR", str(tmp_path))
+
+
+def _closed(resource):
+    # A closed local store refuses queries on its SQLite connection
+    try:
+        resource._conn.execute("SELECT 1")
+    except Exception:
+        return True
+    return False
+
+
+def test_runtime_opens_state_and_closes_it_on_exit(env):
+    with Runtime(lease=True) as runtime:
+        opened = [runtime.canonical_index, runtime.journal, runtime.retries, runtime.quarantine]
+        assert runtime.notion.canonical_index is runtime.canonical_index
+        assert runtime.lease is not None
+        assert not any(_closed(resource) for resource in opened)
+
+    assert all(_closed(resource) for resource in opened)
+
+
+def test_runtime_skips_disabled_state(env, monkeypatch):
+    monkeypatch.setenv("RUN_JOURNAL", "false")
+    with Runtime(index=False, quarantine=False) as runtime:
+        assert runtime.journal is None
+        assert runtime.canonical_index is None
+        assert runtime.quarantine is None
+        assert runtime.lease is None
+        assert runtime.retries is not None
+
+
+def test_runtime_closes_what_it_opened_when_a_later_open_fails(env, monkeypatch):
+    opened = {}
+
+    def broken_retry_queue():
+        raise RuntimeError("disk full")
+
+    real_open_journal = src.runtime.open_journal
+
+    def tracking_open_journal():
+        opened["journal"] = real_open_journal()
+        return opened["journal"]
+
+    monkeypatch.setattr(src.runtime, "open_journal", tracking_open_journal)
+    monkeypatch.setattr(src.runtime, "open_retry_queue", broken_retry_queue)
+
+    with pytest.raises(RuntimeError):
+        with Runtime():
+            pass
+
+    assert _closed(opened["journal"])
+
+
+def test_notion_pool_logs_queue_stats(env, caplog):
+    async def _run(runtime):
+        async with runtime.notion_pool() as notion_io:
+            await notion_io.run(lambda: None)
+
+    with Runtime(index=False, retries=False, quarantine=False) as runtime, caplog.at_level("INFO"):
+        asyncio.run(_run(runtime))
+
+    assert "METRIC notion_queue calls=1" in caplog.text
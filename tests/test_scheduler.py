@@ -0,0 +1,117 @@
+"""Tests for pending-queue priority ordering."""
+from src.scheduler import (
+    PRIORITY_CHEAP,
+    PRIORITY_NORMAL,
+    PRIORITY_SLOW,
+    PRIORITY_SOURCE,
+    Deadline,
+    HostShards,
+    PriorityPolicy,
+    page_host,
+    prioritize,
+)
+
+
+def _page(page_id, url=None, source="", created=None):
+    return {"id": page_id, "url": url, "source": source, "created_date": created}
+
+
+def test_priority_classes():
+    policy = PriorityPolicy(priority_sources=["plugin"], slow_hosts=["x.com"], is_cached=lambda p: p["id"] == "c")
+
+    assert policy.priority_class(_page("p", "https://x.com/u/status/1", source="plugin")) == PRIORITY_SOURCE
+    assert policy.priority_class(_page("n")) == PRIORITY_CHEAP
+    assert policy.priority_class(_page("c", "https://example.com/a")) == PRIORITY_CHEAP
+    assert policy.priority_class(_page("u", "https://example.com/a")) == PRIORITY_NORMAL
+    assert policy.priority_class(_page("t", "https://mobile.x.com/u/status/1")) == PRIORITY_SLOW
+
+
+def test_prioritize_orders_by_class_then_age():
+    policy = PriorityPolicy(priority_sources=["plugin"], slow_hosts=["twitter.com"])
+    pages = [
+        _page("slow", "https://twitter.com/u/status/1", created="2025-01-01T00:00:00.000Z"),
+        _page("new", "https://example.com/new", created="2025-01-03T00:00:00.000Z"),
+        _page("undated", "https://example.com/u"),
+        _page("old", "https://example.com/old", created="2025-01-02T00:00:00.000Z"),
+        _page("plugin", "https://twitter.com/u/status/2", source="plugin", created="2025-01-05T00:00:00.000Z"),
+    ]
+
+    ordered = [p["id"] for p in prioritize(pages, policy)]
+
+    assert ordered == ["plugin", "old", "new", "undated", "slow"]
+
+
+def test_policy_reads_env(monkeypatch):
+    monkeypatch.setenv("PRIORITY_SOURCES", "share-sheet, plugin")
+    monkeypatch.setenv("SLOW_HOSTS", "medium.com")
+    policy = PriorityPolicy()
+
+    assert policy.priority_class(_page("a", "https://example.com", source="Share-Sheet")) == PRIORITY_SOURCE
+    assert policy.priority_class(_page("b", "https://medium.com/post")) == PRIORITY_SLOW
+    assert policy.priority_class(_page("c", "https://x.com/u/status/1")) == PRIORITY_NORMAL
+
+
+def test_deadline_reserve_and_unlimited():
+    now = [100.0]
+    deadline = Deadline(60, reserve_seconds=10, clock=lambda: now[0])
+
+    assert not deadline.exhausted()
+    now[0] = 149.0
+    assert deadline.remaining() == 11
+    assert not deadline.exhausted()
+    now[0] = 150.0
+    assert deadline.exhausted()
+
+    assert Deadline(None).remaining() == float("inf")
+    assert not Deadline(None).exhausted()
+
+
+def _drain(shards, order):
+    """Take items for the given worker sequence; returns (worker, page id) pairs."""
+    taken = []
+    for worker in order:
+        item = shards.take(worker)
+        if item is not None:
+            taken.append((worker, item[1]["id"]))
+    return taken
+
+
+def test_page_host_strips_www():
+    assert page_host(_page("a", "https://www.Example.com/a")) == "example.com"
+    assert page_host(_page("n")) == ""
+
+
+def test_host_shards_keep_workers_on_one_host():
+    pages = [
+        _page("x1", "https://x.com/a/status/1"),
+        _page("w1", "https://mp.weixin.qq.com/s/1"),
+        _page("x2", "https://x.com/a/status/2"),
+        _page("w2", "https://mp.weixin.qq.com/s/2"),
+    ]
+    shards = HostShards(pages, host_limit=1)
+
+    taken = _drain(shards, [0, 1, 0, 1, 0, 1])
+
+    assert taken == [(0, "x1"), (1, "w1"), (0, "x2"), (1, "w2")]
+    assert shards.steals == 0
+
+
+def test_host_shards_steal_from_largest_shard_within_limit():
+    pages = [_page(f"x{i}", f"https://x.com/a/status/{i}") for i in range(4)] + [_page("e", "https://example.com/e")]
+    shards = HostShards(pages, host_limit=2)
+
+    taken = _drain(shards, [0, 1, 1, 1, 0, 0])
+
+    # Worker 1 drains example.com, then steals from the x.com shard
+    assert taken[:2] == [(0, "x0"), (1, "e")]
+    assert sorted(pid for _, pid in taken) == ["e", "x0", "x1", "x2", "x3"]
+    assert shards.steals == 1
+
+
+def test_host_limit_leaves_extra_workers_idle():
+    pages = [_page(f"x{i}", f"https://x.com/a/status/{i}") for i in range(3)]
+    shards = HostShards(pages, host_limit=1)
+
+    assert shards.take(0)[1]["id"] == "x0"
+    assert shards.take(1) is None
+    assert shards.take(0)[1]["id"] == "x1"
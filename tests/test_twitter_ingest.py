@@ -1,9 +1,10 @@
 import json
 import types
+from contextlib import asynccontextmanager, contextmanager
 
 import pytest
 
-import main
+from src import ingest
 from src.content_type import ContentType
 
 
@@ -80,6 +81,18 @@ class StubNotion:
     def mark_as_done(self, page_id, summary, status=None):
         self.done[page_id] = {"summary": summary, "status": status or self.status.ready}
 
+    # Writes go straight out: units are no-ops and after_write callbacks run at once
+    @contextmanager
+    def unit_of_work(self, page_id):
+        yield
+
+    @asynccontextmanager
+    async def unit_of_work_async(self, page_id, offload=None):
+        yield
+
+    def after_write(self, page_id, callback):
+        callback()
+
 
 @pytest.fixture(autouse=True)
 def patch_dedupe(monkeypatch):
@@ -92,9 +105,9 @@ def test_twitter_success(monkeypatch):
     async def _ok(url, cdp_url):
         return "Hello tweet"
 
-    monkeypatch.setattr("main.fetch_page_content", _ok)
+    monkeypatch.setattr("src.ingest.fetch_page_content", _ok)
     monkeypatch.setattr(
-        "main.classify",
+        "src.ingest.classify",
         lambda text: {
             "tags": ["twitter"],
             "sensitivity": "public",
@@ -103,10 +116,10 @@ def test_twitter_success(monkeypatch):
             "prompt_version": "p",
         },
     )
-    monkeypatch.setattr("main.generate_digest", lambda text: {"tldr": "TLDR", "insights": ""})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "TLDR", "insights": ""})
 
     page = {"id": "1", "url": "https://x.com/user/status/123", "attachments": []}
-    main.process_item(page, notion, "http://localhost:9222")
+    ingest.process_item(page, notion, "http://localhost:9222")
 
     assert notion.errors == {}
     assert notion.classifications["1"]["raw_content"] == "Hello tweet"
@@ -120,9 +133,9 @@ def test_twitter_blocked(monkeypatch):
     async def blocked(url, cdp_url):
         raise RuntimeError("blocked: login/JS wall detected")
 
-    monkeypatch.setattr("main.fetch_page_content", blocked)
+    monkeypatch.setattr("src.ingest.fetch_page_content", blocked)
     page = {"id": "2", "url": "https://twitter.com/user/status/456", "attachments": []}
-    main.process_item(page, notion, "http://localhost:9222")
+    ingest.process_item(page, notion, "http://localhost:9222")
 
     assert "blocked" in notion.errors["2"]
 
@@ -130,7 +143,7 @@ def test_twitter_blocked(monkeypatch):
 def test_invalid_tweet_url(monkeypatch):
     notion = StubNotion()
     page = {"id": "3", "url": "https://x.com/user/invalid", "attachments": []}
-    main.process_item(page, notion, "http://localhost:9222")
+    ingest.process_item(page, notion, "http://localhost:9222")
     assert "invalid tweet url" in notion.errors["3"]
 
 
@@ -138,7 +151,7 @@ def test_duplicate_ready_skips(monkeypatch):
     notion = StubNotion()
     notion._find_return = {"id": "ready1", "status": notion.status.ready}
     page = {"id": "4", "url": "https://x.com/user/status/999", "attachments": []}
-    res = main.process_item(page, notion, "http://localhost:9222")
+    res = ingest.process_item(page, notion, "http://localhost:9222")
     assert notion.duplicates["4"] == "ready1"
     assert res == "duplicate"
     assert "4" not in notion.classifications
@@ -153,15 +166,15 @@ def test_retry_after_block(monkeypatch):
     async def ok(url, cdp_url):
         return "hi"
 
-    monkeypatch.setattr("main.fetch_page_content", blocked)
+    monkeypatch.setattr("src.ingest.fetch_page_content", blocked)
     page = {"id": "5", "url": "https://x.com/user/status/100", "attachments": []}
-    res_block = main.process_item(page, notion, "http://localhost:9222")
+    res_block = ingest.process_item(page, notion, "http://localhost:9222")
     assert "blocked" in notion.errors["5"]
     assert res_block == "error"
 
-    monkeypatch.setattr("main.fetch_page_content", ok)
+    monkeypatch.setattr("src.ingest.fetch_page_content", ok)
     monkeypatch.setattr(
-        "main.classify",
+        "src.ingest.classify",
         lambda text: {
             "tags": ["twitter"],
             "sensitivity": "public",
@@ -170,8 +183,8 @@ def test_retry_after_block(monkeypatch):
             "prompt_version": "p",
         },
     )
-    monkeypatch.setattr("main.generate_digest", lambda text: {"tldr": "ok", "insights": ""})
-    res_ok = main.process_item(page, notion, "http://localhost:9222")
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "ok", "insights": ""})
+    res_ok = ingest.process_item(page, notion, "http://localhost:9222")
     assert res_ok == "success"
     assert notion.classifications["5"]["raw_content"] == "hi"
 
@@ -182,9 +195,9 @@ def test_plugin_source(monkeypatch):
     async def _ok(url, cdp_url):
         return "Plugin tweet"
 
-    monkeypatch.setattr("main.fetch_page_content", _ok)
+    monkeypatch.setattr("src.ingest.fetch_page_content", _ok)
     monkeypatch.setattr(
-        "main.classify",
+        "src.ingest.classify",
         lambda text: {
             "tags": ["twitter"],
             "sensitivity": "public",
@@ -193,9 +206,9 @@ def test_plugin_source(monkeypatch):
             "prompt_version": "p",
         },
     )
-    monkeypatch.setattr("main.generate_digest", lambda text: {"tldr": "TLDR", "insights": ""})
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "TLDR", "insights": ""})
     page = {"id": "6", "url": "https://x.com/user/status/777", "attachments": [], "source": "plugin"}
-    res = main.process_item(page, notion, "http://localhost:9222")
+    res = ingest.process_item(page, notion, "http://localhost:9222")
     assert res == "success"
     assert notion.classifications["6"]["source"] == "plugin"
     assert notion.done["6"]["status"] == notion.status.ready
@@ -231,9 +244,9 @@ def test_twitter_end_to_end_title_and_body(monkeypatch):
     async def _body(url, cdp_url):
         return body
 
-    monkeypatch.setattr("main.fetch_page_content", _body)
+    monkeypatch.setattr("src.ingest.fetch_page_content", _body)
     monkeypatch.setattr(
-        "main.classify",
+        "src.ingest.classify",
         lambda text: {
             "tags": ["twitter"],
             "sensitivity": "public",
@@ -242,8 +255,8 @@ def test_twitter_end_to_end_title_and_body(monkeypatch):
             "prompt_version": "p",
         },
     )
-    monkeypatch.setattr("main.generate_digest", lambda text: {"tldr": "tldr", "insights": ""})
-    result = main.process_item(page, notion, "http://localhost:9222")
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "tldr", "insights": ""})
+    result = ingest.process_item(page, notion, "http://localhost:9222")
 
     print(json.dumps(notion.titles, indent=2))
     assert result == "success"
@@ -286,9 +299,9 @@ def test_twitter_end_to_end_title_and_body_deepseek(monkeypatch):
     async def _body(url, cdp_url):
         return body
 
-    monkeypatch.setattr("main.fetch_page_content", _body)
+    monkeypatch.setattr("src.ingest.fetch_page_content", _body)
     monkeypatch.setattr(
-        "main.classify",
+        "src.ingest.classify",
         lambda text: {
             "tags": ["twitter"],
             "sensitivity": "public",
@@ -297,8 +310,8 @@ def test_twitter_end_to_end_title_and_body_deepseek(monkeypatch):
             "prompt_version": "p",
         },
     )
-    monkeypatch.setattr("main.generate_digest", lambda text: {"tldr": "tldr", "insights": ""})
-    result = main.process_item(page, notion, "http://localhost:9222")
+    monkeypatch.setattr("src.ingest.generate_digest", lambda text: {"tldr": "tldr", "insights": ""})
+    result = ingest.process_item(page, notion, "http://localhost:9222")
 
     assert result == "success"
     assert notion.classifications["8"]["raw_content"] == body
@@ -0,0 +1,191 @@
+"""Tests for the local canonical URL index used by dedupe."""
+import httpx
+from notion_client.errors import APIResponseError
+
+from src.notion import NotionManager
+from src.url_index import CanonicalIndex
+
+
+def _index(tmp_path, now):
+    return CanonicalIndex(tmp_path / "state.db", reconcile_seconds=3600, clock=lambda: now[0])
+
+
+def test_rebuild_keeps_oldest_page_per_url(tmp_path):
+    now = [1000.0]
+    index = _index(tmp_path, now)
+    try:
+        assert index.needs_rebuild()
+        count = index.rebuild(
+            [
+                {"id": "a", "canonical_url": "https://example.com/1", "status": "ready"},
+                {"id": "b", "canonical_url": "https://example.com/1", "status": "excluded"},
+                {"id": "c", "canonical_url": None},
+            ]
+        )
+
+        assert count == 1
+        assert index.lookup("https://example.com/1") == {"id": "a", "status": "ready"}
+        assert not index.needs_rebuild()
+        now[0] += 3601
+        assert index.needs_rebuild()
+    finally:
+        index.close()
+
+
+def test_rebuild_keeps_entries_recorded_while_the_scan_runs(tmp_path):
+    now = [1000.0]
+    index = _index(tmp_path, now)
+    try:
+        index.record("https://example.com/gone", "old", "ready")
+        now[0] += 10
+
+        def scan():
+            yield {"id": "a", "canonical_url": "https://example.com/1", "status": "ready"}
+            # Another worker creates a page after the scan passed its position
+            now[0] += 1
+            index.record("https://example.com/new", "n", "pending")
+            yield {"id": "b", "canonical_url": "https://example.com/2", "status": "ready"}
+
+        index.rebuild(scan())
+
+        assert index.lookup("https://example.com/new") == {"id": "n", "status": "pending"}
+        assert index.lookup("https://example.com/1")["id"] == "a"
+        assert index.lookup("https://example.com/gone") is None
+    finally:
+        index.close()
+
+
+def test_record_does_not_steal_url_from_existing_page(tmp_path):
+    index = _index(tmp_path, [1000.0])
+    try:
+        index.record("https://example.com/1", "a", "pending")
+        index.record("https://example.com/1", "b", "ready")
+        index.record("https://example.com/1", "a", "ready")
+
+        assert index.lookup("https://example.com/1") == {"id": "a", "status": "ready"}
+        index.forget("https://example.com/1")
+        assert index.lookup("https://example.com/1") is None
+    finally:
+        index.close()
+
+
+class FakePages:
+    def __init__(self, pages):
+        self.pages = pages
+        self.retrieved = []
+        self.updates = []
+
+    def retrieve(self, page_id):
+        self.retrieved.append(page_id)
+        if page_id not in self.pages:
+            response = httpx.Response(404, request=httpx.Request("GET", "https://api.notion.com/v1/pages/x"))
+            raise APIResponseError(response, "not found", "object_not_found")
+        return self.pages[page_id]
+
+    def update(self, page_id, properties):
+        self.updates.append(page_id)
+
+
+def _raw(page_id, canonical, status="ready"):
+    return {
+        "id": page_id,
+        "properties": {
+            "Canonical URL": {"url": canonical},
+            "Status": {"select": {"name": status}},
+        },
+    }
+
+
+def _manager(monkeypatch, tmp_path, pages, scan, trust_misses=True):
+    monkeypatch.setenv("NOTION_TOKEN", "dummy")
+    monkeypatch.setenv("NOTION_ITEM_DB_ID", "dummy")
+    monkeypatch.setenv("NOTION_SCHEMA_CACHE", "false")
+    nm = NotionManager()
+    nm.client = type("FakeClient", (), {"pages": FakePages(pages)})()
+    queries = []
+
+    def _query(body):
+        queries.append(body)
+        if "sorts" in body:
+            return {"results": scan, "has_more": False}
+        wanted = body["filter"]["url"]["equals"]
+        live = [p for p in scan if p["id"] in pages]
+        return {"results": [p for p in live if p["properties"]["Canonical URL"]["url"] == wanted]}
+
+    nm._query = _query
+    nm.canonical_index = CanonicalIndex(tmp_path / "state.db", trust_misses=trust_misses)
+    return nm, queries
+
+
+def test_misses_are_answered_locally_after_one_scan(monkeypatch, tmp_path):
+    scan = [_raw("a", "https://example.com/1")]
+    nm, queries = _manager(monkeypatch, tmp_path, {"a": scan[0]}, scan)
+    try:
+        assert nm.find_by_canonical("https://example.com/2") is None
+        assert nm.find_by_canonical("https://example.com/3") is None
+        hit = nm.find_by_canonical("https://example.com/1")
+
+        assert hit["id"] == "a"
+        assert hit["status"] == "ready"
+        assert len(queries) == 1  # the bootstrap scan only
+        assert nm.client.pages.retrieved == ["a"]
+    finally:
+        nm.canonical_index.close()
+
+
+def test_own_writes_update_the_index(monkeypatch, tmp_path):
+    nm, queries = _manager(monkeypatch, tmp_path, {"new": _raw("new", "https://example.com/new", "pending")}, [])
+    try:
+        nm.find_by_canonical("https://example.com/other")
+        nm.set_classification("new", [], "public", 0.9, "r1", "p1", canonical_url="https://example.com/new")
+
+        assert nm.find_by_canonical("https://example.com/new")["id"] == "new"
+        assert len(queries) == 1
+    finally:
+        nm.canonical_index.close()
+
+
+def test_stale_hit_is_dropped_and_checked_against_notion(monkeypatch, tmp_path):
+    # "a" was deleted by hand after the scan; "b" still carries the URL
+    scan = [_raw("a", "https://example.com/1"), _raw("b", "https://example.com/1", "pending")]
+    nm, queries = _manager(monkeypatch, tmp_path, {"b": scan[1]}, scan)
+    try:
+        hit = nm.find_by_canonical("https://example.com/1")
+
+        assert hit["id"] == "b"
+        assert nm.canonical_index.lookup("https://example.com/1")["id"] == "b"
+        assert len(queries) == 2
+    finally:
+        nm.canonical_index.close()
+
+
+def test_untrusted_misses_are_checked_against_notion(monkeypatch, tmp_path):
+    # "b" was written by another node after this node's scan
+    nm, queries = _manager(monkeypatch, tmp_path, {}, [], trust_misses=False)
+    try:
+        assert nm.find_by_canonical("https://example.com/1") is None
+        nm._query = lambda body: queries.append(body) or {"results": [_raw("b", "https://example.com/2")]}
+
+        assert nm.find_by_canonical("https://example.com/2")["id"] == "b"
+        assert len(queries) == 3  # scan + one query per miss
+        assert nm.canonical_index.lookup("https://example.com/2")["id"] == "b"
+    finally:
+        nm.canonical_index.close()
+
+
+def test_index_entry_waits_for_the_buffered_write(monkeypatch, tmp_path):
+    nm, queries = _manager(monkeypatch, tmp_path, {"new": _raw("new", "https://example.com/new", "pending")}, [])
+    try:
+        nm.find_by_canonical("https://example.com/other")
+        with nm.unit_of_work("new"):
+            nm.set_classification("new", [], "public", 0.9, "r1", "p1", canonical_url="https://example.com/new")
+            # Not on the page yet: an entry now would fail its re-read and be forgotten
+            assert nm.canonical_index.lookup("https://example.com/new") is None
+            assert nm.client.pages.updates == []
+
+        assert nm.client.pages.updates == ["new"]
+        assert nm.canonical_index.lookup("https://example.com/new")["id"] == "new"
+        assert nm.find_by_canonical("https://example.com/new")["id"] == "new"
+        assert len(queries) == 1
+    finally:
+        nm.canonical_index.close()
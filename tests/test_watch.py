@@ -0,0 +1,82 @@
+"""Tests for incremental watch-mode polling."""
+import asyncio
+
+from src.watch import HighWaterMark, InboxWatcher
+
+
+def _page(page_id, edited):
+    return {"id": page_id, "last_edited_time": edited}
+
+
+def test_high_water_mark_persists(tmp_path):
+    mark = HighWaterMark(path=tmp_path / "state.db")
+    assert mark.get() is None
+    mark.set("2025-01-15T10:00:00.000Z")
+    mark.close()
+
+    reopened = HighWaterMark(path=tmp_path / "state.db")
+    assert reopened.get() == "2025-01-15T10:00:00.000Z"
+    reopened.close()
+
+
+def test_watcher_polls_incrementally_and_skips_handled(tmp_path):
+    mark = HighWaterMark(path=tmp_path / "state.db")
+    queries = []
+    responses = [
+        [_page("a", "2025-01-15T10:00:00.000Z"), _page("b", "2025-01-15T10:01:00.000Z")],
+        # "b" comes back inside the overlap window without a newer edit
+        [_page("b", "2025-01-15T10:01:00.000Z"), _page("c", "2025-01-15T10:02:00.000Z")],
+    ]
+    handled = []
+
+    def fetch(since):
+        queries.append(since)
+        return responses.pop(0)
+
+    async def handle(pages):
+        handled.append([p["id"] for p in pages])
+        return {"success": len(pages)}
+
+    watcher = InboxWatcher(fetch, handle, mark, interval=0, overlap_seconds=60)
+    asyncio.run(watcher.run(max_polls=2))
+
+    assert queries == [None, "2025-01-15T10:00:00.000Z"]
+    assert handled == [["a", "b"], ["c"]]
+    assert mark.get() == "2025-01-15T10:02:00.000Z"
+    mark.close()
+
+
+def test_watcher_reprocesses_page_edited_after_handling(tmp_path):
+    mark = HighWaterMark(path=tmp_path / "state.db")
+    mark.set("2025-01-15T10:00:00.000Z")
+    handled = []
+
+    async def handle(pages):
+        handled.extend(p["id"] for p in pages)
+        return {}
+
+    watcher = InboxWatcher(lambda since: [_page("a", "2025-01-15T10:00:00.000Z")], handle, mark, interval=0)
+    asyncio.run(watcher.poll_once())
+    watcher.fetch = lambda since: [_page("a", "2999-01-01T00:00:00.000Z")]
+    asyncio.run(watcher.poll_once())
+
+    assert handled == ["a", "a"]
+    mark.close()
+
+
+def test_watcher_survives_poll_errors(tmp_path):
+    mark = HighWaterMark(path=tmp_path / "state.db")
+    calls = []
+
+    def fetch(since):
+        calls.append(since)
+        raise RuntimeError("notion down")
+
+    async def handle(pages):
+        return {}
+
+    watcher = InboxWatcher(fetch, handle, mark, interval=0)
+    asyncio.run(watcher.run(max_polls=3))
+
+    assert len(calls) == 3
+    mark.close()
@@ -0,0 +1,122 @@
+"""Tests for the Notion webhook receiver and event-driven processing."""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+import urllib.error
+import urllib.request
+
+from src.runners import run_webhook
+from src.webhook import WebhookServer, page_id_from_event, sign, synthetic_event
+
+DB_ID = "1a2b3c4d-0000-0000-0000-00000000abcd"
+
+
+def _post(server, payload, token=None):
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["X-Notion-Signature"] = sign(body, token)
+    host, port = server.address
+    request = urllib.request.Request(f"http://{host}:{port}{server.path}", data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def test_only_inbox_page_events_are_forwarded():
+    assert page_id_from_event(synthetic_event("p1", DB_ID.replace("-", "")), [DB_ID]) == "p1"
+    assert page_id_from_event(synthetic_event("p1", "other-db"), [DB_ID]) is None
+    assert page_id_from_event(synthetic_event("p1", DB_ID, "database.schema_updated"), [DB_ID]) is None
+    assert page_id_from_event({"type": "page.created", "entity": {"id": "c", "type": "comment"}}, [DB_ID]) is None
+
+
+def test_server_verifies_signatures_from_local_stand_in():
+    received = []
+    server = WebhookServer(received.append, [DB_ID], "127.0.0.1", 0, verification_token="secret")
+    server.start()
+    try:
+        assert _post(server, {"verification_token": "abc"}) == 200
+        assert _post(server, synthetic_event("p1", DB_ID)) == 401
+        assert _post(server, synthetic_event("p2", DB_ID), token="secret") == 200
+        assert _post(server, synthetic_event("p3", "elsewhere"), token="secret") == 200
+    finally:
+        server.shutdown()
+    assert received == ["p2"]
+
+
+def test_run_webhook_processes_only_pending_pages(monkeypatch):
+    class Status:
+        pending = "pending"
+        ready = "ready"
+        to_read = "To Read"
+        unprocessed = "unprocessed"
+        processing = "processing"
+
+    class FakeNotion:
+        status = Status()
+        pages = {
+            "new": {"id": "new", "status": "To Read", "url": "https://example.com/a", "attachments": []},
+            "done": {"id": "done", "status": "ready", "url": "https://example.com/b", "attachments": []},
+        }
+
+        def get_page(self, page_id):
+            return dict(self.pages[page_id])
+
+        @asynccontextmanager
+        async def unit_of_work_async(self, page_id, offload=None):
+            yield
+
+    processed = []
+
+    async def fake_fused(page, notion, cdp_url, routed, note_sequence=1, session=None, journal=None, *rest):
+        processed.append(page["id"])
+        return "success"
+
+    monkeypatch.setenv("WEBHOOK_DEBOUNCE_SECONDS", "0")
+    monkeypatch.setenv("INGEST_PRIORITY", "false")
+    monkeypatch.setattr("src.ingest.classify_item", lambda page, notion: (None, ""))
+    monkeypatch.setattr("src.ingest.process_item_fused", fake_fused)
+
+    async def scenario():
+        queue = asyncio.Queue()
+        for page_id in ("new", "done", "new"):
+            queue.put_nowait(page_id)
+        await run_webhook(FakeNotion(), "cdp", queue, max_batches=1)
+
+    asyncio.run(scenario())
+
+    assert processed == ["new"]
+
+
+def test_initial_sync_pages_are_not_read_again(monkeypatch):
+    class FakeNotion:
+        status = type("S", (), {"pending": "pending", "ready": "ready", "to_read": "To Read"})()
+
+        def get_page(self, page_id):
+            raise AssertionError("listed pages must not be re-read")
+
+        @asynccontextmanager
+        async def unit_of_work_async(self, page_id, offload=None):
+            yield
+
+    processed = []
+
+    async def fake_fused(page, notion, cdp_url, routed, note_sequence=1, session=None, journal=None, *rest):
+        processed.append(page["id"])
+        return "success"
+
+    monkeypatch.setenv("INGEST_PRIORITY", "false")
+    monkeypatch.setattr("src.ingest.classify_item", lambda page, notion: (None, ""))
+    monkeypatch.setattr("src.ingest.process_item_fused", fake_fused)
+    listed = [{"id": "old", "status": "To Read", "url": "https://example.com/a", "attachments": []}]
+
+    async def scenario():
+        stop = asyncio.Event()
+        stop.set()
+        await run_webhook(FakeNotion(), "cdp", asyncio.Queue(), stop=stop, initial=listed)
+
+    asyncio.run(scenario())
+
+    assert processed == ["old"]